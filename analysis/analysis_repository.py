@@ -1,55 +1,33 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import List, Tuple
+from typing import List
 
 from sqlalchemy.orm import Session
 
 from portfolio.portfolio_repository import list_holdings_by_user
-from trades.trades_entity import Asset, Trade, TradeResult
+from trades.trades_entity import Asset, RealizedPnlDaily
 
 
-def list_sell_trades_with_results(
+def list_realized_pnl_days(
     db: Session,
     user_id: int,
     start_date: date | None = None,
-) -> List[Tuple[Trade, TradeResult]]:
+) -> List[RealizedPnlDaily]:
+    """
+    일자별 실현손익 projection (매매 원장 기준, pnl이 있는 SELL이 있었던 날짜만)
+    """
     q = (
-        db.query(Trade, TradeResult)
-        .join(TradeResult, TradeResult.trade_id == Trade.id)
+        db.query(RealizedPnlDaily)
         .filter(
-            Trade.user_id == user_id,
-            Trade.trade_type == "SELL",
-            TradeResult.pnl_amount.isnot(None),
+            RealizedPnlDaily.user_id == user_id,
+            RealizedPnlDaily.sell_count > 0,
         )
-        .order_by(Trade.trade_date.asc(), Trade.id.asc())
+        .order_by(RealizedPnlDaily.trade_date.asc())
     )
 
     if start_date is not None:
-        q = q.filter(Trade.trade_date >= start_date)
-
-    return q.all()
-
-
-def list_sell_trades_with_results_and_rate(
-    db: Session,
-    user_id: int,
-    start_date: date | None = None,
-) -> List[Tuple[Trade, TradeResult]]:
-    q = (
-        db.query(Trade, TradeResult)
-        .join(TradeResult, TradeResult.trade_id == Trade.id)
-        .filter(
-            Trade.user_id == user_id,
-            Trade.trade_type == "SELL",
-            TradeResult.pnl_amount.isnot(None),
-            TradeResult.pnl_rate.isnot(None),
-        )
-        .order_by(Trade.trade_date.asc(), Trade.id.asc())
-    )
-
-    if start_date is not None:
-        q = q.filter(Trade.trade_date >= start_date)
+        q = q.filter(RealizedPnlDaily.trade_date >= start_date)
 
     return q.all()
 
@@ -10,8 +10,7 @@ from sqlalchemy.orm import Session
 
 from analysis.analysis_repository import (
     get_asset_by_ticker,
-    list_sell_trades_with_results,
-    list_sell_trades_with_results_and_rate,
+    list_realized_pnl_days,
     list_user_holdings,
 )
 from analysis.analysis_schema import (
@@ -24,7 +23,7 @@ from analysis.analysis_schema import (
     SectorAllocationItem,
     SectorAllocationResponse,
 )
-from marketdata.marketdata_service import get_cached_quote_fields
+from marketdata.marketdata_service import get_cached_quotes
 
 
 def _today() -> date:
@@ -100,7 +99,7 @@ def get_monthly_performance(
     rng: AnalysisRangeMonthly = "6M",
 ) -> MonthlyPerformanceResponse:
     start_date = _resolve_monthly_start(rng)
-    rows = list_sell_trades_with_results_and_rate(db, user_id, start_date)
+    days = list_realized_pnl_days(db, user_id, start_date)
 
     monthly_amount_sum: Dict[str, Decimal] = defaultdict(lambda: Decimal("0"))
     monthly_cost_sum: Dict[str, Decimal] = defaultdict(lambda: Decimal("0"))
@@ -108,19 +107,14 @@ def get_monthly_performance(
 
     total_trades = 0
 
-    for trade, result in rows:
-        ym = _month_key(trade.trade_date)
-        pnl_amount = _safe_decimal(result.pnl_amount)
-        pnl_rate = _safe_decimal(result.pnl_rate)
+    # realized_pnl_daily: 일자별 pnl 합 / 매입원가(pnl_amount / pnl_rate) 합 / SELL 수
+    for day in days:
+        ym = _month_key(day.trade_date)
 
-        cost_basis = Decimal("0")
-        if pnl_rate != 0:
-            cost_basis = pnl_amount / pnl_rate
-
-        monthly_amount_sum[ym] += pnl_amount
-        monthly_cost_sum[ym] += cost_basis
-        monthly_trade_count[ym] += 1
-        total_trades += 1
+        monthly_amount_sum[ym] += _safe_decimal(day.realized_pnl)
+        monthly_cost_sum[ym] += _safe_decimal(day.cost_basis)
+        monthly_trade_count[ym] += int(day.sell_count)
+        total_trades += int(day.sell_count)
 
     items: List[MonthlyPerformanceItem] = []
     for ym in sorted(monthly_trade_count.keys()):
@@ -148,15 +142,15 @@ def get_cumulative_profit(
     rng: AnalysisRangeCumulative = "3M",
 ) -> CumulativeProfitResponse:
     start_date = _resolve_cumulative_start(rng)
-    rows = list_sell_trades_with_results(db, user_id, start_date)
+    days = list_realized_pnl_days(db, user_id, start_date)
 
     grouped_pnl: Dict[str, Decimal] = defaultdict(lambda: Decimal("0"))
     total_trades = 0
 
-    for trade, result in rows:
-        key = _get_group_key(trade.trade_date, rng)
-        grouped_pnl[key] += _safe_decimal(result.pnl_amount)
-        total_trades += 1
+    for day in days:
+        key = _get_group_key(day.trade_date, rng)
+        grouped_pnl[key] += _safe_decimal(day.realized_pnl)
+        total_trades += int(day.sell_count)
 
     cumulative = Decimal("0")
     series: List[CumulativeProfitPoint] = []
@@ -204,6 +198,8 @@ def get_sector_allocation(
 
     total_value = Decimal("0")
 
+    quotes = get_cached_quotes(db, [h.ticker for h in holdings if h.ticker], ttl_seconds=180)
+
     for h in holdings:
         ticker = (h.ticker or "").upper().strip()
         if not ticker:
@@ -212,7 +208,7 @@ def get_sector_allocation(
         asset = get_asset_by_ticker(db, ticker)
         sector = getattr(asset, "sector", None) or "Unknown"
 
-        quote = get_cached_quote_fields(db, ticker, ttl_seconds=180)
+        quote = quotes[ticker]
         current_price = _safe_decimal(quote.price)
         qty = Decimal(int(h.quantity))
 
@@ -0,0 +1,129 @@
+"""
+기술지표 계산 벤치마크: 기존 pandas 경로 vs tickers.indicator_engine
+
+실행 (프로젝트 루트에서):
+    python -m benchmarks.indicator_engine_bench
+"""
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from tickers.indicator_engine import indicators_as_of, latest_indicators, latest_indicators_batch
+
+
+# =========================
+# 기존 pandas 구현 (비교 기준)
+# =========================
+
+def _pandas_rsi(close: pd.Series, period: int = 14) -> pd.Series:
+    delta = close.diff()
+    gain = delta.clip(lower=0)
+    loss = (-delta).clip(lower=0)
+
+    avg_gain = gain.rolling(period).mean()
+    avg_loss = loss.rolling(period).mean()
+
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def _pandas_indicators(df: pd.DataFrame) -> dict:
+    out = df.copy()
+    out["sma20"] = out["close"].rolling(20).mean()
+    out["sma50"] = out["close"].rolling(50).mean()
+    out["rsi14"] = _pandas_rsi(out["close"], 14)
+
+    mid = out["close"].rolling(20).mean()
+    std = out["close"].rolling(20).std()
+    out["bb_mid"] = mid
+    out["bb_upper"] = mid + 2 * std
+    out["bb_lower"] = mid - 2 * std
+
+    last = out.dropna().iloc[-1]
+    return {
+        "sma20": float(last["sma20"]),
+        "sma50": float(last["sma50"]),
+        "rsi14": float(last["rsi14"]),
+        "bb_upper": float(last["bb_upper"]),
+        "bb_lower": float(last["bb_lower"]),
+    }
+
+
+# =========================
+# 벤치마크
+# =========================
+
+def _random_walk(rng: np.random.Generator, n: int) -> np.ndarray:
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+
+
+def _timeit(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _check(expected: dict, got) -> None:
+    _, ind = got
+    actual = {
+        "sma20": ind.sma20,
+        "sma50": ind.sma50,
+        "rsi14": ind.rsi14,
+        "bb_upper": ind.bollinger.upper,
+        "bb_lower": ind.bollinger.lower,
+    }
+    for k, v in expected.items():
+        assert abs(actual[k] - v) <= 1e-6 * max(1.0, abs(v)), (k, actual[k], v)
+
+
+def main() -> None:
+    rng = np.random.default_rng(7)
+
+    n_tickers, n_days = 200, 130  # technical-summary 3M 조회 구간 수준
+    closes = [_random_walk(rng, n_days) for _ in range(n_tickers)]
+    frames = [
+        pd.DataFrame({"close": c}, index=pd.bdate_range("2024-01-01", periods=n_days))
+        for c in closes
+    ]
+
+    for df, c in zip(frames[:20], closes[:20]):
+        _check(_pandas_indicators(df), latest_indicators(c))
+
+    t_pandas = _timeit(lambda: [_pandas_indicators(df) for df in frames])
+    t_numpy = _timeit(lambda: [latest_indicators(c) for c in closes])
+    t_batch = _timeit(lambda: latest_indicators_batch(closes))
+
+    print(f"[종목 {n_tickers}개 x {n_days}일]")
+    print(f"  pandas (종목별)     : {t_pandas * 1000:8.2f} ms")
+    print(f"  numpy  (종목별)     : {t_numpy * 1000:8.2f} ms  (x{t_pandas / t_numpy:.1f})")
+    print(f"  numpy  (행렬 1회)   : {t_batch * 1000:8.2f} ms  (x{t_pandas / t_batch:.1f})")
+
+    # 한 종목의 여러 거래일 스냅샷 (build_quant_snapshot_for_trade 패턴)
+    n_history, n_trades, lookback = 2500, 300, 82
+    close = _random_walk(rng, n_history)
+    days = np.arange(n_history, dtype=np.float64)
+    as_of = np.sort(rng.integers(lookback, n_history, n_trades)).astype(np.float64)
+    history = pd.DataFrame({"close": close}, index=pd.RangeIndex(n_history))
+
+    for d, got in list(zip(as_of, indicators_as_of(days, close, as_of)))[:20]:
+        i = int(d)
+        _check(_pandas_indicators(history.iloc[i - lookback : i + 1]), got)
+
+    t_pandas = _timeit(
+        lambda: [_pandas_indicators(history.iloc[int(d) - lookback : int(d) + 1]) for d in as_of]
+    )
+    t_asof = _timeit(lambda: indicators_as_of(days, close, as_of))
+
+    print(f"[1종목 {n_history}일 이력, 기준일 {n_trades}개]")
+    print(f"  pandas (기준일별)   : {t_pandas * 1000:8.2f} ms")
+    print(f"  numpy  (이력 1회)   : {t_asof * 1000:8.2f} ms  (x{t_pandas / t_asof:.1f})")
+
+
+if __name__ == "__main__":
+    main()
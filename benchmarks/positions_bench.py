@@ -0,0 +1,199 @@
+"""
+포지션 목록(GET /api/trades/positions) 벤치마크: 기존 joinedload 경로 vs selectinload + 관계 정렬
+
+- 포지션 200개 / 거래 5,000건을 가진 임시 사용자를 만든 뒤 측정하고 트랜잭션을 롤백 (DB에 남지 않음)
+- 실행 (프로젝트 루트에서, DATABASE_URL 필요):
+    python -m benchmarks.positions_bench
+"""
+from __future__ import annotations
+
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import event, desc
+from sqlalchemy.orm import Session, joinedload
+
+import main as _app  # noqa: F401  (모든 엔티티 등록)
+from common.database import SessionLocal, engine
+from marketdata.marketdata_entity import AssetPrice
+from trades.trade_positions_repository import list_positions
+from trades.trade_positions_service import _make_trade_item, get_trade_positions
+from trades.trades_entity import Trade, TradePosition, TradeResult
+from trades.trades_repository import allocate_ids, bulk_insert, ensure_assets
+from user.user_entity import User
+
+N_POSITIONS = 200
+TRADES_PER_POSITION = 25  # 200 x 25 = 5,000건
+
+
+# =========================
+# 기존 구현 (비교 기준)
+# =========================
+
+def _old_list_positions(db: Session, user_id: int):
+    return (
+        db.query(TradePosition)
+        .options(joinedload(TradePosition.trades).joinedload(Trade.result))
+        .filter(TradePosition.user_id == user_id, TradePosition.status == "OPEN")
+        .order_by(desc(TradePosition.opened_at))
+        .all()
+    )
+
+
+def _old_trade_items(positions):
+    return [
+        [_make_trade_item(t) for t in sorted(p.trades, key=lambda x: (x.trade_date, x.id))]
+        for p in positions
+    ]
+
+
+# =========================
+# 벤치마크
+# =========================
+
+class _QueryCounter:
+    def __init__(self):
+        self.statements = 0
+        self.rows = 0
+        event.listen(engine, "after_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements += 1
+        self.rows += max(cursor.rowcount, 0)
+
+    def reset(self):
+        self.statements = 0
+        self.rows = 0
+
+    def close(self):
+        event.remove(engine, "after_cursor_execute", self._on_execute)
+
+
+def _seed(db: Session) -> int:
+    user = User(email="positions-bench@example.com", provider="bench", provider_id="positions-bench")
+    db.add(user)
+    db.flush()
+
+    tickers = [f"PB{i:03d}" for i in range(N_POSITIONS)]
+    ensure_assets(db, tickers)
+    now = datetime.now(timezone.utc)
+    bulk_insert(db, AssetPrice, [{"ticker": t, "price": 100, "change": 0, "change_rate": 0, "updated_at": now} for t in tickers])
+
+    position_ids = allocate_ids(db, "trade_positions_id_seq", N_POSITIONS)
+    trade_ids = iter(allocate_ids(db, "trades_id_seq", N_POSITIONS * TRADES_PER_POSITION))
+    positions, trades, results = [], [], []
+    start = date(2023, 1, 2)
+
+    for n, (ticker, pid) in enumerate(zip(tickers, position_ids)):
+        qty = 0
+        for k in range(TRADES_PER_POSITION):
+            is_buy = k % 5 != 4  # 4번 매수 후 1번 부분 매도
+            tid = next(trade_ids)
+            trades.append(
+                {
+                    "id": tid,
+                    "user_id": user.id,
+                    "ticker": ticker,
+                    "position_id": pid,
+                    "trade_type": "BUY" if is_buy else "SELL",
+                    "trade_date": start + timedelta(days=n + k),
+                    "price": Decimal("100") + k,
+                    "quantity": 10 if is_buy else 5,
+                    "confidence": 50,
+                    "behavior_type": "MOMENTUM" if is_buy else "TARGET_HIT",
+                    "memo": None,
+                    "position_action": ("ENTRY" if k == 0 else "ADD") if is_buy else "PARTIAL_EXIT",
+                }
+            )
+            results.append(
+                {
+                    "trade_id": tid,
+                    "pnl_status": "OPEN",
+                    "pnl_amount": None if is_buy else Decimal("10"),
+                    "pnl_rate": None if is_buy else Decimal("0.01"),
+                    "closed_at": None,
+                }
+            )
+            qty += 10 if is_buy else -5
+        positions.append(
+            {
+                "id": pid,
+                "user_id": user.id,
+                "ticker": ticker,
+                "status": "OPEN",
+                "opened_at": now - timedelta(days=N_POSITIONS - n),
+                "quantity": qty,
+                "buy_quantity": qty,
+                "cost_basis": Decimal("100") * qty,
+                "avg_price": Decimal("100"),
+                "realized_pnl": None,
+            }
+        )
+
+    bulk_insert(db, TradePosition, positions)
+    bulk_insert(db, Trade, trades)
+    bulk_insert(db, TradeResult, results)
+    db.flush()
+    return int(user.id)
+
+
+def _timeit(db: Session, fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        db.expire_all()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    db = SessionLocal()
+    counter = _QueryCounter()
+    try:
+        user_id = _seed(db)
+
+        old = _old_trade_items(_old_list_positions(db, user_id))
+        db.expire_all()
+        new = [[_make_trade_item(t) for t in p.trades] for p in list_positions(db, user_id, "OPEN")]
+        assert old == new, "trade 목록이 기존 구현과 다름"
+
+        def run_old():
+            _old_trade_items(_old_list_positions(db, user_id))
+
+        def run_new():
+            [[_make_trade_item(t) for t in p.trades] for p in list_positions(db, user_id, "OPEN")]
+
+        def measure(fn):
+            db.expire_all()
+            counter.reset()
+            fn()
+            statements, rows = counter.statements, counter.rows
+            return _timeit(db, fn), statements, rows
+
+        print(f"[포지션 {N_POSITIONS}개 / 거래 {N_POSITIONS * TRADES_PER_POSITION}건]")
+        for title, cases in (
+            ("포지션 + trades 로드", (("joinedload + sorted (기존)", run_old), ("selectinload + 관계 정렬", run_new))),
+            (
+                "엔드포인트 (현재가 + 응답 모델 포함)",
+                (
+                    ("전체", lambda: get_trade_positions(db, user_id, "OPEN")),
+                    ("limit=20", lambda: get_trade_positions(db, user_id, "OPEN", limit=20)),
+                ),
+            ),
+        ):
+            print(f"  {title}")
+            base = None
+            for name, fn in cases:
+                t, statements, rows = measure(fn)
+                base = base or t
+                print(f"    {name:<24}: {t * 1000:8.2f} ms  (x{base / t:.1f})  쿼리 {statements}회, 결과 {rows}행")
+    finally:
+        counter.close()
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
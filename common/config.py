@@ -16,6 +16,16 @@ class Settings(BaseSettings):
     database_url: str
     redis_url: str
 
+    # 시세 캐시를 worker/컨테이너 간 공유 (Redis 장애 시 DB 경로로 동작)
+    quote_redis_enabled: bool = True
+
+    # 일봉 mmap 파일(종목별 .npy) 저장 위치 (daily_bars의 로컬 사본, 지워도 DB에서 다시 만들어짐)
+    bar_store_dir: str = "data/bars"
+
+    # /trades/summary를 trade_stats 집계 행(PK 조회)으로 응답 (끄면 trades 집계 쿼리 1회)
+    # - 꺼져 있던 동안 증분이 빠진 행은 조회 시 원장(trade_events) 최신 이벤트와 비교해 자동으로 다시 집계됨
+    trade_stats_rollup_enabled: bool = True
+
     debug: bool = True
 
     class Config:
@@ -1,7 +1,33 @@
 from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+US_MARKET_TZ = ZoneInfo("America/New_York")
+US_MARKET_OPEN = time(9, 30)
+US_MARKET_CLOSE = time(16, 0)
+
 
 def get_summary_date() -> date:
     now = datetime.now()
     if now.time() < time(9, 0):
         return date.today() - timedelta(days=1)
     return date.today()
+
+
+def is_us_market_open(now: datetime | None = None) -> bool:
+    """
+    미국 정규장(뉴욕 기준 평일 09:30~16:00) 여부
+    - 휴장일은 고려하지 않음
+    """
+    now = now.astimezone(US_MARKET_TZ) if now is not None else datetime.now(US_MARKET_TZ)
+    if now.weekday() >= 5:
+        return False
+    return US_MARKET_OPEN <= now.time() <= US_MARKET_CLOSE
+
+
+def get_us_market_date(now: datetime | None = None) -> date:
+    """
+    뉴욕 기준 오늘 날짜 (스냅샷/백필이 같은 거래일을 가리키도록)
+    - 서울 오전 스케줄러 실행 시점에는 직전 미국 거래일(장 마감 후)이 됨
+    """
+    now = now.astimezone(US_MARKET_TZ) if now is not None else datetime.now(US_MARKET_TZ)
+    return now.date()
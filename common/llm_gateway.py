@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import openai
+from openai import AsyncOpenAI
+
+from common.config import settings
+
+
+LLM_MAX_CONCURRENCY = 8  # 프로세스 전체에서 동시에 보내는 chat completion 수
+LLM_PURPOSE_CONCURRENCY = {  # 용도별 동시 요청 수 (배치성 작업이 화면 요청 몫을 다 쓰지 않도록)
+    "tech": 4,
+    "news": 2,
+    "action_plan": 2,
+    "sector_summary": 2,
+    "rag": 3,
+}
+LLM_DEFAULT_PURPOSE_CONCURRENCY = 2
+LLM_REQUEST_TIMEOUT_SECONDS = 60
+LLM_MAX_ATTEMPTS = 3  # 429/5xx/타임아웃/연결 오류만 재시도
+LLM_BACKOFF_BASE_SECONDS = 0.5
+
+_STREAM_END = object()  # 스트림 종료 표시 (게이트웨이 루프 -> 호출 스레드)
+
+_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+class _Gateway:
+    """
+    OpenAI 호출 공용 창구.
+    - 전용 스레드의 이벤트 루프 하나에서 API 키별 AsyncOpenAI 클라이언트를 계속 재사용 (커넥션 풀/TLS 재사용)
+    - 전체 semaphore + 용도별 semaphore로 동시 요청 수 제한
+    - 재시도 가능한 오류는 지수 백오프(+jitter)로 재시도
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+        # 아래는 모두 게이트웨이 루프 안에서만 접근
+        self._clients: Dict[str, AsyncOpenAI] = {}
+        self._global_sem: Optional[asyncio.Semaphore] = None
+        self._purpose_sems: Dict[str, asyncio.Semaphore] = {}
+
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._metrics_lock = threading.Lock()
+
+    # ---------- loop ----------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-gateway", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _client(self, api_key: str) -> AsyncOpenAI:
+        client = self._clients.get(api_key)
+        if client is None:
+            client = AsyncOpenAI(api_key=api_key, timeout=LLM_REQUEST_TIMEOUT_SECONDS, max_retries=0)
+            self._clients[api_key] = client
+        return client
+
+    def _semaphores(self, purpose: str):
+        if self._global_sem is None:
+            self._global_sem = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        sem = self._purpose_sems.get(purpose)
+        if sem is None:
+            sem = asyncio.Semaphore(LLM_PURPOSE_CONCURRENCY.get(purpose, LLM_DEFAULT_PURPOSE_CONCURRENCY))
+            self._purpose_sems[purpose] = sem
+        return self._global_sem, sem
+
+    # ---------- metrics ----------
+
+    def _record(self, purpose: str, **values: float) -> None:
+        with self._metrics_lock:
+            m = self._metrics.setdefault(
+                purpose,
+                {"calls": 0, "errors": 0, "retries": 0, "totalMs": 0.0, "maxMs": 0.0, "waitMs": 0.0},
+            )
+            for k, v in values.items():
+                if k == "maxMs":
+                    m[k] = max(m[k], v)
+                else:
+                    m[k] += v
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        with self._metrics_lock:
+            out = {}
+            for purpose, m in self._metrics.items():
+                calls = m["calls"] or 1
+                out[purpose] = {
+                    **m,
+                    "avgMs": m["totalMs"] / calls,
+                    "avgWaitMs": m["waitMs"] / calls,
+                }
+            return out
+
+    # ---------- call ----------
+
+    async def _create(self, purpose: str, api_key: str, kwargs: Dict[str, Any]):
+        """
+        semaphore를 잡은 상태에서 호출 (재시도 포함)
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await self._client(api_key).chat.completions.create(**kwargs)
+            except _RETRYABLE_ERRORS as e:
+                if attempt >= LLM_MAX_ATTEMPTS:
+                    self._record(purpose, calls=1, errors=1)
+                    raise
+                delay = LLM_BACKOFF_BASE_SECONDS * (2 ** (attempt - 1)) * (1 + random.random())
+                print(f"[llm_gateway] 재시도 {attempt}/{LLM_MAX_ATTEMPTS - 1}: purpose={purpose}, error={e}")
+                self._record(purpose, retries=1)
+                await asyncio.sleep(delay)
+            except Exception:
+                self._record(purpose, calls=1, errors=1)
+                raise
+
+    async def _run(self, purpose: str, api_key: str, kwargs: Dict[str, Any]):
+        global_sem, purpose_sem = self._semaphores(purpose)
+
+        queued = time.perf_counter()
+        async with purpose_sem, global_sem:
+            started = time.perf_counter()
+            self._record(purpose, waitMs=(started - queued) * 1000)
+
+            resp = await self._create(purpose, api_key, kwargs)
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._record(purpose, calls=1, totalMs=elapsed_ms, maxMs=elapsed_ms)
+            return resp
+
+    async def _run_stream(self, purpose: str, api_key: str, kwargs: Dict[str, Any], out: queue.Queue):
+        """
+        stream=True 호출, 받은 chunk를 out에 넣음 (스트림이 끝날 때까지 semaphore 유지)
+        - 재시도는 첫 응답 전까지만 (이미 보낸 chunk는 되돌릴 수 없음)
+        """
+        global_sem, purpose_sem = self._semaphores(purpose)
+
+        queued = time.perf_counter()
+        try:
+            async with purpose_sem, global_sem:
+                started = time.perf_counter()
+                self._record(purpose, waitMs=(started - queued) * 1000)
+
+                stream = await self._create(purpose, api_key, {**kwargs, "stream": True})
+                try:
+                    async for chunk in stream:
+                        out.put(chunk)
+                except Exception:
+                    self._record(purpose, calls=1, errors=1)
+                    raise
+                finally:
+                    await stream.close()
+
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self._record(purpose, calls=1, totalMs=elapsed_ms, maxMs=elapsed_ms)
+        finally:
+            out.put(_STREAM_END)
+
+    def submit(self, purpose: str, api_key: str, kwargs: Dict[str, Any]):
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._run(purpose, api_key, kwargs), loop)
+
+
+    def submit_stream(self, purpose: str, api_key: str, kwargs: Dict[str, Any], out: queue.Queue):
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._run_stream(purpose, api_key, kwargs, out), loop)
+
+
+_gateway = _Gateway()
+
+
+def chat_completion(purpose: str, api_key: Optional[str] = None, **kwargs: Any):
+    """
+    동기 코드용 chat.completions.create (kwargs는 OpenAI SDK와 동일)
+    - api_key가 없으면 OPENAI_API_KEY 사용
+    """
+    future = _gateway.submit(purpose, api_key or settings.openai_api_key, kwargs)
+    return future.result()
+
+
+async def achat_completion(purpose: str, api_key: Optional[str] = None, **kwargs: Any):
+    """
+    async 코드용 chat_completion (호출한 루프를 막지 않고 게이트웨이 루프 결과를 기다림)
+    """
+    future = _gateway.submit(purpose, api_key or settings.openai_api_key, kwargs)
+    return await asyncio.wrap_future(future)
+
+
+def stream_chat_completion(purpose: str, api_key: Optional[str] = None, **kwargs: Any) -> Iterator[Any]:
+    """
+    동기 코드용 chat.completions.create(stream=True), chunk를 받는 대로 반환
+    - 호출부가 중간에 멈추면 게이트웨이 쪽 스트림도 취소
+    """
+    chunks: queue.Queue = queue.Queue()
+    future = _gateway.submit_stream(purpose, api_key or settings.openai_api_key, kwargs, chunks)
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is _STREAM_END:
+                break
+            yield chunk
+        future.result()  # 스트림 중 오류는 여기서 전달
+    finally:
+        if not future.done():
+            future.cancel()
+
+
+def get_llm_metrics() -> Dict[str, Dict[str, float]]:
+    """
+    용도별 호출 수/오류/재시도/평균·최대 응답 시간(ms)/평균 대기 시간(ms)
+    """
+    return _gateway.metrics()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+import redis
+
+from common.config import settings
+
+REDIS_SOCKET_TIMEOUT_SECONDS = 0.5  # 캐시 용도라 짧게: 느리면 DB 경로로 넘어감
+REDIS_RETRY_COOLDOWN_SECONDS = 30  # 연결 실패 후 이 시간 동안은 Redis를 건너뜀
+
+_client: Optional[redis.Redis] = None
+_unavailable_until = 0.0
+_lock = threading.Lock()
+
+
+def get_redis_client() -> Optional[redis.Redis]:
+    """
+    캐시용 공용 Redis 클라이언트.
+    - 최근 연결 실패 후 cooldown 중이면 None (호출 측은 DB 경로로 진행)
+    """
+    global _client
+
+    if time.monotonic() < _unavailable_until:
+        return None
+
+    with _lock:
+        if _client is None:
+            _client = redis.Redis.from_url(
+                settings.redis_url,
+                socket_connect_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+                socket_timeout=REDIS_SOCKET_TIMEOUT_SECONDS,
+                health_check_interval=30,
+            )
+        return _client
+
+
+def mark_redis_unavailable(error: Exception) -> None:
+    global _unavailable_until
+
+    _unavailable_until = time.monotonic() + REDIS_RETRY_COOLDOWN_SECONDS
+    print(f"[redis] 사용 불가, {REDIS_RETRY_COOLDOWN_SECONDS}초간 건너뜀: error={error}")
+
+
+def set_redis_client(client: Optional[redis.Redis]) -> None:
+    """
+    로컬 Redis/fakeredis 등으로 클라이언트 교체 (테스트용)
+    """
+    global _client, _unavailable_until
+
+    with _lock:
+        _client = client
+        _unavailable_until = 0.0
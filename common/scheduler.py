@@ -1,7 +1,10 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from sqlalchemy.orm import Session
 from common.database import SessionLocal
-from portfolio.portfolio_snapshot_service import run_daily_portfolio_snapshot_for_user
+from common.date_utils import is_us_market_open
+from marketdata.marketdata_service import refresh_tracked_quotes
+from portfolio.portfolio_backfill import run_portfolio_backfill
+from portfolio.portfolio_snapshot_service import run_daily_portfolio_snapshots
 
 from sector_summary.service.daily_summary import (
     run_daily_sector_summary_for_user
@@ -14,8 +17,10 @@ from trades.trades_entity import Asset
 from tickers.tickers_service import (
     refresh_asset_overview_if_needed,
 )
+from tickers.explain_cache import evict_explain_cache
 
 MAX_ASSETS_PER_RUN = 10  # 한 번 실행에서 갱신할 최대 종목 수(무료 API 호출 횟수 제한으로 인해 임시 적용)
+QUOTE_REFRESH_INTERVAL_SECONDS = 60  # 장중 시세 선갱신 주기 (asset_prices TTL 180초보다 짧게)
 
 def start_scheduler(app):
     scheduler = BackgroundScheduler(timezone="Asia/Seoul")
@@ -82,10 +87,8 @@ def start_scheduler(app):
     def daily_portfolio_snapshot_job():
         db: Session = SessionLocal()
         try:
-            user_ids = [uid for (uid,) in db.query(User.id).all()]
-            for user_id in user_ids:
-                run_daily_portfolio_snapshot_for_user(db, user_id)
-            db.commit()
+            saved = run_daily_portfolio_snapshots(db)
+            print(f"[daily_portfolio_snapshot_job] 저장 사용자 수: {saved}")
         except Exception:
             db.rollback()
             raise
@@ -101,5 +104,69 @@ def start_scheduler(app):
         replace_existing=True,
     )
 
+    def portfolio_backfill_job():
+        db: Session = SessionLocal()
+        try:
+            inserted = run_portfolio_backfill(db)
+            print(f"[portfolio_backfill_job] 저장 날짜 수: {inserted}")
+        except Exception as e:
+            db.rollback()
+            print(f"[portfolio_backfill_job] 실패: error={e}")
+        finally:
+            db.close()
+
+    scheduler.add_job(
+        portfolio_backfill_job,
+        trigger="cron",
+        hour=9,
+        minute=20,
+        id="portfolio_backfill",
+        replace_existing=True,
+    )
+
+    def quote_refresh_job():
+        if not is_us_market_open():
+            return
+
+        db: Session = SessionLocal()
+        try:
+            refreshed = refresh_tracked_quotes(db)
+            print(f"[quote_refresh_job] 갱신 종목 수: {refreshed}")
+        except Exception as e:
+            db.rollback()
+            print(f"[quote_refresh_job] 실패: error={e}")
+        finally:
+            db.close()
+
+    scheduler.add_job(
+        quote_refresh_job,
+        trigger="interval",
+        seconds=QUOTE_REFRESH_INTERVAL_SECONDS,
+        id="quote_refresh",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+
+    def explain_cache_evict_job():
+        db: Session = SessionLocal()
+        try:
+            deleted = evict_explain_cache(db)
+            print(f"[explain_cache_evict_job] 삭제 수: {deleted}")
+        except Exception as e:
+            db.rollback()
+            print(f"[explain_cache_evict_job] 실패: error={e}")
+        finally:
+            db.close()
+
+    scheduler.add_job(
+        explain_cache_evict_job,
+        trigger="cron",
+        hour=4,
+        minute=0,
+        id="explain_cache_evict",
+        replace_existing=True,
+    )
+
     scheduler.start()
     app.state.scheduler = scheduler
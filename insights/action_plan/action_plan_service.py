@@ -1,7 +1,6 @@
 from sqlalchemy.orm import Session
-from openai import OpenAI
 import json
-from common.config import settings
+from common.llm_gateway import chat_completion
 from trades.trades_entity import Trade
 from insights.action_plan.action_plan_entity import ActionPlan
 from insights.action_plan.action_plan_repository import (
@@ -9,8 +8,6 @@ from insights.action_plan.action_plan_repository import (
     create_action_plan,
 )
 
-client = OpenAI(api_key=settings.openai_api_key)
-
 # =========================
 # 데이터 부족 플레이스홀더
 # =========================
@@ -303,7 +300,8 @@ def _count_trade_types(trades: list) -> tuple[int, int]:
 # GPT 호출
 # =========================
 def _call_gpt(trades_json: dict) -> dict:
-    response = client.chat.completions.create(
+    response = chat_completion(
+        "action_plan",
         model="gpt-4o-mini",
         temperature=0.2,
         response_format={"type": "json_object"},
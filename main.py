@@ -22,6 +22,7 @@ from watchlist.watchlist_router import router as watchlist_router
 from tickers.news_scheduler import run_daily_at_9
 from analysis.analysis_router import router as analysis_router
 from rag.rag_router import router as rag_router
+from rag.retriever_registry import retriever_registry
 
 import threading
 
@@ -43,6 +44,7 @@ app.add_middleware(
 @app.on_event("startup")
 def startup_event():
     start_scheduler(app)
+    retriever_registry.warm_up()  # FAISS 인덱스를 첫 요청 전에 미리 로드
 
 # routers
 app.include_router(auth_router)
@@ -0,0 +1,147 @@
+# 종목별 일봉을 컬럼형 float64 배열로 저장하는 로컬 파일 저장소 (daily_bars 테이블의 읽기 전용 사본)
+# - 파일: {bar_store_dir}/{TICKER}.npy, shape=(3, n), C-order
+#   - [0]: 날짜 (1970-01-01 기준 일수)
+#   - [1]: 종가
+#   - [2]: 거래량 (없으면 NaN)
+# - 행마다 연속 메모리라 np.load(mmap_mode="r")로 열어 날짜 구간을 복사 없이 슬라이스할 수 있음
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from common.config import settings
+
+ROW_DATE, ROW_CLOSE, ROW_VOLUME = 0, 1, 2
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+
+
+def _to_day_number(d: date) -> float:
+    return float((np.datetime64(d, "D") - _EPOCH).astype(np.int64))
+
+
+@dataclass(frozen=True)
+class BarArrays:
+    """
+    날짜 오름차순 일봉 배열 (mmap 배열의 view일 수 있으므로 읽기 전용으로 사용)
+    """
+    days: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.days.shape[0])
+
+    @property
+    def dates(self) -> np.ndarray:
+        return _EPOCH + self.days.astype("timedelta64[D]")
+
+    def slice_between(self, start: Optional[date], end: Optional[date]) -> "BarArrays":
+        """
+        start <= 날짜 <= end 구간 (복사 없는 view)
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.days, _to_day_number(start), side="left"))
+        hi = len(self) if end is None else int(np.searchsorted(self.days, _to_day_number(end), side="right"))
+        return BarArrays(self.days[lo:hi], self.close[lo:hi], self.volume[lo:hi])
+
+    def slice_until(self, day: date) -> "BarArrays":
+        return self.slice_between(None, day)
+
+
+class BarFileStore:
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self._cache: Dict[str, Tuple[int, np.ndarray]] = {}  # ticker -> (mtime_ns, mmap)
+        self._lock = threading.Lock()
+
+    def _path(self, ticker: str) -> Path:
+        return self.root / f"{ticker.upper().strip()}.npy"
+
+    def modified_at(self, ticker: str) -> Optional[datetime]:
+        try:
+            mtime = self._path(ticker).stat().st_mtime
+        except FileNotFoundError:
+            return None
+        return datetime.fromtimestamp(mtime, tz=timezone.utc)
+
+    def read(self, ticker: str) -> Optional[BarArrays]:
+        """
+        mmap으로 열어 반환. 파일이 교체됐으면(mtime 변경) 다시 엶
+        """
+        path = self._path(ticker)
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        t = ticker.upper().strip()
+        with self._lock:
+            cached = self._cache.get(t)
+            if cached is None or cached[0] != mtime_ns:
+                cached = (mtime_ns, np.load(path, mmap_mode="r"))
+                self._cache[t] = cached
+
+        arr = cached[1]
+        return BarArrays(arr[ROW_DATE], arr[ROW_CLOSE], arr[ROW_VOLUME])
+
+    def write(self, ticker: str, days: np.ndarray, close: np.ndarray, volume: np.ndarray) -> None:
+        """
+        전체 배열을 임시 파일에 쓴 뒤 os.replace로 교체 (읽는 쪽은 항상 완성된 파일만 봄)
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        arr = np.vstack(
+            [
+                np.asarray(days, dtype=np.float64),
+                np.asarray(close, dtype=np.float64),
+                np.asarray(volume, dtype=np.float64),
+            ]
+        )
+
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".npy.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, arr)
+            os.replace(tmp, self._path(ticker))
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def append(self, ticker: str, days: np.ndarray, close: np.ndarray, volume: np.ndarray) -> None:
+        """
+        새 bar를 뒤에 붙임. 겹치는 날짜(미확정 bar 재조회 등)는 새 값으로 대체
+        """
+        days = np.asarray(days, dtype=np.float64)
+        if days.size == 0:
+            return
+
+        current = self.read(ticker)
+        if current is None or len(current) == 0:
+            self.write(ticker, days, close, volume)
+            return
+
+        keep = int(np.searchsorted(current.days, days[0], side="left"))
+        self.write(
+            ticker,
+            np.concatenate([current.days[:keep], days]),
+            np.concatenate([current.close[:keep], np.asarray(close, dtype=np.float64)]),
+            np.concatenate([current.volume[:keep], np.asarray(volume, dtype=np.float64)]),
+        )
+
+
+def day_numbers(dates) -> np.ndarray:
+    """
+    date 목록 -> 1970-01-01 기준 일수(float64)
+    """
+    return (np.asarray(dates, dtype="datetime64[D]") - _EPOCH).astype(np.float64)
+
+
+bar_file_store = BarFileStore(settings.bar_store_dir)
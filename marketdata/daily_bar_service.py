@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import threading
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from common.database import SessionLocal
+from common.date_utils import US_MARKET_TZ
+from marketdata.bar_file_store import BarArrays, bar_file_store, day_numbers
+from marketdata.marketdata_entity import DailyBarSync
+from marketdata.marketdata_repository import (
+    list_daily_bars,
+    bulk_upsert_daily_bars,
+    list_daily_bar_syncs,
+    upsert_daily_bar_syncs,
+)
+from marketdata.yfinance_client import fetch_daily_bars
+
+
+BAR_SYNC_TTL_SECONDS = 60 * 30  # 최근 bar(장중 미확정 포함)를 다시 받아오는 최소 간격
+BAR_EMPTY_RETRY_SECONDS = 60 * 60  # 응답에서 빠진 종목(상장폐지/일시 오류)을 다시 조회하기까지 대기 시간
+
+# 응답에서 빠진 종목 -> 재조회 가능 시각 (동기화 구간은 기록하지 않음: 일시 오류로 빠진 경우 구멍이 남지 않도록)
+_empty_until: Dict[str, datetime] = {}
+_empty_lock = threading.Lock()
+
+
+def _us_today() -> date:
+    return datetime.now(US_MARKET_TZ).date()
+
+
+def _is_sync_stale(sync: DailyBarSync) -> bool:
+    synced_at = sync.synced_at
+    if synced_at is None:
+        return True
+    if synced_at.tzinfo is None:
+        synced_at = synced_at.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - synced_at) >= timedelta(seconds=BAR_SYNC_TTL_SECONDS)
+
+
+def _plan_fetch(sync: Optional[DailyBarSync], start: date, end: date, today: date) -> Optional[Tuple[date, date]]:
+    """
+    store에 없는 구간만 조회 대상으로 계산
+    - 처음 보는 종목: [start, end]
+    - 앞쪽이 비면: [start, covered_from]
+    - 뒤쪽이 비거나, 마지막 bar가 최근(미확정일 수 있음)인데 동기화가 오래됐으면: [covered_to, end]
+    """
+    if sync is None:
+        return start, end
+
+    fetch_from: Optional[date] = None
+    fetch_to: Optional[date] = None
+
+    if start < sync.covered_from:
+        fetch_from, fetch_to = start, sync.covered_from
+
+    recent = sync.covered_to >= today - timedelta(days=1)
+    if end > sync.covered_to or (recent and end >= sync.covered_to and _is_sync_stale(sync)):
+        fetch_from = fetch_from or sync.covered_to
+        fetch_to = end
+
+    if fetch_from is None:
+        return None
+    return fetch_from, fetch_to
+
+
+def _is_marked_empty(ticker: str, now: datetime) -> bool:
+    with _empty_lock:
+        until = _empty_until.get(ticker)
+        if until is not None and until <= now:
+            del _empty_until[ticker]
+            return False
+        return until is not None
+
+
+def _mark_empty(tickers: Iterable[str], now: datetime) -> None:
+    until = now + timedelta(seconds=BAR_EMPTY_RETRY_SECONDS)
+    with _empty_lock:
+        for t in tickers:
+            _empty_until[t] = until
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+
+def ensure_daily_bars(db: Session, tickers: Iterable[str], start: date, end: date) -> Dict[str, datetime]:
+    """
+    daily_bars가 종목별로 [start, end]를 커버하도록 빠진 구간만 채움.
+    - 조회가 필요한 종목들은 yf.download 한 번으로 같이 조회
+    - 반환: {ticker: 마지막 동기화 시각} (store에 bar가 없는 종목은 제외)
+    """
+    today = _us_today()
+    end = min(end, today)
+
+    ts = sorted({t.upper().strip() for t in tickers if t and t.strip()})
+    syncs: Dict[str, DailyBarSync] = {s.ticker: s for s in list_daily_bar_syncs(db, ts)}
+    synced_at = {t: _as_utc(s.synced_at) for t, s in syncs.items() if s.synced_at is not None}
+    if start > end:
+        return synced_at
+
+    plans = {t: _plan_fetch(syncs.get(t), start, end, today) for t in ts}
+    now = datetime.now(timezone.utc)
+    need = {t: p for t, p in plans.items() if p is not None and not _is_marked_empty(t, now)}
+    if not need:
+        return synced_at
+
+    fetch_start = min(p[0] for p in need.values())
+    fetch_end = max(p[1] for p in need.values())
+
+    frames = fetch_daily_bars(list(need), fetch_start, fetch_end)  # yfinance 호출(1회)
+    # 응답에 없는 종목은 bar가 없는 구간인지 일시 오류인지 구분할 수 없으므로 동기화 구간을 기록하지 않고
+    # BAR_EMPTY_RETRY_SECONDS 동안만 재조회를 건너뜀
+    _mark_empty([t for t in need if t not in frames], now)
+    if not frames:
+        return synced_at
+
+    rows = []
+    for t, df in frames.items():
+        for d, bar in df.iterrows():
+            rows.append(
+                {
+                    "ticker": t,
+                    "trade_date": d,
+                    "open": None if pd.isna(bar["open"]) else float(bar["open"]),
+                    "high": None if pd.isna(bar["high"]) else float(bar["high"]),
+                    "low": None if pd.isna(bar["low"]) else float(bar["low"]),
+                    "close": float(bar["close"]),
+                    "volume": None if pd.isna(bar["volume"]) else int(bar["volume"]),
+                }
+            )
+
+    bulk_upsert_daily_bars(db, rows)
+    # 응답에 있는 종목만, 종목별로 계획한 구간을 동기화 기록
+    upsert_daily_bar_syncs(
+        db,
+        [{"ticker": t, "covered_from": need[t][0], "covered_to": need[t][1]} for t in frames if t in need],
+    )
+    db.commit()
+
+    now = datetime.now(timezone.utc)
+    synced_at.update({t: now for t in frames})
+    return synced_at
+
+
+def _bars_to_columns(bars) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    days = day_numbers([d for d, _, _ in bars])
+    close = np.array([float(c) for _, c, _ in bars], dtype=np.float64)
+    volume = np.array([np.nan if v is None else float(v) for _, _, v in bars], dtype=np.float64)
+    return days, close, volume
+
+
+def _sync_bar_file(db: Session, ticker: str, synced_at: Optional[datetime]) -> Optional[BarArrays]:
+    """
+    daily_bars -> mmap 파일 동기화
+    - 파일이 마지막 동기화 이후에 쓰였으면 그대로 사용
+    - 뒤쪽만 늘어났으면 마지막 bar(미확정일 수 있음)부터 append
+    - 파일이 없거나 앞쪽 구간이 새로 생겼으면 전체를 다시 씀
+    """
+    current = bar_file_store.read(ticker)
+    modified_at = bar_file_store.modified_at(ticker)
+
+    if current is not None and (synced_at is None or (modified_at is not None and modified_at >= synced_at)):
+        return current
+
+    if current is not None and len(current) > 0:
+        first_day, last_day = current.dates[0].item(), current.dates[-1].item()
+        head = list_daily_bars(db, ticker, None, first_day - timedelta(days=1))
+        if not head:
+            tail = list_daily_bars(db, ticker, last_day, None)
+            bar_file_store.append(ticker, *_bars_to_columns(tail))
+            return bar_file_store.read(ticker)
+
+    bars = list_daily_bars(db, ticker)
+    if not bars:
+        return None
+
+    bar_file_store.write(ticker, *_bars_to_columns(bars))
+    return bar_file_store.read(ticker)
+
+
+def load_daily_bar_arrays_batch(db: Session, tickers: Iterable[str], start: date, end: date) -> Dict[str, BarArrays]:
+    """
+    여러 종목의 [start, end] 일봉을 mmap 배열 view로 반환
+    - 빠진 구간은 ensure_daily_bars가 yf.download 한 번으로 같이 채움
+    - 데이터가 없는 종목은 결과에서 제외
+    """
+    ts = sorted({t.upper().strip() for t in tickers if t and t.strip()})
+    synced_at = ensure_daily_bars(db, ts, start, end)
+
+    out: Dict[str, BarArrays] = {}
+    for t in ts:
+        arrays = _sync_bar_file(db, t, synced_at.get(t))
+        if arrays is None:
+            continue
+        sliced = arrays.slice_between(start, end)
+        if len(sliced) > 0:
+            out[t] = sliced
+    return out
+
+
+def load_daily_bar_arrays(db: Session | None, ticker: str, start: date, end: date) -> BarArrays:
+    """
+    [start, end] 일봉을 mmap 배열 view로 반환 (복사 없음, 읽기 전용)
+    - 빠진 구간은 먼저 yfinance에서 채우고, 파일이 DB보다 오래됐으면 갱신
+    - db가 없으면 자체 세션 사용
+    """
+    if db is None:
+        own = SessionLocal()
+        try:
+            return load_daily_bar_arrays(own, ticker, start, end)
+        finally:
+            own.close()
+
+    t = ticker.upper().strip()
+    out = load_daily_bar_arrays_batch(db, [t], start, end).get(t)
+    if out is None:
+        raise ValueError("yfinance에서 가격 데이터를 가져오지 못했습니다.")
+
+    return out
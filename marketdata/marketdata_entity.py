@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey, func
+from sqlalchemy import Column, String, Numeric, Date, DateTime, BigInteger, ForeignKey, func
 from common.database import Base
 
 
@@ -11,4 +11,32 @@ class AssetPrice(Base):
     change_rate = Column(Numeric(18, 8), nullable=True)
 
     captured_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+
+class DailyBar(Base):
+    __tablename__ = "daily_bars"
+
+    ticker = Column(String(16), primary_key=True)
+    trade_date = Column(Date, primary_key=True)
+
+    open = Column(Numeric(18, 6), nullable=True)
+    high = Column(Numeric(18, 6), nullable=True)
+    low = Column(Numeric(18, 6), nullable=True)
+    close = Column(Numeric(18, 6), nullable=False)
+    volume = Column(BigInteger, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+
+class DailyBarSync(Base):
+    """
+    종목별로 daily_bars가 어느 구간까지 채워져 있는지 기록
+    (상장 전/휴장일처럼 bar가 없는 날짜를 다시 조회하지 않기 위함)
+    """
+    __tablename__ = "daily_bar_syncs"
+
+    ticker = Column(String(16), primary_key=True)
+    covered_from = Column(Date, nullable=False)
+    covered_to = Column(Date, nullable=False)
+    synced_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
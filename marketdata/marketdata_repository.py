@@ -1,9 +1,17 @@
 # marketdata/asset_price_repository.py
 from __future__ import annotations
 
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
-from marketdata.marketdata_entity import AssetPrice
+from marketdata.marketdata_entity import AssetPrice, DailyBar, DailyBarSync
+from trades.trades_entity import Holding, TradePosition
+from watchlist.watchlist_entity import Watchlist
 
 
 def get_asset_price_by_ticker(db: Session, ticker: str) -> AssetPrice | None:
@@ -11,6 +19,13 @@ def get_asset_price_by_ticker(db: Session, ticker: str) -> AssetPrice | None:
     return db.query(AssetPrice).filter(AssetPrice.ticker == t).first()
 
 
+def list_asset_prices_by_tickers(db: Session, tickers: Iterable[str]) -> List[AssetPrice]:
+    ts = sorted({t.upper().strip() for t in tickers if t})
+    if not ts:
+        return []
+    return db.query(AssetPrice).filter(AssetPrice.ticker.in_(ts)).all()
+
+
 def upsert_asset_price(
     db: Session,
     ticker: str,
@@ -19,20 +34,133 @@ def upsert_asset_price(
     change_rate=None,
 ) -> AssetPrice:
     t = ticker.upper().strip()
-    row = db.query(AssetPrice).filter(AssetPrice.ticker == t).first()
-
-    if row is None:
-        row = AssetPrice(
-            ticker=t,
-            price=price,
-            change=change,
-            change_rate=change_rate,
+    bulk_upsert_asset_prices(
+        db,
+        [{"ticker": t, "price": price, "change": change, "change_rate": change_rate}],
+    )
+    return (
+        db.query(AssetPrice)
+        .populate_existing()
+        .filter(AssetPrice.ticker == t)
+        .one()
+    )
+
+
+def bulk_upsert_asset_prices(db: Session, rows: List[dict]) -> None:
+    """
+    rows: [{"ticker", "price", "change", "change_rate"}, ...]
+    한 번의 INSERT ... ON CONFLICT 로 여러 종목 시세 저장
+    """
+    if not rows:
+        return
+
+    # 같은 ticker가 두 번 들어오면 ON CONFLICT가 실패하므로 마지막 값만 사용,
+    # 동시 업서트 간 락 순서를 맞추기 위해 ticker 순으로 정렬
+    by_ticker = {
+        r["ticker"].upper().strip(): {
+            "ticker": r["ticker"].upper().strip(),
+            "price": r["price"],
+            "change": r.get("change"),
+            "change_rate": r.get("change_rate"),
+        }
+        for r in rows
+    }
+
+    stmt = insert(AssetPrice).values([by_ticker[t] for t in sorted(by_ticker)])
+
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["ticker"],
+        set_={
+            "price": stmt.excluded.price,
+            "change": stmt.excluded.change,
+            "change_rate": stmt.excluded.change_rate,
+            "updated_at": func.now(),
+        },
+    )
+
+    db.execute(stmt)
+
+
+def list_tracked_tickers(db: Session) -> List[str]:
+    """
+    시세를 미리 갱신해 둘 종목: holdings ∪ watchlist ∪ OPEN trade_positions
+    """
+    q = (
+        db.query(Holding.ticker)
+        .union(
+            db.query(Watchlist.ticker),
+            db.query(TradePosition.ticker).filter(TradePosition.status == "OPEN"),
         )
-        db.add(row)
-    else:
-        row.price = price
-        row.change = change
-        row.change_rate = change_rate
-
-    db.flush()
-    return row
\ No newline at end of file
+    )
+    return sorted({t.upper().strip() for (t,) in q.all() if t})
+
+
+DAILY_BAR_UPSERT_CHUNK = 1000  # INSERT 한 문장에 넣을 최대 row 수
+
+
+def list_daily_bars(
+    db: Session,
+    ticker: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> List[Tuple[date, Decimal, int | None]]:
+    """
+    (trade_date, close, volume) 튜플만 조회 (ORM 객체 생성 없이)
+    - start/end가 None이면 해당 방향 제한 없음
+    """
+    t = ticker.upper().strip()
+    q = db.query(DailyBar.trade_date, DailyBar.close, DailyBar.volume).filter(DailyBar.ticker == t)
+    if start is not None:
+        q = q.filter(DailyBar.trade_date >= start)
+    if end is not None:
+        q = q.filter(DailyBar.trade_date <= end)
+    return q.order_by(DailyBar.trade_date.asc()).all()
+
+
+def bulk_upsert_daily_bars(db: Session, rows: List[dict]) -> None:
+    """
+    rows: [{"ticker", "trade_date", "open", "high", "low", "close", "volume"}, ...]
+    """
+    for i in range(0, len(rows), DAILY_BAR_UPSERT_CHUNK):
+        chunk = rows[i : i + DAILY_BAR_UPSERT_CHUNK]
+
+        stmt = insert(DailyBar).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["ticker", "trade_date"],
+            set_={
+                "open": stmt.excluded.open,
+                "high": stmt.excluded.high,
+                "low": stmt.excluded.low,
+                "close": stmt.excluded.close,
+                "volume": stmt.excluded.volume,
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+
+
+def list_daily_bar_syncs(db: Session, tickers: Iterable[str]) -> List[DailyBarSync]:
+    ts = sorted({t.upper().strip() for t in tickers if t})
+    if not ts:
+        return []
+    return db.query(DailyBarSync).filter(DailyBarSync.ticker.in_(ts)).all()
+
+
+def upsert_daily_bar_syncs(db: Session, rows: List[dict]) -> None:
+    """
+    rows: [{"ticker", "covered_from", "covered_to"}, ...]
+    기존 구간과 합쳐서(min/max) 저장
+    """
+    if not rows:
+        return
+
+    stmt = insert(DailyBarSync).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["ticker"],
+        set_={
+            "covered_from": func.least(DailyBarSync.covered_from, stmt.excluded.covered_from),
+            "covered_to": func.greatest(DailyBarSync.covered_to, stmt.excluded.covered_to),
+            "synced_at": func.now(),
+        },
+    )
+    db.execute(stmt)
@@ -1,46 +1,332 @@
 # marketdata/asset_price_service.py
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
 from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
 
 from sqlalchemy.orm import Session
 
-from marketdata.marketdata_repository import get_asset_price_by_ticker, upsert_asset_price
-from marketdata.yfinance_client import fetch_quote_fields
+from common.database import SessionLocal
+from marketdata.marketdata_repository import (
+    list_asset_prices_by_tickers,
+    bulk_upsert_asset_prices,
+    list_tracked_tickers,
+)
+from marketdata.quote_cache import CachedQuote, QuoteMemoryCache
+from marketdata.quote_redis_cache import get_shared_quotes, set_shared_quotes
+from marketdata.yfinance_client import QuoteFields, fetch_quote_fields, fetch_quote_fields_batch
+
+
+QUOTE_REFRESH_CHUNK_SIZE = 50  # yf.download 한 번에 요청할 최대 종목 수
+QUOTE_MAX_STALE_SECONDS = 60 * 60 * 6  # 이 시간 이내의 stale 값은 먼저 응답하고 백그라운드에서 갱신
+QUOTE_FETCH_WAIT_SECONDS = 30  # 다른 요청이 조회 중인 종목을 기다리는 최대 시간
+QUOTE_L1_MAX_SIZE = 2048  # 프로세스 내 L1 캐시 최대 종목 수
+
+# L1(프로세스 메모리) -> 공유(Redis, 선택) -> L2(asset_prices) -> origin(yfinance)
+_l1_cache = QuoteMemoryCache(max_size=QUOTE_L1_MAX_SIZE, max_age_seconds=QUOTE_MAX_STALE_SECONDS)
+
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+_revalidate_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="quote-revalidate")
+_revalidating: set[str] = set()
+_revalidating_lock = threading.Lock()
 
 
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _is_stale(updated_at: datetime | None, ttl_seconds: int) -> bool:
+def _age_seconds(updated_at: datetime | None) -> float | None:
     if updated_at is None:
-        return True
+        return None
     if updated_at.tzinfo is None:
         updated_at = updated_at.replace(tzinfo=timezone.utc)
-    return (_utcnow() - updated_at) >= timedelta(seconds=ttl_seconds)
+    return (_utcnow() - updated_at).total_seconds()
+
+
+def _is_stale(updated_at: datetime | None, ttl_seconds: int) -> bool:
+    age = _age_seconds(updated_at)
+    return age is None or age >= ttl_seconds
 
 
-def get_cached_quote_fields(db: Session, ticker: str, ttl_seconds: int = 180):
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _to_cached_quote(ticker: str, q: QuoteFields, updated_at: datetime) -> CachedQuote:
+    return CachedQuote(
+        ticker=ticker,
+        price=q.price,
+        change=q.change,
+        change_rate=q.change_rate,
+        updated_at=updated_at,
+    )
+
+
+def get_quote_cache_stats() -> dict:
+    return _l1_cache.stats()
+
+
+def _upsert_quotes(db: Session, quotes: Dict[str, QuoteFields]) -> None:
+    bulk_upsert_asset_prices(
+        db,
+        [
+            {
+                "ticker": t,
+                "price": q.price,
+                "change": q.change,
+                "change_rate": q.change_rate,
+            }
+            for t, q in quotes.items()
+        ],
+    )
+
+
+def _fetch_and_store_single_flight(
+    db: Session,
+    tickers: List[str],
+    fallback_single: bool,
+) -> Dict[str, QuoteFields]:
+    """
+    종목별 in-flight 등록부로 같은 종목의 yfinance 조회가 프로세스 내에서 동시에 한 번만 일어나도록 함.
+    - 먼저 등록한 쪽(owner)이 조회 + 업서트 + 커밋 후 결과를 Future로 공유
+    - 이미 조회 중인 종목은 owner의 결과를 기다려 재사용
+    - fallback_single=True면 배치 응답에서 빠진 종목을 단건 조회로 보정하고, 실패 시 예외를 올림
+    - 반환: 조회에 성공한 종목의 QuoteFields
+    """
+    owned: Dict[str, Future] = {}
+    waiting: Dict[str, Future] = {}
+
+    with _inflight_lock:
+        for t in tickers:
+            f = _inflight.get(t)
+            if f is None:
+                f = Future()
+                _inflight[t] = f
+                owned[t] = f
+            else:
+                waiting[t] = f
+
+    out: Dict[str, QuoteFields] = {}
+    first_error: Optional[Exception] = None
+
+    if owned:
+        fetched: Dict[str, QuoteFields] = {}
+        errors: Dict[str, Exception] = {}
+        try:
+            fetched = fetch_quote_fields_batch(list(owned))  # yfinance 호출(1회)
+
+            if fallback_single:
+                # 배치 응답에서 빠진 종목은 단건 조회로 보정 (fast_info/history fallback)
+                for t in owned:
+                    if t not in fetched:
+                        try:
+                            fetched[t] = fetch_quote_fields(t)
+                        except Exception as e:
+                            errors[t] = e
+
+            _upsert_quotes(db, fetched)
+            db.commit()
+
+            now = _utcnow()
+            cached = [_to_cached_quote(t, q, now) for t, q in fetched.items()]
+            _l1_cache.put_many(cached)
+            set_shared_quotes(cached, expire_seconds=QUOTE_MAX_STALE_SECONDS)
+        except Exception as e:
+            for f in owned.values():
+                f.set_exception(e)
+            raise
+        else:
+            for t, f in owned.items():
+                if t in errors:
+                    f.set_exception(errors[t])
+                else:
+                    f.set_result(fetched.get(t))
+        finally:
+            with _inflight_lock:
+                for t in owned:
+                    _inflight.pop(t, None)
+
+        out.update(fetched)
+        if errors:
+            first_error = next(iter(errors.values()))
+
+    for t, f in waiting.items():
+        try:
+            q = f.result(timeout=QUOTE_FETCH_WAIT_SECONDS)
+        except Exception as e:
+            if fallback_single and first_error is None:
+                first_error = e
+            continue
+        if q is not None:
+            out[t] = q
+
+    if first_error is not None:
+        raise first_error
+
+    return out
+
+
+def _fetch_single_quotes(db: Session, tickers: List[str]) -> Dict[str, QuoteFields]:
+    """
+    단건 조회(fetch_quote_fields)로 가져와 업서트 + 캐시 (배치 응답에서 빠진 종목 보정용)
+    - 하나라도 실패하면 어떤 종목인지 담아 ValueError
+    """
+    fetched: Dict[str, QuoteFields] = {}
+    for t in tickers:
+        try:
+            fetched[t] = fetch_quote_fields(t)
+        except Exception as e:
+            raise ValueError(f"현재가를 가져오지 못했습니다: ticker={t}, error={e}") from e
+
+    _upsert_quotes(db, fetched)
+    db.commit()
+
+    now = _utcnow()
+    cached = [_to_cached_quote(t, q, now) for t, q in fetched.items()]
+    _l1_cache.put_many(cached)
+    set_shared_quotes(cached, expire_seconds=QUOTE_MAX_STALE_SECONDS)
+    return fetched
+
+
+def refresh_quotes(db: Session, tickers: Iterable[str], chunk_size: int = QUOTE_REFRESH_CHUNK_SIZE) -> int:
+    """
+    종목들을 chunk_size 단위 yf.download로 갱신 후 chunk마다 커밋.
+    - 응답에 없는 종목은 건너뜀(기존 값 유지)
+    - 반환: 갱신된 종목 수
+    """
+    ts = sorted({t.upper().strip() for t in tickers if t and t.strip()})
+    refreshed = 0
+
+    for chunk in _chunks(ts, chunk_size):
+        try:
+            fetched = _fetch_and_store_single_flight(db, chunk, fallback_single=False)
+        except Exception as e:
+            db.rollback()
+            print(f"[refresh_quotes] 실패: {chunk[0]}..{chunk[-1]}, error={e}")
+            continue
+
+        refreshed += len(fetched)
+
+    return refreshed
+
+
+def refresh_tracked_quotes(db: Session, chunk_size: int = QUOTE_REFRESH_CHUNK_SIZE) -> int:
+    """
+    holdings/watchlist/OPEN 포지션 종목 전체를 미리 갱신 (스케줄러용)
+    """
+    return refresh_quotes(db, list_tracked_tickers(db), chunk_size=chunk_size)
+
+
+def _revalidate_in_background(tickers: List[str]) -> None:
+    with _revalidating_lock:
+        targets = [t for t in tickers if t not in _revalidating]
+        _revalidating.update(targets)
+
+    if not targets:
+        return
+
+    def _job():
+        db = SessionLocal()
+        try:
+            refresh_quotes(db, targets)
+        except Exception as e:
+            print(f"[quote_revalidate] 실패: {targets}, error={e}")
+        finally:
+            db.close()
+            with _revalidating_lock:
+                _revalidating.difference_update(targets)
+
+    _revalidate_executor.submit(_job)
+
+
+def get_cached_quote_fields(db: Session, ticker: str, ttl_seconds: int = 180) -> CachedQuote:
     """
     - ttl_seconds 기본 180초(3분)
     - stale이면 yfinance 호출 후 asset_prices 업서트
-    - 아니면 DB 값 그대로 반환
+    - 아니면 캐시 값 그대로 반환
     """
     t = ticker.upper().strip()
-    row = get_asset_price_by_ticker(db, t)
-
-    if row is None or _is_stale(getattr(row, "updated_at", None), ttl_seconds):
-        q = fetch_quote_fields(t)  # yfinance 호출
-        row = upsert_asset_price(
-            db,
-            t,
-            price=q.price,
-            change=q.change,
-            change_rate=q.change_rate,
-        )
-        db.commit()
-        db.refresh(row)
-
-    return row
\ No newline at end of file
+    return get_cached_quotes(db, [t], ttl_seconds=ttl_seconds)[t]
+
+
+def get_cached_quotes(
+    db: Session,
+    tickers: Iterable[str],
+    ttl_seconds: int = 180,
+    max_stale_seconds: int = QUOTE_MAX_STALE_SECONDS,
+) -> Dict[str, CachedQuote]:
+    """
+    get_cached_quote_fields의 다종목 버전.
+    - L1(프로세스 메모리) -> Redis(MGET) 순으로 ttl 이내 값은 DB 조회 없이 반환
+    - 나머지는 asset_prices를 한 번에 조회
+      - ttl 이내: 그대로 반환
+      - ttl 초과 ~ max_stale_seconds 이내: 그대로 반환 + 백그라운드 갱신(stale-while-revalidate)
+      - 없거나 max_stale_seconds 초과: yf.download 한 번으로 조회 후 INSERT ... ON CONFLICT 업서트
+    - 반환: {ticker: CachedQuote}
+    """
+    ts = sorted({t.upper().strip() for t in tickers if t and t.strip()})
+    if not ts:
+        return {}
+
+    out = _l1_cache.get_many(ts, ttl_seconds)
+    rest = [t for t in ts if t not in out]
+    if not rest:
+        return out
+
+    # 다른 worker가 이미 받아 둔 값 (Redis 장애 시 빈 dict)
+    shared = [
+        q for q in get_shared_quotes(rest).values()
+        if _age_seconds(q.updated_at) < ttl_seconds
+    ]
+    if shared:
+        _l1_cache.put_many(shared)
+        out.update({q.ticker: q for q in shared})
+        rest = [t for t in rest if t not in out]
+        if not rest:
+            return out
+
+    rows = {r.ticker: CachedQuote.from_row(r) for r in list_asset_prices_by_tickers(db, rest)}
+
+    missing: List[str] = []
+    revalidate: List[str] = []
+
+    for t in rest:
+        q = rows.get(t)
+        age = _age_seconds(q.updated_at) if q is not None else None
+        if age is None or age >= max_stale_seconds:
+            missing.append(t)
+            continue
+
+        out[t] = q
+        if age >= ttl_seconds:
+            revalidate.append(t)
+
+    fresh = [rows[t] for t in rest if t in out and t not in revalidate]
+    if fresh:
+        _l1_cache.put_many(fresh)
+        set_shared_quotes(fresh, expire_seconds=QUOTE_MAX_STALE_SECONDS)
+
+    if revalidate:
+        _revalidate_in_background(revalidate)
+
+    if missing:
+        # 같은 종목을 다른 요청이 이미 조회 중이면 그 결과를 기다려 재사용
+        fetched = _fetch_and_store_single_flight(db, missing, fallback_single=True)
+
+        # 기다린 쪽의 owner가 refresh_quotes/백그라운드 갱신(fallback_single=False)이면
+        # 배치 응답에서 빠진 종목은 결과가 None -> 여기서 단건 조회로 보정
+        unresolved = [t for t in missing if fetched.get(t) is None]
+        if unresolved:
+            fetched.update(_fetch_single_quotes(db, unresolved))
+
+        now = _utcnow()
+        for t in missing:
+            out[t] = _to_cached_quote(t, fetched[t], now)
+
+    return out
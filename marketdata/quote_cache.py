@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from marketdata.marketdata_entity import AssetPrice
+
+
+@dataclass(frozen=True)
+class CachedQuote:
+    """
+    세션과 무관하게 들고 다닐 수 있는 시세 값 (AssetPrice row의 사본)
+    """
+    ticker: str
+    price: Decimal
+    change: Optional[Decimal]
+    change_rate: Optional[Decimal]
+    updated_at: datetime
+
+    @classmethod
+    def from_row(cls, row: AssetPrice) -> "CachedQuote":
+        updated_at = row.updated_at
+        if updated_at is not None and updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        return cls(
+            ticker=row.ticker,
+            price=row.price,
+            change=row.change,
+            change_rate=row.change_rate,
+            updated_at=updated_at,
+        )
+
+
+class QuoteMemoryCache:
+    """
+    asset_prices 앞단의 프로세스 내 L1 캐시.
+    - ticker 키, LRU 방식으로 max_size 초과 시 가장 오래 안 쓴 항목부터 제거
+    - get 시 updated_at 기준 ttl_seconds 이내인 값만 hit
+    - max_age_seconds가 지난 항목은 조회 시 바로 제거
+    """
+
+    def __init__(self, max_size: int = 2048, max_age_seconds: int = 60 * 60 * 6):
+        self.max_size = max_size
+        self.max_age_seconds = max_age_seconds
+
+        self._items: "OrderedDict[str, CachedQuote]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _age_seconds(quote: CachedQuote) -> float:
+        return (datetime.now(timezone.utc) - quote.updated_at).total_seconds()
+
+    def get_many(self, tickers: Iterable[str], ttl_seconds: int) -> Dict[str, CachedQuote]:
+        out: Dict[str, CachedQuote] = {}
+
+        with self._lock:
+            for t in tickers:
+                q = self._items.get(t)
+                if q is None:
+                    self.misses += 1
+                    continue
+
+                age = self._age_seconds(q)
+                if age >= self.max_age_seconds:
+                    del self._items[t]
+                    self.misses += 1
+                    continue
+                if age >= ttl_seconds:
+                    self.misses += 1
+                    continue
+
+                self._items.move_to_end(t)
+                self.hits += 1
+                out[t] = q
+
+        return out
+
+    def put_many(self, quotes: Iterable[CachedQuote]) -> None:
+        with self._lock:
+            for q in quotes:
+                if q.updated_at is None:
+                    continue
+                self._items[q.ticker] = q
+                self._items.move_to_end(q.ticker)
+
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, ticker: str) -> None:
+        with self._lock:
+            self._items.pop(ticker, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._items),
+                "maxSize": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hitRate": (self.hits / total) if total else 0.0,
+            }
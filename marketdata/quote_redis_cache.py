@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List
+
+import redis
+
+from common.config import settings
+from common.redis_client import get_redis_client, mark_redis_unavailable
+from marketdata.quote_cache import CachedQuote
+
+QUOTE_REDIS_KEY_PREFIX = "quote:"
+
+
+def _key(ticker: str) -> str:
+    return f"{QUOTE_REDIS_KEY_PREFIX}{ticker}"
+
+
+def _dumps(q: CachedQuote) -> str:
+    return json.dumps(
+        {
+            "price": str(q.price),
+            "change": str(q.change) if q.change is not None else None,
+            "changeRate": str(q.change_rate) if q.change_rate is not None else None,
+            "updatedAt": q.updated_at.isoformat(),
+        }
+    )
+
+
+def _loads(ticker: str, raw: bytes | str) -> CachedQuote:
+    data = json.loads(raw)
+    return CachedQuote(
+        ticker=ticker,
+        price=Decimal(data["price"]),
+        change=Decimal(data["change"]) if data.get("change") is not None else None,
+        change_rate=Decimal(data["changeRate"]) if data.get("changeRate") is not None else None,
+        updated_at=datetime.fromisoformat(data["updatedAt"]),
+    )
+
+
+def get_shared_quotes(tickers: List[str]) -> Dict[str, CachedQuote]:
+    """
+    MGET 한 번으로 여러 종목 조회. Redis를 쓸 수 없으면 빈 dict
+    """
+    if not settings.quote_redis_enabled or not tickers:
+        return {}
+
+    client = get_redis_client()
+    if client is None:
+        return {}
+
+    try:
+        values = client.mget([_key(t) for t in tickers])
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
+        return {}
+
+    out: Dict[str, CachedQuote] = {}
+    for t, raw in zip(tickers, values):
+        if raw is None:
+            continue
+        try:
+            out[t] = _loads(t, raw)
+        except Exception:
+            continue
+    return out
+
+
+def set_shared_quotes(quotes: Iterable[CachedQuote], expire_seconds: int) -> None:
+    """
+    파이프라인 한 번으로 여러 종목 저장 (종목별 만료시간을 위해 MSET 대신 SET EX 묶음)
+    """
+    if not settings.quote_redis_enabled:
+        return
+
+    quotes = [q for q in quotes if q.updated_at is not None]
+    if not quotes:
+        return
+
+    client = get_redis_client()
+    if client is None:
+        return
+
+    try:
+        pipe = client.pipeline(transaction=False)
+        for q in quotes:
+            pipe.set(_key(q.ticker), _dumps(q), ex=expire_seconds)
+        pipe.execute()
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import date, timedelta
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, Iterable, Optional
 
+import pandas as pd
 import yfinance as yf
 
 
@@ -57,6 +59,10 @@ def fetch_quote_fields(ticker: str) -> QuoteFields:
     if price is None:
         raise ValueError(f"Failed to fetch price for ticker={t}")
 
+    return _to_quote_fields(price, prev_close)
+
+
+def _to_quote_fields(price, prev_close) -> QuoteFields:
     price_d = Decimal(str(price))
 
     change_d: Optional[Decimal] = None
@@ -72,4 +78,100 @@ def fetch_quote_fields(ticker: str) -> QuoteFields:
         price=price_d,
         change=change_d,
         change_rate=change_rate_d,
-    )
\ No newline at end of file
+    )
+
+
+def fetch_quote_fields_batch(tickers: Iterable[str]) -> Dict[str, QuoteFields]:
+    """
+    여러 종목을 yf.download 한 번으로 조회.
+    - 최근 5거래일 일봉에서 마지막 종가 = price, 직전 종가 = prev_close
+    - 응답에 없는(또는 종가가 비어 있는) 종목은 결과 dict에서 빠짐
+    """
+    symbols = sorted({t.upper().strip() for t in tickers if t and t.strip()})
+    if not symbols:
+        return {}
+
+    df = yf.download(
+        symbols,
+        period="5d",
+        interval="1d",
+        group_by="ticker",
+        auto_adjust=False,
+        progress=False,
+        threads=True,
+    )
+
+    if df is None or df.empty:
+        return {}
+
+    out: Dict[str, QuoteFields] = {}
+
+    for t in symbols:
+        try:
+            if isinstance(df.columns, pd.MultiIndex):
+                if t not in df.columns.get_level_values(0):
+                    continue
+                closes = df[t]["Close"].dropna().tolist()
+            else:
+                # 단일 종목 응답은 MultiIndex가 아닐 수 있음
+                closes = df["Close"].dropna().tolist()
+        except KeyError:
+            continue
+
+        if not closes:
+            continue
+
+        price = float(closes[-1])
+        prev_close = float(closes[-2]) if len(closes) >= 2 else None
+        out[t] = _to_quote_fields(price, prev_close)
+
+    return out
+
+
+def fetch_daily_bars(tickers: Iterable[str], start: date, end: date) -> Dict[str, pd.DataFrame]:
+    """
+    여러 종목의 일봉(OHLCV)을 yf.download 한 번으로 조회.
+    - start, end 모두 포함 (yfinance의 end는 미포함이라 +1일)
+    - 반환: {ticker: DataFrame(index=date, columns=[open, high, low, close, volume])}
+      종가가 없는 날짜는 제거, 응답에 없는 종목은 빠짐
+    """
+    symbols = sorted({t.upper().strip() for t in tickers if t and t.strip()})
+    if not symbols:
+        return {}
+
+    df = yf.download(
+        symbols,
+        start=start.strftime("%Y-%m-%d"),
+        end=(end + timedelta(days=1)).strftime("%Y-%m-%d"),
+        interval="1d",
+        group_by="ticker",
+        auto_adjust=False,
+        progress=False,
+        threads=True,
+    )
+
+    if df is None or df.empty:
+        return {}
+
+    out: Dict[str, pd.DataFrame] = {}
+
+    for t in symbols:
+        try:
+            if isinstance(df.columns, pd.MultiIndex):
+                if t not in df.columns.get_level_values(0):
+                    continue
+                part = df[t]
+            else:
+                part = df
+            part = part[["Open", "High", "Low", "Close", "Volume"]]
+        except KeyError:
+            continue
+
+        part = part.rename(columns=str.lower).dropna(subset=["close"])
+        if part.empty:
+            continue
+
+        part.index = pd.to_datetime(part.index).date
+        out[t] = part.sort_index()
+
+    return out
@@ -0,0 +1,184 @@
+"""
+과거 포트폴리오 평가금액 백필 (portfolio_snapshots)
+- 거래 내역으로 날짜별 보유 수량/평균단가를 재구성하고, 로컬 일봉 저장소의 종가로 평가
+  - 날짜 x 종목 행렬로 한 번에 계산 (날짜별 API 호출 없음, 일봉은 yf.download 한 번으로 채움)
+- 일일 스냅샷 job이 이미 저장한 날짜는 덮어쓰지 않음
+- 스케줄러가 매일 스냅샷 job 이후 사용자별 백필 위치(portfolio_backfill_states) 다음 날짜부터 채움 (조회 API에서는 실행하지 않음)
+- python -m portfolio.portfolio_backfill [user_id]   # 없으면 전체 사용자
+"""
+from __future__ import annotations
+
+import sys
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from common.database import SessionLocal
+from common.date_utils import get_us_market_date
+from marketdata.bar_file_store import BarArrays, day_numbers
+from marketdata.daily_bar_service import load_daily_bar_arrays_batch
+from portfolio.portfolio_repository import (
+    insert_snapshots_if_missing,
+    list_trades_for_valuation,
+    list_users_to_backfill,
+    upsert_backfill_state,
+)
+from user.user_entity import User
+
+BACKFILL_BAR_LOOKBACK_DAYS = 10  # 시작일이 휴장일이어도 직전 종가를 쓸 수 있도록 앞쪽으로 더 읽는 일수
+
+
+def _holding_matrices(trades, tickers: List[str], days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    거래 -> 날짜별(장 마감 기준) 보유 수량 / 평균단가 행렬 (shape = 날짜 x 종목)
+    - 평균단가: 포지션의 누적 BUY 가중평균 (trade_positions.avg_price와 같은 의미), 보유가 없으면 NaN
+    """
+    column = {t: j for j, t in enumerate(tickers)}
+    qty = np.zeros((len(days), len(tickers)), dtype=np.float64)
+    avg = np.full((len(days), len(tickers)), np.nan, dtype=np.float64)
+
+    per_ticker: Dict[str, List[Tuple[date, float, float]]] = {t: [] for t in tickers}
+    held: Dict[str, float] = {t: 0.0 for t in tickers}
+    positions: Dict[int, List[float]] = {}  # position_id -> [누적 BUY 수량, 누적 BUY 금액]
+
+    for t in trades:
+        ticker = t.ticker.upper().strip()
+        q = float(t.quantity)
+        p = positions.setdefault(int(t.position_id), [0.0, 0.0])
+        if t.trade_type == "BUY":
+            held[ticker] += q
+            p[0] += q
+            p[1] += float(t.price) * q
+        else:
+            held[ticker] -= q
+        position_avg = p[1] / p[0] if p[0] > 0 else np.nan
+        per_ticker[ticker].append((t.trade_date, held[ticker], position_avg))
+
+    for ticker, states in per_ticker.items():
+        if not states:
+            continue
+        j = column[ticker]
+        trade_days = day_numbers([d for d, _, _ in states])
+        idx = np.searchsorted(trade_days, days, side="right") - 1  # 그날 마지막 거래 이후 상태
+        known = idx >= 0
+        state_qty = np.array([q for _, q, _ in states], dtype=np.float64)
+        state_avg = np.array([a for _, _, a in states], dtype=np.float64)
+        qty[known, j] = state_qty[idx[known]]
+        avg[known, j] = state_avg[idx[known]]
+
+    avg[qty <= 0] = np.nan
+    return qty, avg
+
+
+def _close_matrix(bars: Dict[str, BarArrays], tickers: List[str], days: np.ndarray) -> np.ndarray:
+    """
+    날짜별 종가 행렬 (shape = 날짜 x 종목), 휴장일은 직전 종가, 첫 bar 이전/데이터 없음은 NaN
+    """
+    close = np.full((len(days), len(tickers)), np.nan, dtype=np.float64)
+    for j, t in enumerate(tickers):
+        b = bars.get(t)
+        if b is None or len(b) == 0:
+            continue
+        idx = np.searchsorted(b.days, days, side="right") - 1
+        known = idx >= 0
+        close[known, j] = b.close[idx[known]]
+    return close
+
+
+def value_portfolio(
+    qty: np.ndarray, avg: np.ndarray, close: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    날짜별 (평가금액, 매입원가, 평가손익, 유효 여부) (get_portfolio_summary와 같은 계산)
+    - 보유 중인데 종가가 없는 종목이 있는 날짜는 유효하지 않음
+    """
+    held = qty > 0
+    valid = ~np.any(held & np.isnan(close), axis=1)
+
+    value = np.where(held, qty * np.nan_to_num(close), 0.0).sum(axis=1)
+    has_avg = held & ~np.isnan(avg)
+    cost = np.where(has_avg, qty * np.nan_to_num(avg), 0.0).sum(axis=1)
+    profit = np.where(has_avg, qty * (np.nan_to_num(close) - np.nan_to_num(avg)), 0.0).sum(axis=1)
+    return value, cost, profit, valid
+
+
+def backfill_portfolio_snapshots(
+    db: Session,
+    user_id: int,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> int:
+    """
+    [start, end] 일별 스냅샷 중 없는 날짜만 거래 내역 기준 평가금액으로 채움
+    - start 기본: 첫 거래일 / end 기본: 뉴욕 기준 어제 (오늘은 일일 스냅샷 job이 보유 종목 기준으로 저장)
+    - 반환: 새로 저장한 날짜 수
+    """
+    trades = list_trades_for_valuation(db, user_id)
+    if not trades:
+        return 0
+
+    start = start or trades[0].trade_date
+    end = end or (get_us_market_date() - timedelta(days=1))
+    if start > end:
+        return 0
+
+    tickers = sorted({t.ticker.upper().strip() for t in trades})
+    days = np.arange(day_numbers([start])[0], day_numbers([end])[0] + 1, dtype=np.float64)
+
+    bars = load_daily_bar_arrays_batch(db, tickers, start - timedelta(days=BACKFILL_BAR_LOOKBACK_DAYS), end)
+    qty, avg = _holding_matrices(trades, tickers, days)
+    close = _close_matrix(bars, tickers, days)
+    value, cost, profit, valid = value_portfolio(qty, avg, close)
+
+    rows = []
+    for i in np.flatnonzero(valid):
+        has_cost = cost[i] > 0
+        rows.append(
+            {
+                "user_id": user_id,
+                "captured_date": start + timedelta(days=int(i)),
+                "total_value": round(float(value[i]), 4),
+                "total_profit_rate": round(float(profit[i] / cost[i]), 6) if has_cost else None,
+                "total_profit_amount": round(float(profit[i]), 4) if has_cost else None,
+            }
+        )
+
+    inserted = insert_snapshots_if_missing(db, rows)
+    db.commit()
+    return inserted
+
+
+def run_portfolio_backfill(db: Session) -> int:
+    """
+    사용자별 백필 위치 이후 ~ 어제(뉴욕 기준)를 백필 (스케줄러용)
+    - 거래가 생성/삭제된 사용자는 첫 거래일부터 다시 (이미 있는 날짜는 그대로)
+    - 종가가 없어 평가할 수 없는 날짜도 백필 위치는 넘어감 (같은 구간을 매일 다시 계산하지 않음)
+    - 한 사용자가 실패해도 나머지는 계속 진행 (실패한 사용자는 위치를 갱신하지 않아 다음 날 재시도)
+    - 반환: 새로 저장한 날짜 수 합계
+    """
+    end = get_us_market_date() - timedelta(days=1)
+    inserted = 0
+    for user_id, start, last_event_id in list_users_to_backfill(db, end):
+        try:
+            inserted += backfill_portfolio_snapshots(db, user_id, start=start, end=end)
+            upsert_backfill_state(db, user_id, end, last_event_id)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[portfolio_backfill] 실패: user_id={user_id}, error={e}")
+    return inserted
+
+
+if __name__ == "__main__":
+    session = SessionLocal()
+    try:
+        if len(sys.argv) > 1:
+            user_ids = [int(sys.argv[1])]
+        else:
+            user_ids = [uid for (uid,) in session.query(User.id).order_by(User.id).all()]
+        for uid in user_ids:
+            print(f"[portfolio_backfill] user_id={uid} 저장 날짜 수={backfill_portfolio_snapshots(session, uid)}")
+    finally:
+        session.close()
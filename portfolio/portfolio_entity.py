@@ -21,4 +21,18 @@ class PortfolioSnapshot(Base):
     total_profit_amount = Column(Numeric(18, 4), nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class PortfolioBackfillState(Base):
+    """
+    사용자별 스냅샷 백필 진행 위치 (평가할 수 없는 날짜 때문에 같은 구간을 매일 다시 계산하지 않도록)
+    """
+    __tablename__ = "portfolio_backfill_states"
+
+    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    backfilled_through = Column(Date, nullable=False)  # 이 날짜까지 백필 완료 (종가가 없어 건너뛴 날짜 포함)
+    last_event_id = Column(BigInteger, nullable=False, default=0, server_default="0")  # 백필 시점의 마지막 trade_events.id
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
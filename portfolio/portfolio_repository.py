@@ -2,14 +2,20 @@ from __future__ import annotations
 
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy import func
+from sqlalchemy import Date, case, cast, func, literal, select, true
+from sqlalchemy.dialects.postgresql import INTERVAL
 
-from typing import Optional,List
+from typing import Optional,List,Tuple
 from datetime import date
 from decimal import Decimal
 
-from trades.trades_entity import Holding
-from portfolio.portfolio_entity import PortfolioSnapshot
+from marketdata.marketdata_entity import AssetPrice
+from trades.trades_entity import Holding, Trade, TradeEvent
+from portfolio.portfolio_entity import PortfolioBackfillState, PortfolioSnapshot
+from user.user_entity import User
+
+SNAPSHOT_INSERT_CHUNK = 1000  # INSERT 한 문장에 넣을 최대 row 수
+
 
 def list_holdings_by_user(db: Session, user_id: int) -> list[Holding]:
     return (
@@ -72,14 +78,173 @@ def upsert_snapshot(
     db.execute(stmt)
 
 
-def list_snapshots_range(db: Session, user_id: int, from_date: date, to_date: date) -> List[PortfolioSnapshot]:
+def list_all_holding_tickers(db: Session) -> List[str]:
+    return sorted({t.upper().strip() for (t,) in db.query(Holding.ticker).distinct().all() if t})
+
+
+def upsert_snapshots_for_all_users(db: Session, captured_date: date) -> int:
+    """
+    전체 사용자 스냅샷을 INSERT ... SELECT ... ON CONFLICT 한 문장으로 저장
+    - holdings x asset_prices 를 사용자별로 집계 (get_portfolio_summary와 같은 계산)
+      - total_value: 현재가 * 수량 합 (보유 종목이 없으면 0)
+      - profit: average_price가 있는 종목만, 매입원가 합이 0이면 NULL
+    - asset_prices에 현재가가 없는 종목을 가진 사용자는 건너뜀 (잘못된 값으로 덮어쓰지 않도록)
+    - 반환: 저장한 사용자 수
+    """
+    value = func.coalesce(func.sum(AssetPrice.price * Holding.quantity), 0)
+    cost_basis = func.sum(Holding.average_price * Holding.quantity)
+    profit_amount = func.sum((AssetPrice.price - Holding.average_price) * Holding.quantity)
+
+    source = (
+        select(
+            User.id,
+            literal(captured_date),
+            value,
+            case((cost_basis > 0, profit_amount / cost_basis)),
+            case((cost_basis > 0, profit_amount)),
+        )
+        .select_from(User)
+        .outerjoin(Holding, Holding.user_id == User.id)
+        .outerjoin(AssetPrice, AssetPrice.ticker == Holding.ticker)
+        .group_by(User.id)
+        .having(func.count(Holding.ticker) == func.count(AssetPrice.price))
+    )
+
+    stmt = insert(PortfolioSnapshot).from_select(
+        ["user_id", "captured_date", "total_value", "total_profit_rate", "total_profit_amount"],
+        source,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "captured_date"],
+        set_={
+            "total_value": stmt.excluded.total_value,
+            "total_profit_rate": stmt.excluded.total_profit_rate,
+            "total_profit_amount": stmt.excluded.total_profit_amount,
+            "updated_at": func.now(),
+        },
+    )
+
+    return db.execute(stmt).rowcount
+
+
+def list_performance_series(
+    db: Session,
+    user_id: int,
+    bucket_start: date,
+    to_date: date,
+    step: str,
+):
+    """
+    성과 차트 시계열을 DB에서 완성해서 반환: [(date, value)]
+    - generate_series(bucket_start, to_date, step)로 구간을 만들고, 구간 끝 날짜(to_date를 넘지 않음)의
+      평가금액 = 그 날짜 이전의 마지막 스냅샷 (LATERAL + uq_portfolio_user_date 인덱스 역순 1건)
+    - 이전 스냅샷이 하나도 없으면 0
+    - step: PostgreSQL interval 문자열 ("1 day" / "1 week" / "1 month")
+    """
+    interval = cast(literal(step), INTERVAL)
+    buckets = func.generate_series(bucket_start, to_date, interval).table_valued("bucket").render_derived(name="g")
+    point_date = func.least(cast(buckets.c.bucket + interval - cast(literal("1 day"), INTERVAL), Date), to_date)
+
+    last_snapshot = (
+        select(PortfolioSnapshot.total_value)
+        .where(PortfolioSnapshot.user_id == user_id, PortfolioSnapshot.captured_date <= point_date)
+        .order_by(PortfolioSnapshot.captured_date.desc())
+        .limit(1)
+        .lateral("s")
+    )
+
+    q = (
+        select(point_date.label("date"), func.coalesce(last_snapshot.c.total_value, 0).label("value"))
+        .select_from(buckets.outerjoin(last_snapshot, true()))
+        .order_by(buckets.c.bucket)
+    )
+    return db.execute(q).all()
+
+
+def get_first_snapshot_date(db: Session, user_id: int) -> Optional[date]:
     return (
-        db.query(PortfolioSnapshot)
-        .filter(
-            PortfolioSnapshot.user_id == user_id,
-            PortfolioSnapshot.captured_date >= from_date,
-            PortfolioSnapshot.captured_date <= to_date,
+        db.query(func.min(PortfolioSnapshot.captured_date))
+        .filter(PortfolioSnapshot.user_id == user_id)
+        .scalar()
+    )
+
+
+def list_users_to_backfill(db: Session, end: date) -> List[Tuple[int, date, int]]:
+    """
+    백필이 필요한 사용자 -> [(user_id, 시작일, 현재 마지막 trade_events.id)]
+    - 기록이 없거나 거래가 바뀐(원장 이벤트가 늘어난) 사용자: 첫 거래일부터
+    - 그 외 backfilled_through < end인 사용자: backfilled_through 다음 날부터
+    """
+    first_trade = (
+        select(Trade.user_id, func.min(Trade.trade_date).label("first_date"))
+        .group_by(Trade.user_id)
+        .subquery("f")
+    )
+    last_event = (
+        select(TradeEvent.user_id, func.max(TradeEvent.id).label("event_id"))
+        .group_by(TradeEvent.user_id)
+        .subquery("e")
+    )
+    event_id = func.coalesce(last_event.c.event_id, 0)
+    state = PortfolioBackfillState
+    restart = (state.user_id.is_(None)) | (event_id > state.last_event_id)
+
+    stmt = (
+        select(
+            first_trade.c.user_id,
+            case(
+                (restart, first_trade.c.first_date),
+                else_=func.greatest(first_trade.c.first_date, state.backfilled_through + 1),
+            ),
+            event_id,
         )
-        .order_by(PortfolioSnapshot.captured_date.asc())
+        .select_from(first_trade)
+        .outerjoin(last_event, last_event.c.user_id == first_trade.c.user_id)
+        .outerjoin(state, state.user_id == first_trade.c.user_id)
+        .where(first_trade.c.first_date <= end, restart | (state.backfilled_through < end))
+        .order_by(first_trade.c.user_id)
+    )
+    return [(int(uid), start, int(eid)) for uid, start, eid in db.execute(stmt).all()]
+
+
+def upsert_backfill_state(db: Session, user_id: int, backfilled_through: date, last_event_id: int) -> None:
+    stmt = insert(PortfolioBackfillState).values(
+        user_id=user_id,
+        backfilled_through=backfilled_through,
+        last_event_id=last_event_id,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "backfilled_through": stmt.excluded.backfilled_through,
+            "last_event_id": stmt.excluded.last_event_id,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+
+
+def list_trades_for_valuation(db: Session, user_id: int):
+    """
+    과거 보유 수량/평균단가 재구성용 거래 (필요한 컬럼만, 거래일·id 순)
+    """
+    return (
+        db.query(Trade.ticker, Trade.position_id, Trade.trade_type, Trade.trade_date, Trade.price, Trade.quantity)
+        .filter(Trade.user_id == user_id)
+        .order_by(Trade.trade_date.asc(), Trade.id.asc())
         .all()
-    )
\ No newline at end of file
+    )
+
+
+def insert_snapshots_if_missing(db: Session, rows: List[dict]) -> int:
+    """
+    rows: [{"user_id", "captured_date", "total_value", "total_profit_rate", "total_profit_amount"}, ...]
+    - 이미 있는 날짜(일일 스냅샷 job이 저장한 값)는 덮어쓰지 않음
+    - 반환: 새로 저장한 행 수
+    """
+    inserted = 0
+    for i in range(0, len(rows), SNAPSHOT_INSERT_CHUNK):
+        stmt = insert(PortfolioSnapshot).values(rows[i : i + SNAPSHOT_INSERT_CHUNK])
+        stmt = stmt.on_conflict_do_nothing(index_elements=["user_id", "captured_date"])
+        inserted += db.execute(stmt).rowcount
+    return inserted
@@ -37,11 +37,12 @@ def get_portfolio_summary_api(
 
 @router.get("/performance", response_model=PortfolioPerformanceResponse)
 def portfolio_performance(
-    range: Literal["30D"] = Query("30D"),
+    range: Literal["30D", "90D", "1Y", "3Y", "5Y", "ALL"] = Query("30D"),
+    interval: Literal["1D", "1W", "1M"] | None = Query(None),  # 없으면 기간에 따라 자동
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id),
 ):
-    return get_portfolio_performance(db, user_id, rng=range)
+    return get_portfolio_performance(db, user_id, rng=range, interval=interval)
 
 
 @router.get("/holdings", response_model=HoldingsListResponse)
@@ -50,5 +50,6 @@ class PortfolioPerformancePoint(BaseModel):
 
 
 class PortfolioPerformanceResponse(BaseModel):
-    range: Literal["30D"] = "30D"
+    range: Literal["30D", "90D", "1Y", "3Y", "5Y", "ALL"] = "30D"
+    interval: Literal["1D", "1W", "1M"] = "1D"  # 점 간격 (1W/1M은 구간 끝 날짜의 값)
     series: List[PortfolioPerformancePoint] = Field(default_factory=list)
\ No newline at end of file
@@ -1,18 +1,20 @@
 from __future__ import annotations
 
 from decimal import Decimal
-from typing import Optional, Dict, List
+from typing import Optional, Dict
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from datetime import date, timedelta
 
-from marketdata.marketdata_service import get_cached_quote_fields
+from common.date_utils import get_us_market_date
+from marketdata.marketdata_service import get_cached_quotes
 from portfolio.portfolio_repository import (
+    get_first_snapshot_date,
     list_holdings_by_user,
+    list_performance_series,
     get_holding_by_user_ticker,
     create_holding,
     delete_holding,
-    list_snapshots_range,
 )
 from portfolio.portfolio_schema import (
     HoldingsListResponse,
@@ -28,10 +30,24 @@ from trades.trades_entity import Holding
 from trades.trades_repository import get_or_create_asset
 
 
-RANGE_TO_DAYS: Dict[str, int] = {
+RANGE_TO_DAYS: Dict[str, Optional[int]] = {
     "30D": 30,
+    "90D": 90,
+    "1Y": 365,
+    "3Y": 365 * 3,
+    "5Y": 365 * 5,
+    "ALL": None,  # 첫 스냅샷부터
 }
 
+# 성과 차트 간격 -> generate_series step
+INTERVAL_TO_STEP: Dict[str, str] = {
+    "1D": "1 day",
+    "1W": "1 week",
+    "1M": "1 month",
+}
+PERFORMANCE_DAILY_MAX_DAYS = 366  # interval 미지정 시 이 기간까지는 일 단위
+PERFORMANCE_WEEKLY_MAX_DAYS = 365 * 3  # 그 이상 ~ 이 기간까지는 주 단위, 더 길면 월 단위
+
 
 def _to_float(v: Optional[Decimal]) -> Optional[float]:
     if v is None:
@@ -42,12 +58,14 @@ def _to_float(v: Optional[Decimal]) -> Optional[float]:
 def get_holdings_list(db: Session, user_id: int) -> HoldingsListResponse:
     rows = list_holdings_by_user(db, user_id)
 
+    # 1) 현재가 캐시 일괄 조회 (없거나 stale인 종목만 yfinance로 한 번에 갱신)
+    quotes = get_cached_quotes(db, [h.ticker for h in rows], ttl_seconds=180)
+
     items: list[HoldingItem] = []
     for h in rows:
         t = (h.ticker or "").upper().strip()
 
-        # 1) 현재가 캐시 조회 (없거나 stale이면 yfinance로 갱신)
-        price_row = get_cached_quote_fields(db, t, ttl_seconds=180)
+        price_row = quotes[t]
 
         current_price = _to_float(price_row.price)
 
@@ -148,11 +166,13 @@ def get_portfolio_summary(db: Session, user_id: int) -> PortfolioSummaryResponse
     total_profit_amount = Decimal("0")  # 총 수익금
     total_cost_basis = Decimal("0") # 총 매인원가
 
+    # 현재가: 캐시 일괄 조회(없거나 stale인 종목만 yfinance 갱신)
+    quotes = get_cached_quotes(db, [h.ticker for h in holdings], ttl_seconds=180)
+
     for h in holdings:
         ticker = h.ticker.upper().strip()
 
-        # 현재가: 캐시(없거나 stale이면 yfinance 갱신)
-        q = get_cached_quote_fields(db, ticker, ttl_seconds=180)
+        q = quotes[ticker]
         current_price = Decimal(q.price)
 
         qty = Decimal(int(h.quantity))
@@ -179,52 +199,67 @@ def get_portfolio_summary(db: Session, user_id: int) -> PortfolioSummaryResponse
     )
 
 
-def _resolve_range_days(rng: str) -> int:
+def _resolve_range_days(rng: str) -> Optional[int]:
     rng = (rng or "30D").upper().strip()
     if rng not in RANGE_TO_DAYS:
         raise HTTPException(status_code=400, detail="Unsupported range")
     return RANGE_TO_DAYS[rng]
 
 
-def _build_date_series(end_inclusive: date, days: int) -> List[date]:
+def _resolve_interval(interval: Optional[str], days: int) -> str:
     """
-    days=30 이면:
-    end_inclusive 포함해서 총 30개 날짜 생성
-    (end - 29) ~ end
+    interval 미지정이면 기간에 맞춰 자동 선택 (긴 기간은 주/월 단위로 줄여 응답 크기 유지)
+    """
+    if interval is not None:
+        interval = interval.upper().strip()
+        if interval not in INTERVAL_TO_STEP:
+            raise HTTPException(status_code=400, detail="Unsupported interval")
+        return interval
+    if days <= PERFORMANCE_DAILY_MAX_DAYS:
+        return "1D"
+    if days <= PERFORMANCE_WEEKLY_MAX_DAYS:
+        return "1W"
+    return "1M"
+
+
+def _bucket_start(from_date: date, interval: str) -> date:
+    """
+    구간 시작일 정렬: 1D는 그대로, 1W는 월요일, 1M은 1일
+    """
+    if interval == "1W":
+        return from_date - timedelta(days=from_date.weekday())
+    if interval == "1M":
+        return from_date.replace(day=1)
+    return from_date
+
+
+def get_portfolio_performance(
+    db: Session,
+    user_id: int,
+    rng: str = "30D",
+    interval: Optional[str] = None,
+) -> PortfolioPerformanceResponse:
+    """
+    - 시계열(날짜 생성 + 직전 스냅샷 값 채우기)은 DB에서 한 번에 계산
+    - 1D: 날짜별 / 1W, 1M: 구간 끝 날짜(마지막 구간은 오늘)의 값
     """
-    start = end_inclusive - timedelta(days=days - 1)
-    return [start + timedelta(days=i) for i in range(days)]
-
-
-def get_portfolio_performance(db: Session, user_id: int, rng: str = "30D") -> PortfolioPerformanceResponse:
     days = _resolve_range_days(rng)
 
-    # 오늘 포함
-    today = date.today()
-    dates = _build_date_series(today, days)
-
-    from_date = dates[0]
-    to_date = dates[-1]
-
-    rows = list_snapshots_range(db, user_id, from_date, to_date)
-
-    # date -> total_value 맵
-    value_map: Dict[date, float] = {r.captured_date: float(r.total_value) for r in rows}
-
-    # forward-fill: 이전 값이 없으면 None으로 두었다가, 나중에 첫 값도 없으면 0으로
-    series: List[PortfolioPerformancePoint] = []
-    last_value: float | None = None
-
-    for d in dates:
-        v = value_map.get(d)
-        if v is None:
-            if last_value is None:
-                # 아직 이전 값이 없는 구간 -> 일단 None
-                series.append(PortfolioPerformancePoint(date=d, value=0.0))  # 임시 0
-            else:
-                series.append(PortfolioPerformancePoint(date=d, value=last_value))
-        else:
-            last_value = v
-            series.append(PortfolioPerformancePoint(date=d, value=v))
+    # 오늘 포함 (스냅샷 job과 같은 뉴욕 기준 날짜, 과거 구간은 스케줄러 백필이 채움)
+    today = get_us_market_date()
+    if days is None:
+        first = get_first_snapshot_date(db, user_id) or today
+        days = (today - first).days + 1
+    from_date = today - timedelta(days=days - 1)
+
+    interval = _resolve_interval(interval, days)
+    rows = list_performance_series(
+        db,
+        user_id,
+        bucket_start=_bucket_start(from_date, interval),
+        to_date=today,
+        step=INTERVAL_TO_STEP[interval],
+    )
 
-    return PortfolioPerformanceResponse(range=rng, series=series)
\ No newline at end of file
+    series = [PortfolioPerformancePoint(date=r.date, value=float(r.value)) for r in rows]
+    return PortfolioPerformanceResponse(range=(rng or "30D").upper().strip(), interval=interval, series=series)
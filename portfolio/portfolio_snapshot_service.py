@@ -1,21 +1,27 @@
 from __future__ import annotations
 
-from datetime import date
 from decimal import Decimal
 
 from sqlalchemy.orm import Session
 
-from portfolio.portfolio_repository import upsert_snapshot
+from common.date_utils import get_us_market_date
+
+from marketdata.marketdata_service import refresh_quotes
+from portfolio.portfolio_repository import (
+    list_all_holding_tickers,
+    upsert_snapshot,
+    upsert_snapshots_for_all_users,
+)
 from portfolio.portfolio_service import get_portfolio_summary
 
 
 def run_daily_portfolio_snapshot_for_user(db: Session, user_id: int) -> None:
     """
-    오늘 날짜 기준 포트폴리오 스냅샷 저장(upsert).
+    오늘(뉴욕 기준) 날짜 기준 포트폴리오 스냅샷 저장(upsert).
     - total_value: 필수
     - profit_rate/amount: avg 없는 종목만 있으면 None일 수 있음
     """
-    today = date.today()
+    today = get_us_market_date()
 
     summary = get_portfolio_summary(db, user_id)
 
@@ -40,4 +46,21 @@ def run_daily_portfolio_snapshot_for_user(db: Session, user_id: int) -> None:
         total_value=total_value,
         total_profit_rate=total_profit_rate,
         total_profit_amount=total_profit_amount,
-    )
\ No newline at end of file
+    )
+
+
+def run_daily_portfolio_snapshots(db: Session) -> int:
+    """
+    전체 사용자 오늘 스냅샷 저장 (스케줄러용, 종목 수에만 비례)
+    1) 보유 종목(distinct) 현재가를 refresh_quotes로 일괄 갱신 (yf.download chunk 단위, chunk 안에서는 병렬)
+    2) holdings x asset_prices 집계 + portfolio_snapshots upsert를 한 문장으로 실행
+    - 반환: 저장한 사용자 수
+    """
+    tickers = list_all_holding_tickers(db)
+    refreshed = refresh_quotes(db, tickers)
+    if refreshed < len(tickers):
+        print(f"[portfolio_snapshot] 현재가 갱신 누락: {len(tickers) - refreshed}/{len(tickers)}개 종목은 기존 값 사용")
+
+    saved = upsert_snapshots_for_all_users(db, get_us_market_date())
+    db.commit()
+    return saved
@@ -1,29 +1,74 @@
+import os
+import re
+import tempfile
 from pathlib import Path
+from typing import Dict, List
 
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 from langchain_openai import OpenAIEmbeddings
 
 from common.config import settings
+from rag.lexical_index import LexicalIndex
 
 DOCS_DIR = Path("rag/docs")
 SAVE_DIR = "rag/vectorstore"
+LEXICAL_INDEX_FILE = "bm25.json"
+
+_HEADING = re.compile(r"^(#{1,3})\s+(.*\S)\s*$")
+
+
+def split_markdown(content: str, source: str) -> List[Document]:
+    """
+    Markdown을 #/##/### 제목 단위로 청크 분할
+    - 청크 본문 앞에 상위 제목 경로를 붙여 청크만 읽어도 어떤 지표/섹션인지 알 수 있게 함
+    - 코드 블록(```) 안의 #은 제목으로 보지 않음
+    - 제목만 있고 본문이 없는 청크는 버림
+    """
+    docs: List[Document] = []
+    headings: Dict[int, str] = {}  # 제목 레벨 -> 제목
+    body: List[str] = []
+    in_code = False
+
+    def flush():
+        text = "\n".join(body).strip().strip("-").strip()
+        if text:
+            section = " > ".join(headings[level] for level in sorted(headings))
+            docs.append(
+                Document(
+                    page_content=f"{section}\n\n{text}" if section else text,
+                    metadata={
+                        "source": source,
+                        "section": section,
+                        "chunk_id": f"{source}#{len(docs)}",
+                    },
+                )
+            )
+        body.clear()
+
+    for line in content.splitlines():
+        if line.strip().startswith("```"):
+            in_code = not in_code
+        m = None if in_code else _HEADING.match(line)
+        if m is None:
+            body.append(line)
+            continue
+        flush()
+        level = len(m.group(1))
+        for deeper in [lv for lv in headings if lv >= level]:
+            del headings[deeper]
+        headings[level] = m.group(2)
+
+    flush()
+    return docs
 
 
 def build_vectorstore():
     docs = []
 
-    for path in DOCS_DIR.glob("*.md"):
+    for path in sorted(DOCS_DIR.glob("*.md")):
         content = path.read_text(encoding="utf-8")
-
-        docs.append(
-            Document(
-                page_content=content,
-                metadata={
-                    "source": path.name,
-                },
-            )
-        )
+        docs.extend(split_markdown(content, path.name))
 
     embeddings = OpenAIEmbeddings(
         api_key=settings.openai_tech_api_key
@@ -34,9 +79,15 @@ def build_vectorstore():
         embeddings,
     )
 
-    vectorstore.save_local(SAVE_DIR)
+    # 임시 디렉터리에 다 쓴 뒤 파일 단위로 교체 (실행 중인 서버가 쓰다 만 파일을 읽지 않도록)
+    os.makedirs(SAVE_DIR, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(SAVE_DIR)) as tmp_dir:
+        vectorstore.save_local(tmp_dir)
+        LexicalIndex.build(docs).save(os.path.join(tmp_dir, LEXICAL_INDEX_FILE))
+        for name in (LEXICAL_INDEX_FILE, "index.pkl", "index.faiss"):
+            os.replace(os.path.join(tmp_dir, name), os.path.join(SAVE_DIR, name))
 
-    print(f"saved -> {SAVE_DIR}")
+    print(f"saved -> {SAVE_DIR} (chunks={len(docs)})")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import List
+
+import numpy as np
+import redis
+from langchain_core.embeddings import Embeddings
+
+from common.redis_client import get_redis_client, mark_redis_unavailable
+
+EMBEDDING_REDIS_KEY_PREFIX = "rag:emb:"
+EMBEDDING_REDIS_TTL_SECONDS = 60 * 60 * 24 * 30  # 마지막 사용 후 30일 (조회 시 연장)
+EMBEDDING_LOCAL_MAX_SIZE = 1024  # 프로세스 내 LRU 최대 질문 수
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCT = re.compile(r"[\s?!.~]+$")
+
+
+def normalize_query(text: str) -> str:
+    """
+    같은 질문으로 볼 수 있도록 정규화 (NFC, 공백 정리, 소문자, 끝 문장부호 제거)
+    - "RSI가 뭐예요?" / "rsi가  뭐예요" -> 같은 키
+    """
+    t = unicodedata.normalize("NFC", text or "")
+    t = _WHITESPACE.sub(" ", t).strip().lower()
+    return _TRAILING_PUNCT.sub("", t)
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    질문 임베딩 캐시 (embed_query만 캐시, 문서 임베딩은 그대로 위임)
+    - 프로세스 내 LRU -> Redis(float32 bytes, 선택) -> OpenAI embeddings 순으로 조회
+    - 키: rag:emb:{model}:{sha256(정규화된 질문)}
+    """
+
+    def __init__(self, inner: Embeddings, model: str, local_max_size: int = EMBEDDING_LOCAL_MAX_SIZE):
+        self.inner = inner
+        self.model = model
+        self.local_max_size = local_max_size
+
+        self._local: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def _key(self, text: str) -> str:
+        digest = hashlib.sha256(normalize_query(text).encode("utf-8")).hexdigest()
+        return f"{EMBEDDING_REDIS_KEY_PREFIX}{self.model}:{digest}"
+
+    def _get_local(self, key: str):
+        with self._lock:
+            vec = self._local.get(key)
+            if vec is not None:
+                self._local.move_to_end(key)
+            return vec
+
+    def _put_local(self, key: str, vec: List[float]) -> None:
+        with self._lock:
+            self._local[key] = vec
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_max_size:
+                self._local.popitem(last=False)
+
+    def _get_shared(self, key: str):
+        client = get_redis_client()
+        if client is None:
+            return None
+        try:
+            raw = client.getex(key, ex=EMBEDDING_REDIS_TTL_SECONDS)
+        except redis.RedisError as e:
+            mark_redis_unavailable(e)
+            return None
+        if raw is None:
+            return None
+        return np.frombuffer(raw, dtype=np.float32).astype(float).tolist()
+
+    def _set_shared(self, key: str, vec: List[float]) -> None:
+        client = get_redis_client()
+        if client is None:
+            return
+        try:
+            client.set(key, np.asarray(vec, dtype=np.float32).tobytes(), ex=EMBEDDING_REDIS_TTL_SECONDS)
+        except redis.RedisError as e:
+            mark_redis_unavailable(e)
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+
+        vec = self._get_local(key)
+        if vec is not None:
+            self.hits += 1
+            return vec
+
+        vec = self._get_shared(key)
+        if vec is not None:
+            self.redis_hits += 1
+            self._put_local(key, vec)
+            return vec
+
+        self.misses += 1
+        vec = self.inner.embed_query(text)
+        self._put_local(key, vec)
+        self._set_shared(key, vec)
+        return vec
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.inner.embed_documents(texts)
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._local)
+        return {
+            "size": size,
+            "maxSize": self.local_max_size,
+            "hits": self.hits,
+            "redisHits": self.redis_hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from common.llm_gateway import achat_completion, chat_completion, stream_chat_completion
+
+_ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+
+class GatewayChatModel(BaseChatModel):
+    """
+    LangChain 체인에서 쓰는 chat model (호출은 모두 common.llm_gateway로 위임)
+    - 게이트웨이의 공용 클라이언트/동시 요청 제한(purpose별)/재시도를 그대로 사용
+    """
+
+    purpose: str
+    model: str = "gpt-4o-mini"
+    temperature: float = 0.2
+    api_key: Optional[str] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "llm-gateway"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"purpose": self.purpose, "model": self.model, "temperature": self.temperature}
+
+    def _request(self, messages: List[BaseMessage], stop: Optional[List[str]]) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "temperature": self.temperature,
+            "messages": [{"role": _ROLES.get(m.type, "user"), "content": m.content} for m in messages],
+        }
+        if stop:
+            kwargs["stop"] = stop
+        return kwargs
+
+    @staticmethod
+    def _to_result(resp) -> ChatResult:
+        content = resp.choices[0].message.content or ""
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        resp = chat_completion(self.purpose, api_key=self.api_key, **self._request(messages, stop))
+        return self._to_result(resp)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        resp = await achat_completion(self.purpose, api_key=self.api_key, **self._request(messages, stop))
+        return self._to_result(resp)
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        for chunk in stream_chat_completion(self.purpose, api_key=self.api_key, **self._request(messages, stop)):
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content or ""
+            if not text:
+                continue
+            if run_manager is not None:
+                run_manager.on_llm_new_token(text)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=text))
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from rag.lexical_index import LexicalIndex
+
+LEXICAL_CONFIDENT_COVERAGE = 0.8  # 1위 청크가 질문 단어(idf 가중)를 이 비율 이상 포함하고
+LEXICAL_CONFIDENT_MARGIN = 1.2  # 2위보다 이 배수 이상 점수가 높으면 임베딩 검색 생략
+RRF_K = 60  # reciprocal rank fusion 상수
+
+
+def _doc_key(doc: Document) -> str:
+    return str(doc.metadata.get("chunk_id") or f"{doc.metadata.get('source')}:{hash(doc.page_content)}")
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    BM25(로컬) + FAISS(임베딩) 하이브리드 검색
+    - 렉시컬 결과가 확실하면 그대로 반환 (임베딩 API 호출 없음)
+    - 아니면 두 결과를 reciprocal rank fusion으로 합침
+    - 임베딩 검색이 실패하면(네트워크 등) 렉시컬 결과로 응답
+    """
+
+    lexical: Optional[LexicalIndex] = None
+    vectorstore: Optional[FAISS] = None
+    k: int = 3
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    def _lexical_docs(self, ranked) -> List[Document]:
+        return [self.lexical.documents[i] for _, i in ranked]
+
+    def is_confident(self, query: str, ranked) -> bool:
+        if not ranked:
+            return False
+        top_score, top = ranked[0]
+        if self.lexical.coverage(query, top) < LEXICAL_CONFIDENT_COVERAGE:
+            return False
+        return len(ranked) == 1 or top_score >= LEXICAL_CONFIDENT_MARGIN * ranked[1][0]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        ranked = self.lexical.search(query, k=self.k * 2) if self.lexical is not None else []
+        if ranked and self.is_confident(query, ranked):
+            return self._lexical_docs(ranked)[: self.k]
+
+        lexical_docs = self._lexical_docs(ranked)
+        if self.vectorstore is None:
+            return lexical_docs[: self.k]
+
+        try:
+            vector_docs = self.vectorstore.similarity_search(query, k=self.k * 2)
+        except Exception as e:
+            print(f"[hybrid_retriever] 임베딩 검색 실패, 렉시컬 결과 사용: error={e}")
+            return lexical_docs[: self.k]
+
+        scores: Dict[str, float] = {}
+        docs: Dict[str, Document] = {}
+        for ranked_docs in (lexical_docs, vector_docs):
+            for rank, doc in enumerate(ranked_docs):
+                key = _doc_key(doc)
+                docs.setdefault(key, doc)
+                scores[key] = scores.get(key, 0.0) + 1.0 / (RRF_K + rank + 1)
+
+        order = sorted(scores, key=lambda key: -scores[key])
+        return [docs[key] for key in order[: self.k]]
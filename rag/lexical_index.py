@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import tempfile
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_LATIN = re.compile(r"[a-z0-9]+")
+_HANGUL = re.compile(r"[가-힣]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    - 영문/숫자: 단어 단위 (rsi, sma20, ...)
+    - 한글: 2글자 단위 n-gram (조사/어미가 붙어도 어간이 겹치도록), 1글자 단어는 그대로
+    """
+    t = (text or "").lower()
+    tokens = _LATIN.findall(t)
+    for word in _HANGUL.findall(t):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class LexicalIndex:
+    """
+    rag/docs 청크에 대한 BM25 역색인 (네트워크 없이 로컬에서 검색)
+    """
+
+    def __init__(self, documents: List[Document], term_freqs: List[Dict[str, int]]):
+        self.documents = documents
+        self.term_freqs = term_freqs
+        self.doc_lens = [sum(tf.values()) for tf in term_freqs]
+        self.avgdl = (sum(self.doc_lens) / len(self.doc_lens)) if self.doc_lens else 0.0
+
+        df: Counter = Counter()
+        self.postings: Dict[str, List[int]] = {}
+        for i, tf in enumerate(term_freqs):
+            for term in tf:
+                df[term] += 1
+                self.postings.setdefault(term, []).append(i)
+
+        n = len(documents)
+        self.idf = {term: math.log(1 + (n - c + 0.5) / (c + 0.5)) for term, c in df.items()}
+
+    @classmethod
+    def build(cls, documents: Iterable[Document]) -> "LexicalIndex":
+        docs = list(documents)
+        return cls(docs, [dict(Counter(tokenize(d.page_content))) for d in docs])
+
+    # ---------- 저장/로드 ----------
+
+    def save(self, path: str) -> None:
+        data = {
+            "k1": BM25_K1,
+            "b": BM25_B,
+            "docs": [
+                {"page_content": d.page_content, "metadata": d.metadata, "tf": tf}
+                for d, tf in zip(self.documents, self.term_freqs)
+            ],
+        }
+        directory = os.path.dirname(path) or "."
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".json.tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "LexicalIndex":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        docs = [Document(page_content=d["page_content"], metadata=d.get("metadata") or {}) for d in data["docs"]]
+        return cls(docs, [d["tf"] for d in data["docs"]])
+
+    # ---------- 검색 ----------
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[float, int]]:
+        """
+        반환: [(score, 문서 index)] 점수 내림차순
+        """
+        terms = [t for t in set(tokenize(query)) if t in self.idf]
+        if not terms:
+            return []
+
+        scores: Dict[int, float] = {}
+        for term in terms:
+            idf = self.idf[term]
+            for i in self.postings[term]:
+                tf = self.term_freqs[i][term]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lens[i] / (self.avgdl or 1))
+                scores[i] = scores.get(i, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        ranked = sorted(((s, i) for i, s in scores.items()), key=lambda x: -x[0])
+        return ranked[:k]
+
+    def coverage(self, query: str, doc_index: int) -> float:
+        """
+        질문에서 코퍼스에 있는 단어들 중 해당 문서가 포함하는 비율 (idf 가중)
+        """
+        terms = [t for t in set(tokenize(query)) if t in self.idf]
+        total = sum(self.idf[t] for t in terms)
+        if total <= 0:
+            return 0.0
+        tf = self.term_freqs[doc_index]
+        return sum(self.idf[t] for t in terms if t in tf) / total
+
+
+def load_or_build_lexical_index(path: str, fallback_docs: Optional[Iterable[Document]] = None) -> Optional[LexicalIndex]:
+    """
+    bm25.json이 있으면 로드, 없으면(이전 버전 인덱스) 벡터스토어 문서로 메모리에서 생성
+    """
+    if os.path.exists(path):
+        return LexicalIndex.load(path)
+    if fallback_docs is None:
+        return None
+    return LexicalIndex.build(fallback_docs)
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 
 from common.dependencies import get_current_user_id
 from rag.rag_schema import (
     ChartAssistantRequest,
     ChartAssistantResponse,
 )
-from rag.rag_service import ask_chart_assistant
+from rag.rag_service import ask_chart_assistant, stream_chart_assistant
 
 router = APIRouter(
     prefix="/api/tickers",
@@ -27,4 +28,27 @@ def ask_chart_assistant_route(
         question=req.question,
         range_=req.range,
         session_id=req.session_id,
-    )
\ No newline at end of file
+        context_mode=req.context_mode,
+    )
+
+
+@router.post("/{ticker}/assistant/stream")
+def ask_chart_assistant_stream_route(
+    ticker: str,
+    req: ChartAssistantRequest,
+    user_id: int = Depends(get_current_user_id),
+):
+    return StreamingResponse(
+        stream_chart_assistant(
+            ticker=ticker,
+            question=req.question,
+            range_=req.range,
+            session_id=req.session_id,
+            context_mode=req.context_mode,
+        ),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # nginx 프록시 버퍼링 해제
+        },
+    )
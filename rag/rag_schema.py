@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel
 
 
@@ -5,6 +7,8 @@ class ChartAssistantRequest(BaseModel):
     question: str
     range: str = "3M"
     session_id: str
+    # llm: technical-summary(LLM 해설 포함) / indicators: 지표만 사용 (LLM 호출 1회 절약)
+    context_mode: Literal["llm", "indicators"] = "llm"
 
 
 class ChartAssistantResponse(BaseModel):
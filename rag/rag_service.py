@@ -1,28 +1,23 @@
-from langchain_community.vectorstores import FAISS
+import json
+from datetime import datetime
+from typing import Iterator, Optional
+
+import redis
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import RunnableLambda, RunnableParallel
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_redis import RedisChatMessageHistory
 
-from tickers.tickers_service import get_technical_summary_with_llm
+from rag.gateway_chat_model import GatewayChatModel
+from rag.retriever_registry import retriever_registry
+from tickers.tickers_service import get_technical_snapshot, get_technical_summary_with_llm
 from common.config import settings
+from common.date_utils import US_MARKET_TZ
+from common.redis_client import get_redis_client, mark_redis_unavailable
 
-VECTORSTORE_DIR = "rag/vectorstore"
-
-
-def _load_retriever():
-    embeddings = OpenAIEmbeddings(
-        api_key=settings.openai_tech_api_key
-    )
-
-    vectorstore = FAISS.load_local(
-        VECTORSTORE_DIR,
-        embeddings,
-        allow_dangerous_deserialization=True,
-    )
-
-    return vectorstore.as_retriever(search_kwargs={"k": 3})
+HISTORY_TTL_SECONDS = 60 * 60 * 24 * 7  # 대화 히스토리 보관 기간 (7일)
+SNAPSHOT_CONTEXT_KEY_PREFIX = "rag:ctx:"
+SNAPSHOT_CONTEXT_TTL_SECONDS = 60 * 60 * 24  # 키에 거래일이 들어가므로 하루면 충분
 
 
 def _format_docs(docs):
@@ -34,14 +29,46 @@ def _format_docs(docs):
     )
 
 
-def _build_snapshot_context(inputs: dict) -> str:
-    ticker = inputs["ticker"]
-    range_ = inputs.get("range", "3M")
+def _snapshot_context_key(session_id: str, ticker: str, range_: str, context_mode: str) -> str:
+    trading_day = datetime.now(US_MARKET_TZ).date().isoformat()
+    return f"{SNAPSHOT_CONTEXT_KEY_PREFIX}{session_id}:{ticker}:{range_}:{context_mode}:{trading_day}"
+
+
+def _get_cached_snapshot_context(key: str) -> Optional[str]:
+    client = get_redis_client()
+    if client is None:
+        return None
+    try:
+        raw = client.get(key)
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
+        return None
+    return raw.decode("utf-8") if isinstance(raw, bytes) else raw
 
-    snapshot = get_technical_summary_with_llm(
-        ticker=ticker,
-        rng=range_,
-    )
+
+def _set_cached_snapshot_context(key: str, context: str) -> None:
+    client = get_redis_client()
+    if client is None:
+        return
+    try:
+        client.set(key, context, ex=SNAPSHOT_CONTEXT_TTL_SECONDS)
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
+
+
+def _render_snapshot_context(ticker: str, range_: str, context_mode: str) -> str:
+    """
+    - llm: technical-summary 결과(LLM 시그널/요약 포함)
+    - indicators: 지표 + 규칙 기반 시그널 ID만 (LLM 호출 없음)
+    """
+    if context_mode == "indicators":
+        snapshot = get_technical_snapshot(ticker=ticker, rng=range_)
+        signals = snapshot.signalIds
+        summary_line = f"lastClose: {snapshot.lastClose}"
+    else:
+        snapshot = get_technical_summary_with_llm(ticker=ticker, rng=range_)
+        signals = [s.id for s in snapshot.signals]
+        summary_line = f"summaryText: {snapshot.summaryText}"
 
     return f"""
 ticker: {snapshot.ticker}
@@ -55,27 +82,43 @@ bollinger_upper: {snapshot.indicators.bollinger.upper}
 bollinger_middle: {snapshot.indicators.bollinger.middle}
 bollinger_lower: {snapshot.indicators.bollinger.lower}
 
-signals: {[s.id for s in snapshot.signals]}
-summaryText: {snapshot.summaryText}
+signals: {signals}
+{summary_line}
 """.strip()
 
 
-def ask_chart_assistant(
-    ticker: str,
-    question: str,
-    range_: str = "3M",
-    session_id: str = None,
-):
-    retriever = _load_retriever()
+def _build_snapshot_context(inputs: dict) -> str:
+    """
+    같은 세션의 (ticker, range, 미국 거래일) 컨텍스트는 Redis에 캐시해 대화 턴마다 다시 계산하지 않음
+    """
+    ticker = inputs["ticker"].upper().strip()
+    range_ = inputs.get("range", "3M")
+    context_mode = inputs.get("context_mode", "llm")
+    session_id = inputs.get("session_id")
 
-    # 히스토리 로드
-    history = RedisChatMessageHistory(
+    key = _snapshot_context_key(session_id, ticker, range_, context_mode) if session_id else None
+    if key is not None:
+        cached = _get_cached_snapshot_context(key)
+        if cached is not None:
+            return cached
+
+    context = _render_snapshot_context(ticker, range_, context_mode)
+
+    if key is not None:
+        _set_cached_snapshot_context(key, context)
+    return context
+
+
+def _load_history(session_id: str) -> RedisChatMessageHistory:
+    return RedisChatMessageHistory(
         session_id=session_id,
         redis_url=settings.redis_url,
-        ttl=60 * 60 * 24 * 7,  # 7일
+        ttl=HISTORY_TTL_SECONDS,
     )
 
-    print(history.messages)
+
+def _build_chain(history: RedisChatMessageHistory):
+    retriever = retriever_registry.get_retriever()
 
     prompt = ChatPromptTemplate.from_messages(
         [
@@ -110,13 +153,15 @@ def ask_chart_assistant(
         ]
     )
 
-    llm = ChatOpenAI(
+    # 다른 LLM 호출과 같은 게이트웨이 사용 (rag 용도 동시 요청 제한)
+    llm = GatewayChatModel(
+        purpose="rag",
         api_key=settings.openai_tech_api_key,
         model="gpt-4o-mini",
         temperature=0.2,
     )
 
-    chain = (
+    return (
         RunnableParallel(
             {
                 "snapshot_context": RunnableLambda(
@@ -140,11 +185,28 @@ def ask_chart_assistant(
         | StrOutputParser()
     )
 
+
+def ask_chart_assistant(
+    ticker: str,
+    question: str,
+    range_: str = "3M",
+    session_id: str = None,
+    context_mode: str = "llm",
+):
+    # 히스토리 로드
+    history = _load_history(session_id)
+
+    print(history.messages)
+
+    chain = _build_chain(history)
+
     answer = chain.invoke(
         {
             "ticker": ticker,
             "question": question,
             "range": range_,
+            "session_id": session_id,
+            "context_mode": context_mode,
         }
     )
 
@@ -157,4 +219,64 @@ def ask_chart_assistant(
         "range": range_,
         "question": question,
         "answer": answer,
-    }
\ No newline at end of file
+    }
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def stream_chart_assistant(
+    ticker: str,
+    question: str,
+    range_: str = "3M",
+    session_id: str = None,
+    context_mode: str = "llm",
+) -> Iterator[str]:
+    """
+    ask_chart_assistant의 SSE 버전
+    - start: 요청 수신 직후 바로 전송 (지표/문서 검색을 기다리지 않음)
+    - token: 모델이 생성하는 대로 조각 전송 ({"text": "..."})
+    - done: 전체 답변 (스트림이 끝까지 간 경우에만 히스토리 저장)
+    - error: 중간 실패 시 메시지 전송 후 종료 (히스토리 저장 안 함)
+    """
+    yield _sse("start", {"ticker": ticker.upper(), "range": range_})
+
+    try:
+        history = _load_history(session_id)
+        chain = _build_chain(history)
+
+        parts = []
+        for chunk in chain.stream(
+            {
+                "ticker": ticker,
+                "question": question,
+                "range": range_,
+                "session_id": session_id,
+                "context_mode": context_mode,
+            }
+        ):
+            if not chunk:
+                continue
+            parts.append(chunk)
+            yield _sse("token", {"text": chunk})
+
+        answer = "".join(parts)
+
+        # 히스토리 저장
+        history.add_user_message(question)
+        history.add_ai_message(answer)
+    except Exception as e:
+        print(f"[stream_chart_assistant] 실패: ticker={ticker}, error={e}")
+        yield _sse("error", {"message": "답변 생성 중 오류가 발생했습니다."})
+        return
+
+    yield _sse(
+        "done",
+        {
+            "ticker": ticker.upper(),
+            "range": range_,
+            "question": question,
+            "answer": answer,
+        },
+    )
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from langchain_community.vectorstores import FAISS
+from langchain_openai import OpenAIEmbeddings
+
+from common.config import settings
+from rag.embedding_cache import CachedQueryEmbeddings
+from rag.hybrid_retriever import HybridRetriever
+from rag.lexical_index import LexicalIndex, load_or_build_lexical_index
+
+VECTORSTORE_DIR = "rag/vectorstore"
+INDEX_FILES = ("index.faiss", "index.pkl")
+LEXICAL_INDEX_FILE = "bm25.json"  # build_vectorstore.py가 함께 생성 (없으면 벡터스토어 문서로 생성)
+RELOAD_CHECK_INTERVAL_SECONDS = 5  # 인덱스 파일 변경 여부를 확인하는 최소 간격
+RETRIEVER_K = 3
+
+
+class RetrieverRegistry:
+    """
+    FAISS 벡터스토어 + BM25 렉시컬 인덱스를 프로세스당 한 번만 로드해 재사용
+    - 첫 요청(또는 startup warm_up)에서 로드
+    - build_vectorstore.py가 인덱스를 다시 쓰면(mtime 변경) 다음 요청에서 새로 로드
+    - 새 인덱스 로드에 실패하면 기존 인덱스를 계속 사용
+    """
+
+    def __init__(self, index_dir: str = VECTORSTORE_DIR, k: int = RETRIEVER_K):
+        self.index_dir = index_dir
+        self.k = k
+
+        self._lock = threading.Lock()
+        self._embeddings: Optional[CachedQueryEmbeddings] = None
+        self._vectorstore: Optional[FAISS] = None
+        self._lexical: Optional[LexicalIndex] = None
+        self._signature: Optional[Tuple[int, ...]] = None
+        self._checked_at = 0.0
+
+        self.loads = 0
+        self.load_failures = 0
+        self.last_load_ms: Optional[float] = None
+        self.last_loaded_at: Optional[datetime] = None
+
+    def _index_signature(self) -> Optional[Tuple[int, ...]]:
+        try:
+            signature = tuple(os.stat(os.path.join(self.index_dir, f)).st_mtime_ns for f in INDEX_FILES)
+        except FileNotFoundError:
+            return None
+        lexical_path = os.path.join(self.index_dir, LEXICAL_INDEX_FILE)
+        return signature + ((os.stat(lexical_path).st_mtime_ns,) if os.path.exists(lexical_path) else ())
+
+    def _get_embeddings(self) -> CachedQueryEmbeddings:
+        if self._embeddings is None:
+            inner = OpenAIEmbeddings(api_key=settings.openai_tech_api_key)
+            self._embeddings = CachedQueryEmbeddings(inner, model=inner.model)
+        return self._embeddings
+
+    def _load(self, signature: Optional[Tuple[int, ...]]) -> None:
+        started = time.perf_counter()
+        try:
+            vectorstore = FAISS.load_local(
+                self.index_dir,
+                self._get_embeddings(),
+                allow_dangerous_deserialization=True,
+            )
+            # index.faiss / index.pkl 중 하나만 교체된 시점에 읽으면 개수가 어긋남
+            if vectorstore.index.ntotal != len(vectorstore.index_to_docstore_id):
+                raise ValueError("index.faiss와 index.pkl의 문서 수가 다릅니다.")
+            lexical = load_or_build_lexical_index(
+                os.path.join(self.index_dir, LEXICAL_INDEX_FILE),
+                fallback_docs=list(vectorstore.docstore._dict.values()),
+            )
+        except Exception as e:
+            self.load_failures += 1
+            print(f"[retriever_registry] 로드 실패: dir={self.index_dir}, error={e}")
+            if self._vectorstore is None:
+                raise
+            return
+
+        self._vectorstore = vectorstore
+        self._lexical = lexical
+        self._signature = signature
+        self.loads += 1
+        self.last_load_ms = (time.perf_counter() - started) * 1000
+        self.last_loaded_at = datetime.now(timezone.utc)
+        print(
+            f"[retriever_registry] 로드 완료: docs={vectorstore.index.ntotal}, "
+            f"lexicalDocs={len(lexical.documents)}, "
+            f"elapsed={self.last_load_ms:.1f}ms"
+        )
+
+    def get_vectorstore(self) -> FAISS:
+        now = time.monotonic()
+        if self._vectorstore is not None and now - self._checked_at < RELOAD_CHECK_INTERVAL_SECONDS:
+            return self._vectorstore
+
+        with self._lock:
+            self._checked_at = now
+            signature = self._index_signature()
+            if self._vectorstore is None or (signature is not None and signature != self._signature):
+                self._load(signature)
+            return self._vectorstore
+
+    def get_retriever(self) -> HybridRetriever:
+        vectorstore = self.get_vectorstore()
+        return HybridRetriever(lexical=self._lexical, vectorstore=vectorstore, k=self.k)
+
+    def warm_up(self) -> None:
+        """
+        startup에서 호출 (실패해도 서버 기동은 계속, 첫 요청에서 다시 시도)
+        """
+        try:
+            self.get_vectorstore()
+        except Exception as e:
+            print(f"[retriever_registry] warm-up 실패: error={e}")
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self._vectorstore is not None,
+            "documents": self._vectorstore.index.ntotal if self._vectorstore is not None else 0,
+            "lexicalDocuments": len(self._lexical.documents) if self._lexical is not None else 0,
+            "loads": self.loads,
+            "loadFailures": self.load_failures,
+            "lastLoadMs": self.last_load_ms,
+            "lastLoadedAt": self.last_loaded_at.isoformat() if self.last_loaded_at else None,
+            "embeddingCache": self._embeddings.stats() if self._embeddings is not None else None,
+        }
+
+
+retriever_registry = RetrieverRegistry()
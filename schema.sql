@@ -98,6 +98,39 @@ CREATE TABLE public.assets (
 
 ALTER TABLE public.assets OWNER TO postgres;
 
+--
+-- Name: daily_bar_syncs; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.daily_bar_syncs (
+    ticker character varying(16) NOT NULL,
+    covered_from date NOT NULL,
+    covered_to date NOT NULL,
+    synced_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+
+ALTER TABLE public.daily_bar_syncs OWNER TO postgres;
+
+--
+-- Name: daily_bars; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.daily_bars (
+    ticker character varying(16) NOT NULL,
+    trade_date date NOT NULL,
+    open numeric(18,6),
+    high numeric(18,6),
+    low numeric(18,6),
+    close numeric(18,6) NOT NULL,
+    volume bigint,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+
+ALTER TABLE public.daily_bars OWNER TO postgres;
+
+
 --
 -- Name: holdings; Type: TABLE; Schema: public; Owner: postgres
 --
@@ -138,6 +171,40 @@ ALTER SEQUENCE public.holdings_id_seq OWNER TO postgres;
 ALTER SEQUENCE public.holdings_id_seq OWNED BY public.holdings.id;
 
 
+--
+-- Name: llm_explain_cache; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.llm_explain_cache (
+    cache_key character varying(64) NOT NULL,
+    purpose character varying(20) NOT NULL,
+    prompt_version character varying(20) NOT NULL,
+    payload jsonb NOT NULL,
+    hit_count integer DEFAULT 0 NOT NULL,
+    last_hit_at timestamp with time zone,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    expires_at timestamp with time zone NOT NULL
+);
+
+
+ALTER TABLE public.llm_explain_cache OWNER TO postgres;
+
+
+--
+-- Name: portfolio_backfill_states; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.portfolio_backfill_states (
+    user_id bigint NOT NULL,
+    backfilled_through date NOT NULL,
+    last_event_id bigint DEFAULT 0 NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+
+ALTER TABLE public.portfolio_backfill_states OWNER TO postgres;
+
+
 --
 -- Name: portfolio_snapshots; Type: TABLE; Schema: public; Owner: postgres
 --
@@ -178,6 +245,24 @@ ALTER SEQUENCE public.portfolio_snapshots_id_seq OWNER TO postgres;
 ALTER SEQUENCE public.portfolio_snapshots_id_seq OWNED BY public.portfolio_snapshots.id;
 
 
+--
+-- Name: realized_pnl_daily; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.realized_pnl_daily (
+    user_id bigint NOT NULL,
+    trade_date date NOT NULL,
+    realized_pnl numeric(18,4) DEFAULT 0 NOT NULL,
+    sell_count integer DEFAULT 0 NOT NULL,
+    win_count integer DEFAULT 0 NOT NULL,
+    updated_at timestamp with time zone DEFAULT now() NOT NULL,
+    cost_basis numeric(20,4) DEFAULT 0 NOT NULL
+);
+
+
+ALTER TABLE public.realized_pnl_daily OWNER TO postgres;
+
+
 --
 -- Name: sector_summaries; Type: TABLE; Schema: public; Owner: postgres
 --
@@ -330,6 +415,53 @@ ALTER SEQUENCE public.tickers_id_seq OWNER TO postgres;
 ALTER SEQUENCE public.tickers_id_seq OWNED BY public.tickers.id;
 
 
+--
+-- Name: trade_events; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.trade_events (
+    id bigint NOT NULL,
+    user_id bigint NOT NULL,
+    trade_id bigint NOT NULL,
+    position_id bigint NOT NULL,
+    event_type character varying(10) NOT NULL,
+    ticker character varying(16) NOT NULL,
+    trade_type character varying(10) NOT NULL,
+    trade_date date NOT NULL,
+    price numeric(18,4) NOT NULL,
+    quantity integer NOT NULL,
+    confidence integer,
+    position_action character varying(20) NOT NULL,
+    pnl_amount numeric(18,4),
+    pnl_rate numeric(10,6),
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    CONSTRAINT chk_trade_events_event_type CHECK (((event_type)::text = ANY ((ARRAY['CREATED'::character varying, 'DELETED'::character varying])::text[])))
+);
+
+
+ALTER TABLE public.trade_events OWNER TO postgres;
+
+--
+-- Name: trade_events_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
+--
+
+CREATE SEQUENCE public.trade_events_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER SEQUENCE public.trade_events_id_seq OWNER TO postgres;
+
+--
+-- Name: trade_events_id_seq; Type: SEQUENCE OWNED BY; Schema: public; Owner: postgres
+--
+
+ALTER SEQUENCE public.trade_events_id_seq OWNED BY public.trade_events.id;
+
+
 --
 -- Name: trade_market_snapshots; Type: TABLE; Schema: public; Owner: postgres
 --
@@ -383,6 +515,11 @@ CREATE TABLE public.trade_positions (
     closed_at timestamp with time zone,
     created_at timestamp with time zone DEFAULT now() NOT NULL,
     updated_at timestamp with time zone DEFAULT now() NOT NULL,
+    quantity integer DEFAULT 0 NOT NULL,
+    buy_quantity integer DEFAULT 0 NOT NULL,
+    cost_basis numeric(20,4) DEFAULT 0 NOT NULL,
+    avg_price numeric(18,8),
+    realized_pnl numeric(18,4),
     CONSTRAINT chk_trade_positions_status CHECK (((status)::text = ANY ((ARRAY['OPEN'::character varying, 'CLOSED'::character varying])::text[])))
 );
 
@@ -428,6 +565,25 @@ CREATE TABLE public.trade_results (
 
 ALTER TABLE public.trade_results OWNER TO postgres;
 
+--
+-- Name: trade_stats; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.trade_stats (
+    user_id bigint NOT NULL,
+    trade_count integer DEFAULT 0 NOT NULL,
+    confidence_sum bigint DEFAULT 0 NOT NULL,
+    confidence_count integer DEFAULT 0 NOT NULL,
+    exit_count integer DEFAULT 0 NOT NULL,
+    win_count integer DEFAULT 0 NOT NULL,
+    best_return numeric(10,6),
+    updated_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+
+ALTER TABLE public.trade_stats OWNER TO postgres;
+
+
 --
 -- Name: trades; Type: TABLE; Schema: public; Owner: postgres
 --
@@ -674,6 +830,13 @@ ALTER TABLE ONLY public.ticker_news ALTER COLUMN id SET DEFAULT nextval('public.
 ALTER TABLE ONLY public.tickers ALTER COLUMN id SET DEFAULT nextval('public.tickers_id_seq'::regclass);
 
 
+--
+-- Name: trade_events id; Type: DEFAULT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.trade_events ALTER COLUMN id SET DEFAULT nextval('public.trade_events_id_seq'::regclass);
+
+
 --
 -- Name: trade_market_snapshots id; Type: DEFAULT; Schema: public; Owner: postgres
 --
@@ -747,6 +910,22 @@ ALTER TABLE ONLY public.assets
     ADD CONSTRAINT assets_pkey PRIMARY KEY (ticker);
 
 
+--
+-- Name: daily_bar_syncs daily_bar_syncs_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.daily_bar_syncs
+    ADD CONSTRAINT daily_bar_syncs_pkey PRIMARY KEY (ticker);
+
+
+--
+-- Name: daily_bars daily_bars_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.daily_bars
+    ADD CONSTRAINT daily_bars_pkey PRIMARY KEY (ticker, trade_date);
+
+
 --
 -- Name: holdings holdings_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -755,6 +934,22 @@ ALTER TABLE ONLY public.holdings
     ADD CONSTRAINT holdings_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: llm_explain_cache llm_explain_cache_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.llm_explain_cache
+    ADD CONSTRAINT llm_explain_cache_pkey PRIMARY KEY (cache_key);
+
+
+--
+-- Name: portfolio_backfill_states portfolio_backfill_states_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.portfolio_backfill_states
+    ADD CONSTRAINT portfolio_backfill_states_pkey PRIMARY KEY (user_id);
+
+
 --
 -- Name: portfolio_snapshots portfolio_snapshots_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -763,6 +958,14 @@ ALTER TABLE ONLY public.portfolio_snapshots
     ADD CONSTRAINT portfolio_snapshots_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: realized_pnl_daily realized_pnl_daily_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.realized_pnl_daily
+    ADD CONSTRAINT realized_pnl_daily_pkey PRIMARY KEY (user_id, trade_date);
+
+
 --
 -- Name: sector_summaries sector_summaries_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -819,6 +1022,14 @@ ALTER TABLE ONLY public.tickers
     ADD CONSTRAINT tickers_sector_id_ticker_key UNIQUE (sector_id, ticker);
 
 
+--
+-- Name: trade_events trade_events_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.trade_events
+    ADD CONSTRAINT trade_events_pkey PRIMARY KEY (id);
+
+
 --
 -- Name: trade_market_snapshots trade_market_snapshots_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -843,6 +1054,14 @@ ALTER TABLE ONLY public.trade_results
     ADD CONSTRAINT trade_results_pkey PRIMARY KEY (trade_id);
 
 
+--
+-- Name: trade_stats trade_stats_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.trade_stats
+    ADD CONSTRAINT trade_stats_pkey PRIMARY KEY (user_id);
+
+
 --
 -- Name: trades trades_pkey; Type: CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -974,6 +1193,13 @@ CREATE INDEX idx_holdings_ticker ON public.holdings USING btree (ticker);
 CREATE INDEX idx_holdings_user_id ON public.holdings USING btree (user_id);
 
 
+--
+-- Name: idx_llm_explain_cache_expires_at; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_llm_explain_cache_expires_at ON public.llm_explain_cache USING btree (expires_at);
+
+
 --
 -- Name: idx_portfolio_snapshots_user_date; Type: INDEX; Schema: public; Owner: postgres
 --
@@ -981,6 +1207,20 @@ CREATE INDEX idx_holdings_user_id ON public.holdings USING btree (user_id);
 CREATE INDEX idx_portfolio_snapshots_user_date ON public.portfolio_snapshots USING btree (user_id, captured_date DESC);
 
 
+--
+-- Name: idx_trade_events_trade_id; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_trade_events_trade_id ON public.trade_events USING btree (trade_id);
+
+
+--
+-- Name: idx_trade_events_user_id; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_trade_events_user_id ON public.trade_events USING btree (user_id, id);
+
+
 --
 -- Name: idx_trade_market_snapshots_trade_id; Type: INDEX; Schema: public; Owner: postgres
 --
@@ -1023,6 +1263,13 @@ CREATE INDEX idx_trades_position_id ON public.trades USING btree (position_id);
 CREATE INDEX idx_trades_ticker ON public.trades USING btree (ticker);
 
 
+--
+-- Name: idx_trades_user_confidence; Type: INDEX; Schema: public; Owner: postgres
+--
+
+CREATE INDEX idx_trades_user_confidence ON public.trades USING btree (user_id, confidence, id);
+
+
 --
 -- Name: idx_trades_user_date; Type: INDEX; Schema: public; Owner: postgres
 --
@@ -1121,6 +1368,14 @@ ALTER TABLE ONLY public.user_interest_sectors
     ADD CONSTRAINT fk_interest_user FOREIGN KEY (user_id) REFERENCES public.users(id) ON DELETE CASCADE;
 
 
+--
+-- Name: portfolio_backfill_states fk_portfolio_backfill_states_user; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.portfolio_backfill_states
+    ADD CONSTRAINT fk_portfolio_backfill_states_user FOREIGN KEY (user_id) REFERENCES public.users(id) ON DELETE CASCADE;
+
+
 --
 -- Name: portfolio_snapshots fk_portfolio_snapshots_user; Type: FK CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -1129,6 +1384,14 @@ ALTER TABLE ONLY public.portfolio_snapshots
     ADD CONSTRAINT fk_portfolio_snapshots_user FOREIGN KEY (user_id) REFERENCES public.users(id) ON DELETE CASCADE;
 
 
+--
+-- Name: realized_pnl_daily fk_realized_pnl_daily_user; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.realized_pnl_daily
+    ADD CONSTRAINT fk_realized_pnl_daily_user FOREIGN KEY (user_id) REFERENCES public.users(id) ON DELETE CASCADE;
+
+
 --
 -- Name: sector_summaries fk_sector_summary_sector; Type: FK CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -1137,6 +1400,14 @@ ALTER TABLE ONLY public.sector_summaries
     ADD CONSTRAINT fk_sector_summary_sector FOREIGN KEY (sector_id) REFERENCES public.sectors(id) ON DELETE CASCADE;
 
 
+--
+-- Name: trade_events fk_trade_events_user; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.trade_events
+    ADD CONSTRAINT fk_trade_events_user FOREIGN KEY (user_id) REFERENCES public.users(id) ON DELETE CASCADE;
+
+
 --
 -- Name: trade_market_snapshots fk_snapshots_trade; Type: FK CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -1169,6 +1440,14 @@ ALTER TABLE ONLY public.trade_results
     ADD CONSTRAINT fk_trade_results_trade FOREIGN KEY (trade_id) REFERENCES public.trades(id) ON DELETE CASCADE;
 
 
+--
+-- Name: trade_stats fk_trade_stats_user; Type: FK CONSTRAINT; Schema: public; Owner: postgres
+--
+
+ALTER TABLE ONLY public.trade_stats
+    ADD CONSTRAINT fk_trade_stats_user FOREIGN KEY (user_id) REFERENCES public.users(id) ON DELETE CASCADE;
+
+
 --
 -- Name: trades fk_trades_asset; Type: FK CONSTRAINT; Schema: public; Owner: postgres
 --
@@ -1,11 +1,7 @@
 import json
-from openai import OpenAI
-
-from common.config import settings
+from common.llm_gateway import chat_completion
 from sector_summary.service.gpt_prompt import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
 
-client = OpenAI(api_key=settings.openai_api_key)
-
 
 def summarize_sector(
     sector_key: str,
@@ -17,7 +13,8 @@ def summarize_sector(
         articles_json=json.dumps(articles, ensure_ascii=False)
     )
 
-    res = client.chat.completions.create(
+    res = chat_completion(
+        "sector_summary",
         model="gpt-4o-mini",
         temperature=0.2,
         messages=[
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from common.database import SessionLocal
+from tickers.tickers_entity import LlmExplainCache
+from tickers.tickers_schema import ExplainResult, TechnicalSnapshot
+
+
+EXPLAIN_CACHE_TTL_SECONDS = 60 * 60 * 24 * 7  # 같은 시그널 조합의 해설을 재사용하는 기간
+EXPLAIN_CACHE_MAX_ROWS = 5000  # 초과분은 가장 오래 안 쓰인 항목부터 삭제
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _bucket(value: float, step: float) -> Optional[float]:
+    if value is None or not math.isfinite(value):
+        return None
+    return round(math.floor(value / step) * step, 4)
+
+
+def _relative_features(snapshot: TechnicalSnapshot) -> Dict[str, Tuple[Optional[float], float]]:
+    """
+    가격 수준과 무관한 상대값 -> (값, 구간 폭) (티커/절대 가격은 제외)
+    """
+    ind = snapshot.indicators
+    bb = ind.bollinger
+    close = snapshot.lastClose
+    width = bb.upper - bb.lower
+
+    return {
+        "smaGapPct": ((ind.sma20 / ind.sma50 - 1) * 100 if ind.sma50 else None, 1.0),
+        "priceVsSma20Pct": ((close / ind.sma20 - 1) * 100 if ind.sma20 else None, 2.0),
+        "rsi": (ind.rsi14, 5.0),
+        "bbPosition": ((close - bb.lower) / width if width > 0 else None, 0.1),
+        "bbWidthPct": (width / bb.middle * 100 if bb.middle else None, 2.0),
+    }
+
+
+def _quantize_snapshot(snapshot: TechnicalSnapshot) -> dict:
+    """
+    상대값을 구간 하한으로 구간화 (캐시 키 재료)
+    """
+    return {
+        "range": snapshot.range,
+        **{k: _bucket(v, step) for k, (v, step) in _relative_features(snapshot).items()},
+    }
+
+
+def describe_snapshot_buckets(snapshot: TechnicalSnapshot) -> Dict[str, Optional[str]]:
+    """
+    캐시 키와 같은 구간을 "하한~상한" 문자열로 (LLM 입력용: 같은 키의 모든 스냅샷에 맞는 값만 전달)
+    """
+    out: Dict[str, Optional[str]] = {}
+    for k, (v, step) in _relative_features(snapshot).items():
+        low = _bucket(v, step)
+        out[k] = None if low is None else f"{low:g}~{round(low + step, 4):g}"
+    return out
+
+
+def build_explain_cache_key(snapshot: TechnicalSnapshot, purpose: str, prompt_version: str) -> str:
+    """
+    (purpose, 시그널 ID 조합, 구간화한 지표, 프롬프트 버전) -> sha256
+    """
+    material = {
+        "purpose": purpose,
+        "promptVersion": prompt_version,
+        "signalIds": sorted(snapshot.signalIds),
+        "features": _quantize_snapshot(snapshot),
+    }
+    raw = json.dumps(material, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_cached_explain(cache_key: str) -> Optional[ExplainResult]:
+    """
+    만료 전 항목이면 반환 + hit_count 증가 (DB 오류 시 None -> LLM 호출로 진행)
+    """
+    db = SessionLocal()
+    try:
+        payload = db.execute(
+            update(LlmExplainCache)
+            .where(
+                LlmExplainCache.cache_key == cache_key,
+                LlmExplainCache.expires_at > func.now(),
+            )
+            .values(
+                hit_count=LlmExplainCache.hit_count + 1,
+                last_hit_at=func.now(),
+            )
+            .returning(LlmExplainCache.payload)
+        ).scalar_one_or_none()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"[explain_cache] 조회 실패: key={cache_key[:12]}, error={e}")
+        return None
+    finally:
+        db.close()
+
+    if payload is None:
+        return None
+
+    try:
+        return ExplainResult.model_validate(payload)
+    except Exception:
+        return None
+
+
+def save_explain(
+    cache_key: str,
+    purpose: str,
+    prompt_version: str,
+    result: ExplainResult,
+    ttl_seconds: int = EXPLAIN_CACHE_TTL_SECONDS,
+) -> None:
+    db = SessionLocal()
+    try:
+        expires_at = _utcnow() + timedelta(seconds=ttl_seconds)
+        stmt = insert(LlmExplainCache).values(
+            cache_key=cache_key,
+            purpose=purpose,
+            prompt_version=prompt_version,
+            payload=result.model_dump(mode="json"),
+            expires_at=expires_at,
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[LlmExplainCache.cache_key],
+                set_={
+                    "payload": stmt.excluded.payload,
+                    "expires_at": stmt.excluded.expires_at,
+                },
+            )
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"[explain_cache] 저장 실패: key={cache_key[:12]}, error={e}")
+    finally:
+        db.close()
+
+
+def evict_explain_cache(db: Session, max_rows: int = EXPLAIN_CACHE_MAX_ROWS) -> int:
+    """
+    만료된 항목 삭제 후, max_rows 초과분은 마지막 사용(last_hit_at, 없으면 created_at)이 오래된 순으로 삭제
+    - 반환: 삭제된 행 수
+    """
+    expired = db.execute(
+        delete(LlmExplainCache).where(LlmExplainCache.expires_at <= func.now())
+    ).rowcount or 0
+
+    last_used = func.coalesce(LlmExplainCache.last_hit_at, LlmExplainCache.created_at)
+    overflow = (
+        select(LlmExplainCache.cache_key)
+        .order_by(last_used.desc())
+        .offset(max_rows)
+        .scalar_subquery()
+    )
+    trimmed = db.execute(
+        delete(LlmExplainCache).where(LlmExplainCache.cache_key.in_(overflow))
+    ).rowcount or 0
+
+    db.commit()
+    return expired + trimmed
@@ -2,9 +2,9 @@ import json
 import os
 from typing import Optional, Literal
 
-from openai import OpenAI
-
 from common.config import settings
+from common.llm_gateway import chat_completion
+from tickers.explain_cache import build_explain_cache_key, get_cached_explain, describe_snapshot_buckets, save_explain
 from tickers.tickers_schema import TechnicalSnapshot, ExplainResult
 
 
@@ -33,6 +33,9 @@ SYSTEM_PROMPT = """
 - 불필요하게 추상적인 마무리 문장은 쓰지 않습니다.
 """.strip()
 
+# SYSTEM_PROMPT/user_prompt를 바꾸면 올려서 이전 해설 캐시를 무효화
+EXPLAIN_PROMPT_VERSION = "4"
+
 Purpose = Literal["tech", "news"]
 
 
@@ -77,8 +80,15 @@ def _get_openai_api_key(purpose: Purpose = "tech") -> str:
     )
 
 
-def _get_openai_client(purpose: Purpose = "tech") -> OpenAI:
-    return OpenAI(api_key=_get_openai_api_key(purpose))
+def _llm_snapshot(snapshot: TechnicalSnapshot) -> dict:
+    """
+    LLM 입력: 시그널 ID + 캐시 키와 같은 구간의 상대 지표 ("하한~상한", %, 밴드 내 위치 0~1)
+    """
+    return {
+        "range": snapshot.range,
+        "signalIds": sorted(snapshot.signalIds),
+        "indicators": describe_snapshot_buckets(snapshot),
+    }
 
 
 def explain_snapshot_with_openai(
@@ -87,8 +97,13 @@ def explain_snapshot_with_openai(
 ) -> ExplainResult:
     """
     TechnicalSnapshot 기반으로 signals/summaryText를 생성합니다.
+    - 시그널 조합 + 구간화한 지표가 같은 스냅샷은 llm_explain_cache의 결과를 재사용
+      - LLM에는 캐시 키와 같은 구간(범위)만 전달 (캐시된 해설이 같은 키의 다른 종목에도 맞도록)
     """
-    client = _get_openai_client(purpose)
+    cache_key = build_explain_cache_key(snapshot, purpose, EXPLAIN_PROMPT_VERSION)
+    cached = get_cached_explain(cache_key)
+    if cached is not None:
+        return cached
 
     user_prompt = f"""
     아래 기술적 지표 스냅샷을 바탕으로 signals와 summaryText를 작성하세요.
@@ -99,10 +114,12 @@ def explain_snapshot_with_openai(
     - 1~2문장으로 간결하게 작성
 
     스냅샷(JSON):
-    {snapshot.model_dump_json(ensure_ascii=False, indent=2)}
+    {json.dumps(_llm_snapshot(snapshot), ensure_ascii=False, indent=2)}
     """.strip()
 
-    resp = client.chat.completions.create(
+    resp = chat_completion(
+        purpose,
+        api_key=_get_openai_api_key(purpose),
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT},
@@ -124,4 +141,6 @@ def explain_snapshot_with_openai(
             raise ValueError(f"OpenAI JSON 파싱 실패: {content}")
         data = json.loads(content[start : end + 1])
 
-    return ExplainResult.model_validate(data)
+    result = ExplainResult.model_validate(data)
+    save_explain(cache_key, purpose, EXPLAIN_PROMPT_VERSION, result)
+    return result
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tickers.tickers_schema import BollingerBands, TechnicalIndicators
+
+
+SMA_SHORT_WINDOW = 20
+SMA_LONG_WINDOW = 50
+RSI_PERIOD = 14
+BB_WINDOW = 20
+BB_STD_MULTIPLIER = 2
+
+NOT_ENOUGH_DATA_MESSAGE = "지표 계산을 위한 데이터가 부족합니다(최소 50거래일 이상 필요)."
+
+
+# =========================
+# rolling 연산 (누적합 기반, 마지막 축 기준)
+# =========================
+
+def _window_sums(x: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    마지막 축 기준 길이 window 구간의 (합, 유효값 개수)
+    - 결과 길이는 n - window + 1 (i번째 값 = x[..., i : i + window])
+    - NaN은 0으로 채워 더하고 개수에서 제외
+    """
+    finite = np.isfinite(x)
+    filled = np.where(finite, x, 0.0)
+
+    pad = np.zeros(x.shape[:-1] + (1,), dtype=np.float64)
+    cs = np.concatenate([pad, np.cumsum(filled, axis=-1)], axis=-1)
+    cnt = np.concatenate([pad, np.cumsum(finite, axis=-1, dtype=np.float64)], axis=-1)
+
+    return cs[..., window:] - cs[..., :-window], cnt[..., window:] - cnt[..., :-window]
+
+
+def _align_right(values: np.ndarray, n: int, window: int) -> np.ndarray:
+    """
+    길이 n - window + 1 결과를 원래 길이 n에 맞춤 (앞쪽 window - 1개는 NaN)
+    """
+    out = np.full(values.shape[:-1] + (n,), np.nan, dtype=np.float64)
+    out[..., window - 1 :] = values
+    return out
+
+
+def _row_offset(x: np.ndarray) -> np.ndarray:
+    """
+    누적합 오차를 줄이기 위해 빼 둘 행별 기준값 (첫 유효값)
+    """
+    finite = np.isfinite(x)
+    first = np.argmax(finite, axis=-1)
+    offset = np.take_along_axis(x, first[..., None], axis=-1)
+    return np.where(np.isfinite(offset), offset, 0.0)
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    pandas rolling(window).mean()과 같은 규칙 (구간에 NaN이 있으면 NaN)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = x.shape[-1]
+    if n < window:
+        return np.full(x.shape, np.nan, dtype=np.float64)
+
+    offset = _row_offset(x)
+    sums, cnt = _window_sums(x - offset, window)
+    mean = np.where(cnt == window, sums / window, np.nan) + offset
+    return _align_right(mean, n, window)
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    pandas rolling(window).std()과 같은 규칙 (표본표준편차, ddof=1)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = x.shape[-1]
+    if n < window:
+        return np.full(x.shape, np.nan, dtype=np.float64)
+
+    centered = x - _row_offset(x)
+    sums, cnt = _window_sums(centered, window)
+    sq_sums, _ = _window_sums(centered * centered, window)
+
+    var = (sq_sums - sums * sums / window) / (window - 1)
+    std = np.where(cnt == window, np.sqrt(np.maximum(var, 0.0)), np.nan)
+    return _align_right(std, n, window)
+
+
+def rsi(close: np.ndarray, period: int = RSI_PERIOD) -> np.ndarray:
+    """
+    단순이동평균 방식 RSI (기존 pandas 구현과 동일)
+    - 하락이 없으면 100, 등락이 모두 없으면 NaN
+    """
+    close = np.asarray(close, dtype=np.float64)
+
+    delta = np.full(close.shape, np.nan, dtype=np.float64)
+    delta[..., 1:] = np.diff(close, axis=-1)
+
+    with np.errstate(invalid="ignore"):
+        gain = np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0))
+        loss = np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0))
+
+    avg_gain = rolling_mean(gain, period)
+    avg_loss = rolling_mean(loss, period)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+# =========================
+# 지표 계산
+# =========================
+
+@dataclass(frozen=True)
+class IndicatorSeries:
+    """
+    close와 같은 shape의 지표 배열 (1D: 한 종목, 2D: 종목 x 날짜)
+    """
+    close: np.ndarray
+    sma20: np.ndarray
+    sma50: np.ndarray
+    rsi14: np.ndarray
+    bb_mid: np.ndarray
+    bb_upper: np.ndarray
+    bb_lower: np.ndarray
+
+    @property
+    def valid(self) -> np.ndarray:
+        """
+        모든 지표가 계산된 위치 (기존 dropna() 이후 남는 행)
+        """
+        return (
+            np.isfinite(self.close)
+            & np.isfinite(self.sma50)
+            & np.isfinite(self.rsi14)
+            & np.isfinite(self.bb_upper)
+        )
+
+    def to_indicators(self, idx) -> TechnicalIndicators:
+        return TechnicalIndicators(
+            sma20=float(self.sma20[idx]),
+            sma50=float(self.sma50[idx]),
+            rsi14=float(self.rsi14[idx]),
+            bollinger=BollingerBands(
+                upper=float(self.bb_upper[idx]),
+                middle=float(self.bb_mid[idx]),
+                lower=float(self.bb_lower[idx]),
+            ),
+        )
+
+
+def compute_indicators(close: np.ndarray) -> IndicatorSeries:
+    """
+    SMA20/SMA50/RSI14/볼린저(20, 2σ)를 한 번에 계산
+    - close: 1D(날짜) 또는 2D(종목 x 날짜), 비어 있는 앞쪽은 NaN
+    """
+    close = np.asarray(close, dtype=np.float64)
+
+    sma20 = rolling_mean(close, SMA_SHORT_WINDOW)
+    bb_mid = sma20 if BB_WINDOW == SMA_SHORT_WINDOW else rolling_mean(close, BB_WINDOW)
+    std = rolling_std(close, BB_WINDOW)
+
+    return IndicatorSeries(
+        close=close,
+        sma20=sma20,
+        sma50=rolling_mean(close, SMA_LONG_WINDOW),
+        rsi14=rsi(close, RSI_PERIOD),
+        bb_mid=bb_mid,
+        bb_upper=bb_mid + BB_STD_MULTIPLIER * std,
+        bb_lower=bb_mid - BB_STD_MULTIPLIER * std,
+    )
+
+
+def _last_valid_upto(valid: np.ndarray) -> np.ndarray:
+    """
+    각 위치에서 그 위치 이하의 마지막 유효 index (없으면 -1)
+    """
+    idx = np.where(valid, np.arange(valid.shape[-1]), -1)
+    return np.maximum.accumulate(idx, axis=-1)
+
+
+def latest_indicators(close: np.ndarray) -> Tuple[float, TechnicalIndicators]:
+    """
+    마지막 유효 시점의 (종가, 지표)
+    - 데이터가 부족하면 ValueError
+    """
+    series = compute_indicators(close)
+    valid = np.flatnonzero(series.valid)
+    if valid.size == 0:
+        raise ValueError(NOT_ENOUGH_DATA_MESSAGE)
+
+    i = int(valid[-1])
+    return float(series.close[i]), series.to_indicators(i)
+
+
+def latest_indicators_batch(closes: Sequence[np.ndarray]) -> List[Optional[Tuple[float, TechnicalIndicators]]]:
+    """
+    여러 종목의 종가 배열을 오른쪽 정렬한 (종목 x 날짜) 행렬로 한 번에 계산
+    - 반환: 입력 순서대로 (종가, 지표), 데이터가 부족한 종목은 None
+    """
+    if not closes:
+        return []
+
+    width = max(len(c) for c in closes)
+    matrix = np.full((len(closes), width), np.nan, dtype=np.float64)
+    for row, c in zip(matrix, closes):
+        if len(c):
+            row[width - len(c) :] = c
+
+    series = compute_indicators(matrix)
+    last = _last_valid_upto(series.valid)[:, -1]
+
+    out: List[Optional[Tuple[float, TechnicalIndicators]]] = []
+    for row, i in enumerate(last):
+        if i < 0:
+            out.append(None)
+            continue
+        out.append((float(series.close[row, i]), series.to_indicators((row, int(i)))))
+    return out
+
+
+def indicators_as_of(
+    days: np.ndarray,
+    close: np.ndarray,
+    as_of_days: Sequence[float],
+) -> List[Optional[Tuple[float, TechnicalIndicators]]]:
+    """
+    한 종목의 전체 이력을 한 번만 계산해 여러 기준일(as-of)의 (종가, 지표)를 반환
+    - days: 1970-01-01 기준 일수(오름차순), as_of_days도 같은 단위
+    - 기준일 당일까지의 bar만 사용, 데이터가 부족한 기준일은 None
+    """
+    series = compute_indicators(close)
+    last_valid = _last_valid_upto(series.valid)
+    hi = np.searchsorted(np.asarray(days), np.asarray(as_of_days, dtype=np.float64), side="right") - 1
+
+    out: List[Optional[Tuple[float, TechnicalIndicators]]] = []
+    for h in hi:
+        i = int(last_valid[h]) if h >= 0 else -1
+        if i < 0:
+            out.append(None)
+            continue
+        out.append((float(series.close[i]), series.to_indicators(i)))
+    return out
+
+
+def make_signal_ids(last_close: float, indicators: TechnicalIndicators) -> List[str]:
+    ids: List[str] = []
+
+    # SMA 방향
+    ids.append("SMA_BEARISH" if indicators.sma20 < indicators.sma50 else "SMA_BULLISH")
+
+    # RSI 구간
+    if indicators.rsi14 <= 40:
+        ids.append("RSI_OVERSOLD_NEAR")
+    elif indicators.rsi14 >= 70:
+        ids.append("RSI_OVERBOUGHT")
+    else:
+        ids.append("RSI_NEUTRAL")
+
+    # 가격 위치(볼린저)
+    if last_close <= indicators.bollinger.lower:
+        ids.append("BB_NEAR_LOWER")
+    elif last_close >= indicators.bollinger.upper:
+        ids.append("BB_NEAR_UPPER")
+    else:
+        ids.append("BB_MIDDLE_ZONE")
+
+    return ids
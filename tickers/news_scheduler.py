@@ -2,18 +2,14 @@ import time
 import datetime as dt
 import json
 from sqlalchemy.orm import Session
-from openai import OpenAI
 
 from common.database import SessionLocal
-from common.config import settings
+from common.llm_gateway import chat_completion
 from tickers.ticker_news_entity import TickerNews
 from tickers.tickers_entity import Ticker
 from tickers.tickers_service import _alpha_vantage_get
 
 
-client = OpenAI(api_key=settings.openai_api_key)
-
-
 def summarize_news_batch(news_items: list[dict], ticker: str) -> list[dict]:
 
     if not news_items:
@@ -44,7 +40,8 @@ def summarize_news_batch(news_items: list[dict], ticker: str) -> list[dict]:
 {json.dumps(news_items, ensure_ascii=False)}
 """
 
-    resp = client.chat.completions.create(
+    resp = chat_completion(
+        "news",
         model="gpt-4o-mini",
         temperature=0.2,
         messages=[
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, String, ForeignKey, DateTime
+from sqlalchemy import Column, BigInteger, Integer, String, ForeignKey, DateTime, JSON, Index
 from sqlalchemy.sql import func
 from common.database import Base
 
@@ -13,4 +13,28 @@ class Ticker(Base):
     ticker = Column(String(10), nullable=False)
     company_name = Column(String(200), nullable=False)
 
-    created_at = Column(DateTime, server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime, server_default=func.now())
+
+
+class LlmExplainCache(Base):
+    """
+    explain_snapshot_with_openai 결과 캐시
+    - cache_key: (purpose, 시그널 ID 조합, 구간화한 지표, 프롬프트 버전)의 sha256
+    """
+    __tablename__ = "llm_explain_cache"
+    __table_args__ = (
+        Index("idx_llm_explain_cache_expires_at", "expires_at"),
+    )
+
+    cache_key = Column(String(64), primary_key=True)
+    purpose = Column(String(20), nullable=False)
+    prompt_version = Column(String(20), nullable=False)
+
+    # ExplainResult JSON
+    payload = Column(JSON, nullable=False)
+
+    hit_count = Column(Integer, nullable=False, server_default="0")
+    last_hit_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
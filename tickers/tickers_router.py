@@ -5,11 +5,14 @@ from typing import Literal
 from common.database import get_db
 from tickers.tickers_schema import (
     QuoteResponse,
+    TechnicalSummaryBatchRequest,
+    TechnicalSummaryBatchResponse,
     TechnicalSummaryResponse,
     TickerNewsResponse,
 )
 from tickers.tickers_service import (
     get_quote,
+    get_technical_summaries_with_llm,
     get_technical_summary_with_llm,
 )
 from tickers.ticker_news_service import get_ticker_news
@@ -26,8 +29,17 @@ def get_ticker_quote(ticker: str, db: Session = Depends(get_db)):
 def get_ticker_technical_summary(
     ticker: str,
     range: Literal["3M", "6M", "1Y"] = Query("3M"),
+    db: Session = Depends(get_db),
 ):
-    return get_technical_summary_with_llm(ticker, rng=range)
+    return get_technical_summary_with_llm(ticker, rng=range, db=db)
+
+
+@router.post("/technical-summary/batch", response_model=TechnicalSummaryBatchResponse)
+def get_tickers_technical_summary_batch(
+    req: TechnicalSummaryBatchRequest,
+    db: Session = Depends(get_db),
+):
+    return get_technical_summaries_with_llm(db, req.tickers, rng=req.range)
 
 
 @router.get("/{ticker}/news", response_model=TickerNewsResponse)
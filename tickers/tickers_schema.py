@@ -95,6 +95,22 @@ class TechnicalSummaryResponse(BaseModel):
     signals: List[SignalItem] = Field(default_factory=list)
     summaryText: Optional[str] = None
 
+
+class TechnicalSummaryBatchRequest(BaseModel):
+    tickers: List[str] = Field(..., min_length=1, max_length=50)
+    range: Literal["3M", "6M", "1Y"] = "3M"
+
+
+class TechnicalSummaryBatchError(BaseModel):
+    ticker: str
+    message: str
+
+
+class TechnicalSummaryBatchResponse(BaseModel):
+    range: str
+    items: List[TechnicalSummaryResponse] = Field(default_factory=list)
+    errors: List[TechnicalSummaryBatchError] = Field(default_factory=list)
+
 # -------------------------
 # News
 # -------------------------
@@ -1,26 +1,40 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 
-import pandas as pd
 import requests
 from sqlalchemy.orm import Session
-import yfinance as yf
 
 from common.config import settings
+from marketdata.bar_file_store import BarArrays
+from marketdata.daily_bar_service import load_daily_bar_arrays, load_daily_bar_arrays_batch
 from marketdata.marketdata_service import get_cached_quote_fields
 from tickers.gpt_interpreter import explain_snapshot_with_openai
+from tickers.indicator_engine import (
+    NOT_ENOUGH_DATA_MESSAGE,
+    latest_indicators,
+    latest_indicators_batch,
+    make_signal_ids,
+)
 from tickers.tickers_schema import (
-    BollingerBands,
     QuoteResponse,
-    TechnicalIndicators,
     TechnicalSnapshot,
+    TechnicalSummaryBatchError,
+    TechnicalSummaryBatchResponse,
     TechnicalSummaryResponse,
 )
 from trades.trades_entity import Asset
 
 
+TECH_SUMMARY_LLM_CONCURRENCY = 4  # 다종목 technical-summary에서 동시에 보내는 OpenAI 요청 수
+
+_tech_summary_executor = ThreadPoolExecutor(
+    max_workers=TECH_SUMMARY_LLM_CONCURRENCY, thread_name_prefix="tech-summary-llm"
+)
+
+
 # =========================
 # AlphaVantage 공통 유틸
 # =========================
@@ -65,107 +79,11 @@ def _safe_float(v: Any) -> Optional[float]:
 # =========================
 
 
-def _fetch_daily_series_yf(ticker: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
-    df = yf.download(
-        ticker,
-        start=start_date.strftime("%Y-%m-%d"),
-        end=end_date.strftime("%Y-%m-%d"),
-        interval="1d",
-        auto_adjust=False,
-        progress=False,
-    )
-
-    if df is None or df.empty:
-        raise ValueError("yfinance에서 가격 데이터를 가져오지 못했습니다.")
-
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = [col[0] for col in df.columns]
-
-    if "Close" not in df.columns:
-        raise ValueError("yfinance 응답에 Close 컬럼이 없습니다.")
-
-    out = df[["Close"]].copy()
-    out = out.rename(columns={"Close": "close"})
-    out.index = pd.to_datetime(out.index)
-    out = out.sort_index()
-
-    if out.empty:
-        raise ValueError("유효한 종가 데이터가 없습니다.")
-
-    return out
-
-
-# =========================
-# 기술지표 계산
-# =========================
-
-def _calc_rsi(close: pd.Series, period: int = 14) -> pd.Series:
-    delta = close.diff()
-    gain = delta.clip(lower=0)
-    loss = (-delta).clip(lower=0)
-
-    avg_gain = gain.rolling(period).mean()
-    avg_loss = loss.rolling(period).mean()
-
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
-
-
-def _calc_indicators(df: pd.DataFrame) -> Tuple[pd.DataFrame, TechnicalIndicators]:
-    out = df.copy()
-    out["sma20"] = out["close"].rolling(20).mean()
-    out["sma50"] = out["close"].rolling(50).mean()
-    out["rsi14"] = _calc_rsi(out["close"], 14)
-
-    mid = out["close"].rolling(20).mean()
-    std = out["close"].rolling(20).std()
-    out["bb_mid"] = mid
-    out["bb_upper"] = mid + 2 * std
-    out["bb_lower"] = mid - 2 * std
-
-    out = out.dropna()
-    if out.empty:
-        raise ValueError("지표 계산을 위한 데이터가 부족합니다(최소 50거래일 이상 필요).")
-
-    last = out.iloc[-1]
-    indicators = TechnicalIndicators(
-        sma20=float(last["sma20"]),
-        sma50=float(last["sma50"]),
-        rsi14=float(last["rsi14"]),
-        bollinger=BollingerBands(
-            upper=float(last["bb_upper"]),
-            middle=float(last["bb_mid"]),
-            lower=float(last["bb_lower"]),
-        ),
-    )
-    return out, indicators
-
-
-def _make_signal_ids(df_calc: pd.DataFrame, indicators: TechnicalIndicators) -> List[str]:
-    ids: List[str] = []
-
-    # SMA 방향
-    ids.append("SMA_BEARISH" if indicators.sma20 < indicators.sma50 else "SMA_BULLISH")
-
-    # RSI 구간
-    if indicators.rsi14 <= 40:
-        ids.append("RSI_OVERSOLD_NEAR")
-    elif indicators.rsi14 >= 70:
-        ids.append("RSI_OVERBOUGHT")
-    else:
-        ids.append("RSI_NEUTRAL")
-
-    # 가격 위치(볼린저)
-    last_close = float(df_calc.iloc[-1]["close"])
-    if last_close <= indicators.bollinger.lower:
-        ids.append("BB_NEAR_LOWER")
-    elif last_close >= indicators.bollinger.upper:
-        ids.append("BB_NEAR_UPPER")
-    else:
-        ids.append("BB_MIDDLE_ZONE")
-
-    return ids
+def _fetch_daily_bars(db: Session | None, ticker: str, start_date: datetime, end_date: datetime) -> BarArrays:
+    """
+    로컬 일봉 저장소(daily_bars)에서 종가 조회 (빠진 구간만 yfinance로 보충)
+    """
+    return load_daily_bar_arrays(db, ticker, start_date.date(), end_date.date())
 
 
 def _range_to_days(rng: str) -> int:
@@ -185,8 +103,10 @@ def _range_to_days(rng: str) -> int:
 # 1) technical-summary (LLM 포함)
 # =========================
 
-def get_technical_summary_with_llm(ticker: str, rng: str = "3M") -> TechnicalSummaryResponse:
-
+def get_technical_snapshot(ticker: str, rng: str = "3M", db: Session | None = None) -> TechnicalSnapshot:
+    """
+    LLM 호출 없이 지표/시그널 ID만 계산
+    """
     t = ticker.upper().strip()
     rng = (rng or "3M").upper().strip()
 
@@ -195,31 +115,49 @@ def get_technical_summary_with_llm(ticker: str, rng: str = "3M") -> TechnicalSum
 
     days = _range_to_days(rng)
 
-    end_dt = datetime.today() + timedelta(days=1)
+    end_dt = datetime.today()
     start_dt = datetime.today() - timedelta(days=days * 2)
 
-    df = _fetch_daily_series_yf(t, start_dt, end_dt)
+    bars = _fetch_daily_bars(db, t, start_dt, end_dt)
 
-    if df.empty:
+    if len(bars) == 0:
         raise ValueError("해당 range 구간에 데이터가 없습니다.")
 
-    df_calc, indicators = _calc_indicators(df)
-    signal_ids = _make_signal_ids(df_calc, indicators)
+    last_close, indicators = latest_indicators(bars.close)
 
-    resp = TechnicalSummaryResponse(
+    return TechnicalSnapshot(
         ticker=t,
         range=rng,
+        lastClose=last_close,
         indicators=indicators,
+        signalIds=make_signal_ids(last_close, indicators),
+    )
+
+
+def get_technical_summary_with_llm(ticker: str, rng: str = "3M", db: Session | None = None) -> TechnicalSummaryResponse:
+    snapshot = get_technical_snapshot(ticker, rng=rng, db=db)
+
+    resp = TechnicalSummaryResponse(
+        ticker=snapshot.ticker,
+        range=snapshot.range,
+        indicators=snapshot.indicators,
         signals=[],
         summaryText=None,
     )
+    _explain_technical_summary(resp, snapshot.lastClose, snapshot.signalIds)
+    return resp
 
+
+def _explain_technical_summary(resp: TechnicalSummaryResponse, last_close: float, signal_ids: List[str]) -> None:
+    """
+    LLM 해설을 resp에 채움 (실패하면 signals/summaryText 없이 그대로 둠)
+    """
     try:
         snapshot = TechnicalSnapshot(
-            ticker=t,
-            range=rng,
-            lastClose=float(df_calc.iloc[-1]["close"]),
-            indicators=indicators,
+            ticker=resp.ticker,
+            range=resp.range,
+            lastClose=last_close,
+            indicators=resp.indicators,
             signalIds=signal_ids,
         )
         explain = explain_snapshot_with_openai(snapshot, purpose="tech")
@@ -228,7 +166,53 @@ def get_technical_summary_with_llm(ticker: str, rng: str = "3M") -> TechnicalSum
     except Exception:
         pass
 
-    return resp
+
+def get_technical_summaries_with_llm(db: Session, tickers: List[str], rng: str = "3M") -> TechnicalSummaryBatchResponse:
+    """
+    technical-summary 다종목 버전 (관심종목 화면 한 번에 조회)
+    - 일봉은 yf.download 한 번으로 같이 채우고, 지표는 (종목 x 날짜) 행렬로 한 번에 계산
+    - LLM 해설은 _tech_summary_executor에서 최대 TECH_SUMMARY_LLM_CONCURRENCY개씩 동시 호출
+    - 종목별 실패는 errors로 모아 반환 (나머지 종목은 정상 응답)
+    """
+    rng = (rng or "3M").upper().strip()
+    if rng == "1M":
+        raise ValueError("technical-summary는 1M을 지원하지 않습니다. (최소 3M)")
+
+    ts = list(dict.fromkeys(t.upper().strip() for t in tickers if t and t.strip()))
+
+    days = _range_to_days(rng)
+    end_dt = datetime.today()
+    start_dt = datetime.today() - timedelta(days=days * 2)
+
+    out = TechnicalSummaryBatchResponse(range=rng)
+    bars = load_daily_bar_arrays_batch(db, ts, start_dt.date(), end_dt.date())
+
+    for t in ts:
+        if t not in bars:
+            out.errors.append(TechnicalSummaryBatchError(ticker=t, message="가격 데이터를 가져오지 못했습니다."))
+
+    ok = [t for t in ts if t in bars]
+    computed = latest_indicators_batch([bars[t].close for t in ok])
+
+    jobs = []
+    for t, result in zip(ok, computed):
+        if result is None:
+            out.errors.append(TechnicalSummaryBatchError(ticker=t, message=NOT_ENOUGH_DATA_MESSAGE))
+            continue
+
+        last_close, indicators = result
+        resp = TechnicalSummaryResponse(ticker=t, range=rng, indicators=indicators)
+        out.items.append(resp)
+        jobs.append(
+            _tech_summary_executor.submit(
+                _explain_technical_summary, resp, last_close, make_signal_ids(last_close, indicators)
+            )
+        )
+
+    for job in jobs:
+        job.result()
+
+    return out
 
 
 # =========================
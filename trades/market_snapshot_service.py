@@ -2,20 +2,20 @@ from __future__ import annotations
 
 import time
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple, Literal
+from typing import Any, Dict, List, Optional, Literal
 
-import yfinance as yf
-import pandas as pd
 import requests
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from common.config import settings
+from marketdata.bar_file_store import BarArrays
+from marketdata.daily_bar_service import load_daily_bar_arrays
 from tickers.gpt_interpreter import explain_snapshot_with_openai
 from tickers.ticker_news_entity import TickerNews
 from tickers.tickers_entity import Ticker
-from tickers.tickers_schema import BollingerBands, TechnicalIndicators, TechnicalSnapshot
-from tickers.tickers_service import _make_signal_ids
+from tickers.indicator_engine import latest_indicators, make_signal_ids
+from tickers.tickers_schema import TechnicalSnapshot
 from trades.market_snapshot_schema import (
     TradeMarketSnapshotQuantResponse,
     IndicatorsDTO,
@@ -70,10 +70,10 @@ def _safe_float(v: Any) -> Optional[float]:
         return None
 
 
-def _fetch_daily_series_yf(ticker: str, trade_day: date, rng: str) -> pd.DataFrame:
+def _fetch_daily_bars(db: Session, ticker: str, trade_day: date, rng: str) -> BarArrays:
     """
-    yfinance로 일봉 종가 데이터 조회
-    - trade_day 이전 데이터까지만 사용하기 위해 end는 trade_day + 1일
+    로컬 일봉 저장소(daily_bars)에서 종가 조회 (빠진 구간만 yfinance로 보충)
+    - trade_day 이전 데이터까지만 사용 (mmap 배열 view, 복사 없음)
     - 지표 계산 여유분 확보 위해 range보다 넉넉하게 조회
     """
     rng = (rng or "3M").upper().strip()
@@ -88,36 +88,10 @@ def _fetch_daily_series_yf(ticker: str, trade_day: date, rng: str) -> pd.DataFra
         lookback_days = 120
 
     start_day = trade_day - timedelta(days=lookback_days)
-    end_day = trade_day + timedelta(days=1)
-
-    df = yf.download(
-        ticker,
-        start=start_day.strftime("%Y-%m-%d"),
-        end=end_day.strftime("%Y-%m-%d"),
-        interval="1d",
-        auto_adjust=False,
-        progress=False,
-    )
-
-    if df is None or df.empty:
-        raise ValueError("yfinance에서 가격 데이터를 가져오지 못했습니다.")
-
-    # MultiIndex 방어
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = [col[0] for col in df.columns]
-
-    if "Close" not in df.columns:
-        raise ValueError("yfinance 응답에 Close 컬럼이 없습니다.")
-
-    out = df[["Close"]].copy()
-    out = out.rename(columns={"Close": "close"})
-    out.index = pd.to_datetime(out.index)
-    out = out.sort_index()
 
-    # trade_day 이후 데이터 제거
-    out = out[out.index.date <= trade_day]
+    out = load_daily_bar_arrays(db, ticker, start_day, trade_day)
 
-    if out.empty:
+    if len(out) == 0:
         raise ValueError("거래일 이전 가격 데이터가 없습니다.")
 
     return out
@@ -142,51 +116,6 @@ def _convert_signals(raw_signals: List[Any]) -> List[SignalItem]:
     return items
 
 
-# 지표 계산(기존 tickers_service와 동일 로직)
-
-def _calc_rsi(close: pd.Series, period: int = 14) -> pd.Series:
-    delta = close.diff()
-    gain = delta.clip(lower=0)
-    loss = (-delta).clip(lower=0)
-
-    avg_gain = gain.rolling(period).mean()
-    avg_loss = loss.rolling(period).mean()
-
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
-
-
-def _calc_indicators(df: pd.DataFrame) -> Tuple[pd.DataFrame, TechnicalIndicators]:
-    out = df.copy()
-    out["sma20"] = out["close"].rolling(20).mean()
-    out["sma50"] = out["close"].rolling(50).mean()
-    out["rsi14"] = _calc_rsi(out["close"], 14)
-
-    mid = out["close"].rolling(20).mean()
-    std = out["close"].rolling(20).std()
-    out["bb_mid"] = mid
-    out["bb_upper"] = mid + 2 * std
-    out["bb_lower"] = mid - 2 * std
-
-    out = out.dropna()
-    if out.empty:
-        raise ValueError("지표 계산을 위한 데이터가 부족합니다(최소 50거래일 이상 필요).")
-
-    last = out.iloc[-1]
-    indicators = TechnicalIndicators(
-        sma20=float(last["sma20"]),
-        sma50=float(last["sma50"]),
-        rsi14=float(last["rsi14"]),
-        bollinger=BollingerBands(
-            upper=float(last["bb_upper"]),
-            middle=float(last["bb_mid"]),
-            lower=float(last["bb_lower"]),
-        ),
-    )
-    return out, indicators
-
-
 def _range_to_days(rng: QuantRange) -> int:
     if rng == "3M":
         return 93
@@ -240,17 +169,17 @@ def build_quant_snapshot_for_trade(db: Session, trade: Trade, rng: str) -> Trade
     trade_day: date = trade.trade_date
     rng = (rng or "3M").upper().strip()
 
-    df = _fetch_daily_series_yf(ticker, trade_day, rng)
+    bars = _fetch_daily_bars(db, ticker, trade_day, rng)
 
     # 차트용 series
     price_series = [
-        PricePoint(date=idx.strftime("%Y-%m-%d"), close=float(row["close"]))
-        for idx, row in df.iterrows()
+        PricePoint(date=d, close=c)
+        for d, c in zip(bars.dates.astype(str).tolist(), bars.close.tolist())
     ]
 
     # 기술지표 계산
-    df_calc, indicators = _calc_indicators(df)
-    signal_ids = _make_signal_ids(df_calc, indicators)
+    last_close, indicators = latest_indicators(bars.close)
+    signal_ids = make_signal_ids(last_close, indicators)
 
     signals: List[SignalItem] = []
     summary_text: str | None = None
@@ -259,7 +188,7 @@ def build_quant_snapshot_for_trade(db: Session, trade: Trade, rng: str) -> Trade
         snapshot = TechnicalSnapshot(
             ticker=ticker,
             range=rng,
-            lastClose=float(df_calc.iloc[-1]["close"]),
+            lastClose=last_close,
             indicators=indicators,
             signalIds=signal_ids,
         )
@@ -0,0 +1,56 @@
+"""
+trade_positions 상태 컬럼(quantity, buy_quantity, cost_basis, avg_price, realized_pnl) 백필
+- 컬럼 추가 이전에 만들어진 DB에서 한 번 실행: python -m trades.position_state_backfill
+- 컬럼이 없으면 추가한 뒤, trades 집계로 전체 포지션을 한 번에 갱신 (여러 번 실행해도 결과 동일)
+"""
+from sqlalchemy import text
+
+from common.database import SessionLocal
+
+ADD_COLUMNS_SQL = """
+ALTER TABLE public.trade_positions
+    ADD COLUMN IF NOT EXISTS quantity integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS buy_quantity integer DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS cost_basis numeric(20,4) DEFAULT 0 NOT NULL,
+    ADD COLUMN IF NOT EXISTS avg_price numeric(18,8),
+    ADD COLUMN IF NOT EXISTS realized_pnl numeric(18,4)
+"""
+
+BACKFILL_SQL = """
+UPDATE trade_positions p
+SET quantity = s.buy_qty - s.sell_qty,
+    buy_quantity = s.buy_qty,
+    cost_basis = s.buy_cost,
+    avg_price = CASE WHEN s.buy_qty > 0 THEN s.buy_cost / s.buy_qty END,
+    realized_pnl = s.realized
+FROM (
+    SELECT
+        t.position_id,
+        COALESCE(SUM(t.quantity) FILTER (WHERE t.trade_type = 'BUY'), 0) AS buy_qty,
+        COALESCE(SUM(t.quantity) FILTER (WHERE t.trade_type = 'SELL'), 0) AS sell_qty,
+        COALESCE(SUM(t.price * t.quantity) FILTER (WHERE t.trade_type = 'BUY'), 0) AS buy_cost,
+        SUM(r.pnl_amount) FILTER (WHERE t.trade_type = 'SELL') AS realized
+    FROM trades t
+    LEFT JOIN trade_results r ON r.trade_id = t.id
+    GROUP BY t.position_id
+) s
+WHERE s.position_id = p.id
+"""
+
+
+def backfill_position_states() -> int:
+    db = SessionLocal()
+    try:
+        db.execute(text(ADD_COLUMNS_SQL))
+        updated = db.execute(text(BACKFILL_SQL)).rowcount
+        db.commit()
+        return updated
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print(f"[position_state_backfill] updated positions={backfill_position_states()}")
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import csv
+import io
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from typing import BinaryIO, Dict, List, Optional
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from common.config import settings
+from trades.trade_ledger import record_trades_created_bulk
+from trades.trades_entity import Trade, TradePosition, TradeResult, BUY_BEHAVIOR_TYPES, SELL_BEHAVIOR_TYPES
+from trades.trades_repository import (
+    ensure_assets,
+    get_last_trade_dates,
+    list_open_positions_for_update,
+    allocate_ids,
+    bulk_insert,
+    position_avg_price,
+    round_pnl_amount,
+    refresh_trade_stats,
+)
+from trades.trades_schema import TradeCreateRequest, TradeImportError, TradeImportResponse
+
+TRADE_IMPORT_MAX_ROWS = 10000  # 한 번에 가져올 수 있는 최대 거래 수
+TRADE_IMPORT_MAX_ERRORS = 50  # 400 응답에 담는 최대 오류 행 수
+TRADE_IMPORT_MAX_BYTES = 5 * 1024 * 1024  # CSV 업로드 최대 크기 (초과 시 413)
+CSV_COLUMNS = ("ticker", "tradeType", "tradeDate", "price", "quantity", "confidence", "behaviorType", "memo")
+
+
+@dataclass
+class _PositionState:
+    """
+    가져오기 중 메모리에서 계산하는 포지션 상태 (trade_positions 상태 컬럼과 같은 의미)
+    """
+    id: int
+    ticker: str
+    is_new: bool
+    status: str = "OPEN"
+    quantity: int = 0
+    buy_quantity: int = 0
+    cost_basis: Decimal = Decimal("0")
+    realized_pnl: Optional[Decimal] = None
+    opened_at: Optional[datetime] = None
+    closed_at: Optional[datetime] = None
+    avg_price: Optional[Decimal] = None
+
+    def apply_buy(self, price: Decimal, quantity: int) -> None:
+        self.quantity += quantity
+        self.buy_quantity += quantity
+        self.cost_basis += price * Decimal(quantity)
+        self.avg_price = self.cost_basis / Decimal(self.buy_quantity)
+
+
+def _trade_datetime(d: date) -> datetime:
+    return datetime.combine(d, time.min, tzinfo=timezone.utc)
+
+
+def read_trade_csv(file: BinaryIO) -> bytes:
+    """
+    업로드 CSV를 최대 TRADE_IMPORT_MAX_BYTES까지만 읽음 (초과하면 413)
+    """
+    content = file.read(TRADE_IMPORT_MAX_BYTES + 1)
+    if len(content) > TRADE_IMPORT_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"CSV too large (max {TRADE_IMPORT_MAX_BYTES} bytes)")
+    return content
+
+
+def parse_trade_csv(content: bytes) -> List[TradeCreateRequest]:
+    """
+    CSV(헤더: ticker,tradeType,tradeDate,price,quantity,confidence,behaviorType,memo) -> 요청 목록
+    - 형식 오류가 있는 행은 모아서 400
+    """
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+
+    reader = csv.DictReader(io.StringIO(text))
+    missing = [c for c in CSV_COLUMNS if c not in (reader.fieldnames or []) and c not in ("confidence", "memo")]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Missing CSV columns: {', '.join(missing)}")
+
+    trades: List[TradeCreateRequest] = []
+    errors: List[TradeImportError] = []
+    for i, row in enumerate(reader):
+        values = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items() if k in CSV_COLUMNS}
+        values = {k: v for k, v in values.items() if v not in (None, "")}
+        try:
+            trades.append(TradeCreateRequest(**values))
+        except ValidationError as e:
+            errors.append(TradeImportError(row=i, error=e.errors()[0].get("msg", "Invalid row")))
+        if len(trades) + len(errors) > TRADE_IMPORT_MAX_ROWS:
+            raise HTTPException(status_code=400, detail=f"Too many rows (max {TRADE_IMPORT_MAX_ROWS})")
+
+    if errors:
+        _raise_import_errors(errors)
+    return trades
+
+
+def _raise_import_errors(errors: List[TradeImportError]):
+    raise HTTPException(
+        status_code=400,
+        detail=[e.model_dump() for e in errors[:TRADE_IMPORT_MAX_ERRORS]],
+    )
+
+
+def import_trades(db: Session, user_id: int, reqs: List[TradeCreateRequest]) -> TradeImportResponse:
+    """
+    거래 일괄 가져오기 (전부 성공하거나 전부 실패)
+    1) behaviorType/tradeType 검증을 한 번에 수행
+    2) ticker, tradeDate 순으로 정렬해 포지션/PnL을 메모리에서 계산 (기존 OPEN 포지션 상태에 이어서)
+       - 기존 OPEN 포지션의 마지막 거래일보다 이전 날짜의 행은 400 (포지션 이력 중간에 끼워 넣지 않음)
+    3) positions / trades / trade_results / trade_events를 multi-row INSERT, 트랜잭션 1회
+    """
+    if not reqs:
+        raise HTTPException(status_code=400, detail="No trades to import")
+    if len(reqs) > TRADE_IMPORT_MAX_ROWS:
+        raise HTTPException(status_code=400, detail=f"Too many rows (max {TRADE_IMPORT_MAX_ROWS})")
+
+    # 1) 검증
+    errors: List[TradeImportError] = []
+    for i, req in enumerate(reqs):
+        allowed = BUY_BEHAVIOR_TYPES if req.tradeType == "BUY" else SELL_BEHAVIOR_TYPES
+        if req.behaviorType not in allowed:
+            errors.append(TradeImportError(row=i, error=f"Invalid behaviorType for {req.tradeType}"))
+    if errors:
+        _raise_import_errors(errors)
+
+    # 2) 정렬 (같은 날짜는 입력 순서 유지)
+    order = sorted(range(len(reqs)), key=lambda i: (reqs[i].ticker.upper().strip(), reqs[i].tradeDate, i))
+    tickers = sorted({reqs[i].ticker.upper().strip() for i in order})
+
+    try:
+        ensure_assets(db, tickers)
+
+        existing = {p.ticker: p for p in list_open_positions_for_update(db, user_id, tickers)}
+
+        last_dates = get_last_trade_dates(db, [p.id for p in existing.values()])
+        for i in order:
+            p = existing.get(reqs[i].ticker.upper().strip())
+            last_date = last_dates.get(int(p.id)) if p is not None else None
+            if last_date is not None and reqs[i].tradeDate < last_date:
+                errors.append(
+                    TradeImportError(row=i, error=f"tradeDate is before the open position's last trade ({last_date})")
+                )
+        if errors:
+            _raise_import_errors(sorted(errors, key=lambda e: e.row))
+
+        open_states: Dict[str, _PositionState] = {
+            t: _PositionState(
+                id=int(p.id),
+                ticker=t,
+                is_new=False,
+                quantity=int(p.quantity),
+                buy_quantity=int(p.buy_quantity),
+                cost_basis=Decimal(str(p.cost_basis)),
+                realized_pnl=Decimal(str(p.realized_pnl)) if p.realized_pnl is not None else None,
+                avg_price=position_avg_price(p),
+            )
+            for t, p in existing.items()
+        }
+        touched: List[_PositionState] = list(open_states.values())
+
+        trade_ids = allocate_ids(db, "trades_id_seq", len(reqs))
+        trade_rows: List[dict] = []
+        result_rows: List[dict] = []
+        new_states: List[_PositionState] = []
+
+        for n, i in enumerate(order):
+            req = reqs[i]
+            ticker = req.ticker.upper().strip()
+            state = open_states.get(ticker)
+            trade_id = trade_ids[n]
+            pnl_amount = None
+            pnl_rate = None
+
+            if req.tradeType == "BUY":
+                if state is None:
+                    # id는 positions INSERT 직전에 할당 (임시로 음수 번호)
+                    state = _PositionState(id=-(len(new_states) + 1), ticker=ticker, is_new=True)
+                    state.opened_at = _trade_datetime(req.tradeDate)
+                    new_states.append(state)
+                    touched.append(state)
+                    open_states[ticker] = state
+                position_action = "ENTRY" if state.quantity <= 0 else "ADD"
+                state.apply_buy(req.price, req.quantity)
+                pnl_status = "OPEN"
+            else:
+                if state is None or state.quantity <= 0:
+                    errors.append(TradeImportError(row=i, error="No open position to sell"))
+                    continue
+                if req.quantity > state.quantity:
+                    errors.append(TradeImportError(row=i, error="Sell quantity exceeds holding quantity"))
+                    continue
+
+                if state.avg_price is not None and state.avg_price != 0:
+                    pnl_amount = round_pnl_amount((req.price - state.avg_price) * Decimal(req.quantity))
+                    pnl_rate = (req.price - state.avg_price) / state.avg_price
+                    state.realized_pnl = (state.realized_pnl or Decimal("0")) + pnl_amount
+
+                state.quantity -= req.quantity
+                position_action = "EXIT" if state.quantity == 0 else "PARTIAL_EXIT"
+                pnl_status = "CLOSED" if position_action == "EXIT" else "OPEN"
+                if position_action == "EXIT":
+                    state.status = "CLOSED"
+                    state.closed_at = _trade_datetime(req.tradeDate)
+                    del open_states[ticker]
+
+            trade_rows.append(
+                {
+                    "id": trade_id,
+                    "user_id": user_id,
+                    "ticker": ticker,
+                    "position_id": state,  # 아래에서 실제 position id로 치환
+                    "trade_type": req.tradeType,
+                    "trade_date": req.tradeDate,
+                    "price": req.price,
+                    "quantity": req.quantity,
+                    "confidence": req.confidence,
+                    "behavior_type": req.behaviorType,
+                    "memo": req.memo,
+                    "position_action": position_action,
+                }
+            )
+            result_rows.append(
+                {
+                    "trade_id": trade_id,
+                    "pnl_status": pnl_status,
+                    "pnl_amount": pnl_amount,
+                    "pnl_rate": pnl_rate,
+                    "closed_at": datetime.combine(req.tradeDate, time.min) if pnl_status == "CLOSED" else None,
+                }
+            )
+
+        if errors:
+            _raise_import_errors(errors)
+
+        # 3) 쓰기
+        for state, position_id in zip(new_states, allocate_ids(db, "trade_positions_id_seq", len(new_states))):
+            state.id = int(position_id)
+
+        # 가져온 과거 거래는 생성 시각 대신 거래일을 포지션 시작/종료 시각으로 사용 (목록 정렬이 거래 순서를 따르도록)
+        bulk_insert(
+            db,
+            TradePosition,
+            [
+                {
+                    "id": s.id,
+                    "user_id": user_id,
+                    "ticker": s.ticker,
+                    "status": s.status,
+                    "opened_at": s.opened_at,
+                    "closed_at": s.closed_at,
+                    "quantity": s.quantity,
+                    "buy_quantity": s.buy_quantity,
+                    "cost_basis": s.cost_basis,
+                    "avg_price": s.avg_price,
+                    "realized_pnl": s.realized_pnl,
+                }
+                for s in new_states
+            ],
+        )
+
+        for s in touched:
+            if s.is_new:
+                continue
+            p = existing[s.ticker]
+            p.quantity = s.quantity
+            p.buy_quantity = s.buy_quantity
+            p.cost_basis = s.cost_basis
+            p.avg_price = s.avg_price
+            p.realized_pnl = s.realized_pnl
+            if s.status == "CLOSED":
+                p.status = "CLOSED"
+                p.closed_at = s.closed_at
+        db.flush()
+
+        for row in trade_rows:
+            row["position_id"] = row["position_id"].id
+        bulk_insert(db, Trade, trade_rows)
+        bulk_insert(db, TradeResult, result_rows)
+        record_trades_created_bulk(db, trade_rows, result_rows)
+
+        if settings.trade_stats_rollup_enabled:
+            refresh_trade_stats(db, user_id)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return TradeImportResponse(
+        status="IMPORTED",
+        imported=len(trade_rows),
+        positionsOpened=len(new_states),
+        positionsClosed=sum(1 for s in touched if s.status == "CLOSED"),
+    )
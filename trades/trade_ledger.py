@@ -0,0 +1,357 @@
+"""
+매매 원장(trade_events)과 projection
+- 거래 생성/삭제 시 원장에 이벤트를 추가하고 projection을 증분 갱신
+  - trade_positions 상태 컬럼 / trade_stats / realized_pnl_daily
+- projection이 어긋나면 원장 전체를 한 번 스트리밍하며 재구축
+  - python -m trades.trade_ledger backfill   # 원장 도입 이전 거래를 원장에 채움 (최초 1회)
+  - python -m trades.trade_ledger rebuild [user_id]
+"""
+from __future__ import annotations
+
+import sys
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from common.config import settings
+from common.database import SessionLocal
+from trades.trades_entity import RealizedPnlDaily, Trade, TradeEvent, TradePosition, TradeResult, TradeStats
+from trades.trades_repository import (
+    apply_trade_to_position,
+    apply_trade_to_stats,
+    bulk_insert,
+)
+
+EVENT_CREATED = "CREATED"
+EVENT_DELETED = "DELETED"
+LEDGER_STREAM_BATCH_SIZE = 5000  # rebuild 시 한 번에 가져오는 이벤트 수 (서버 사이드 커서)
+
+_EVENT_FIELDS = (
+    "user_id", "trade_id", "position_id", "ticker", "trade_type", "trade_date",
+    "price", "quantity", "confidence", "position_action",
+)
+
+BACKFILL_SQL = """
+INSERT INTO trade_events (
+    user_id, trade_id, position_id, event_type, ticker, trade_type, trade_date,
+    price, quantity, confidence, position_action, pnl_amount, pnl_rate, created_at
+)
+SELECT
+    t.user_id, t.id, t.position_id, 'CREATED', t.ticker, t.trade_type, t.trade_date,
+    t.price, t.quantity, t.confidence, t.position_action, r.pnl_amount, r.pnl_rate, t.created_at
+FROM trades t
+LEFT JOIN trade_results r ON r.trade_id = t.id
+WHERE NOT EXISTS (SELECT 1 FROM trade_events e WHERE e.trade_id = t.id)
+ORDER BY t.id
+"""
+
+
+ADD_COLUMNS_SQL = """
+ALTER TABLE public.realized_pnl_daily
+    ADD COLUMN IF NOT EXISTS cost_basis numeric(20,4) DEFAULT 0 NOT NULL
+"""
+
+
+def _trade_event(event_type: str, trade: Trade, pnl_amount, pnl_rate) -> dict:
+    return {
+        "user_id": trade.user_id,
+        "trade_id": trade.id,
+        "position_id": trade.position_id,
+        "event_type": event_type,
+        "ticker": trade.ticker,
+        "trade_type": trade.trade_type,
+        "trade_date": trade.trade_date,
+        "price": trade.price,
+        "quantity": trade.quantity,
+        "confidence": trade.confidence,
+        "position_action": trade.position_action,
+        "pnl_amount": pnl_amount,
+        "pnl_rate": pnl_rate,
+    }
+
+
+# ---------- realized_pnl_daily projection ----------
+
+def _daily_deltas(events: Iterable[dict]) -> List[dict]:
+    """
+    이벤트 -> (user_id, trade_date)별 증감 (같은 키가 한 INSERT에 두 번 들어가지 않도록 합산)
+    """
+    acc: Dict[Tuple[int, date], List] = {}
+    for e in events:
+        if e["trade_type"] != "SELL" or e["pnl_amount"] is None:
+            continue
+        sign = 1 if e["event_type"] == EVENT_CREATED else -1
+        pnl = Decimal(str(e["pnl_amount"]))
+        rate = Decimal(str(e["pnl_rate"])) if e.get("pnl_rate") is not None else Decimal("0")
+        row = acc.setdefault((e["user_id"], e["trade_date"]), [Decimal("0"), 0, 0, Decimal("0")])
+        row[0] += sign * pnl
+        row[1] += sign
+        row[2] += sign if pnl > 0 else 0
+        row[3] += sign * (pnl / rate) if rate != 0 else 0  # 매도분 매입원가 (월별 수익률 분모)
+
+    return [
+        {
+            "user_id": u,
+            "trade_date": d,
+            "realized_pnl": pnl,
+            "sell_count": n,
+            "win_count": w,
+            "cost_basis": round(cost, 4),
+        }
+        for (u, d), (pnl, n, w, cost) in acc.items()
+    ]
+
+
+def _apply_daily_deltas(db: Session, events: Iterable[dict]) -> None:
+    rows = _daily_deltas(events)
+    if not rows:
+        return
+    stmt = insert(RealizedPnlDaily).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "trade_date"],
+        set_={
+            "realized_pnl": RealizedPnlDaily.realized_pnl + stmt.excluded.realized_pnl,
+            "sell_count": RealizedPnlDaily.sell_count + stmt.excluded.sell_count,
+            "win_count": RealizedPnlDaily.win_count + stmt.excluded.win_count,
+            "cost_basis": RealizedPnlDaily.cost_basis + stmt.excluded.cost_basis,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+
+
+# ---------- 증분 기록 ----------
+
+def record_trade_created(
+    db: Session,
+    trade: Trade,
+    position: TradePosition,
+    pnl_amount: Optional[Decimal] = None,
+    pnl_rate: Optional[Decimal] = None,
+) -> None:
+    """
+    거래 생성 이벤트 기록 + projection 반영 (trade/trade_result가 flush된 뒤 호출)
+    """
+    event = _trade_event(EVENT_CREATED, trade, pnl_amount, pnl_rate)
+    db.execute(insert(TradeEvent).values(event))
+
+    apply_trade_to_position(db, position, trade.trade_type, trade.price, trade.quantity, pnl_amount)
+    if settings.trade_stats_rollup_enabled:
+        apply_trade_to_stats(db, trade, pnl_rate)
+    _apply_daily_deltas(db, [event])
+
+
+def record_trades_created_bulk(db: Session, trade_rows: List[dict], result_rows: List[dict]) -> None:
+    """
+    일괄 가져오기용: 생성 이벤트를 multi-row INSERT + realized_pnl_daily 반영
+    - 포지션 상태/trade_stats는 가져오기에서 한 번에 계산하므로 여기서는 다루지 않음
+    """
+    results = {r["trade_id"]: r for r in result_rows}
+    events = [
+        {
+            **{f: row[f] if f != "trade_id" else row["id"] for f in _EVENT_FIELDS},
+            "event_type": EVENT_CREATED,
+            "pnl_amount": results[row["id"]]["pnl_amount"],
+            "pnl_rate": results[row["id"]]["pnl_rate"],
+        }
+        for row in trade_rows
+    ]
+    bulk_insert(db, TradeEvent, events)
+    _apply_daily_deltas(db, events)
+
+
+def record_trade_deleted(db: Session, trade: Trade) -> None:
+    """
+    거래 삭제 이벤트 기록 + realized_pnl_daily 되돌림 (trade_result를 지우기 전에 호출)
+    - 포지션 상태/trade_stats는 삭제 후 호출부에서 재집계 (최고 수익률 등은 되돌릴 수 없음)
+    - 원장 도입 이전 거래(backfill 전)는 CREATED 이벤트가 없으므로 보정용 CREATED를 먼저 기록
+      - 이 거래는 realized_pnl_daily에 반영된 적이 없으므로 되돌리지 않음
+    """
+    # trade.result를 로드하면 이후 거래 삭제 cascade와 겹치므로 컬럼만 조회
+    result = db.execute(
+        select(TradeResult.pnl_amount, TradeResult.pnl_rate).where(TradeResult.trade_id == trade.id)
+    ).first()
+    pnl_amount = result.pnl_amount if result is not None else None
+    pnl_rate = result.pnl_rate if result is not None else None
+
+    created = db.execute(
+        select(TradeEvent.id)
+        .where(TradeEvent.trade_id == trade.id, TradeEvent.event_type == EVENT_CREATED)
+        .limit(1)
+    ).first()
+    if created is None:
+        db.execute(
+            insert(TradeEvent).values(
+                {**_trade_event(EVENT_CREATED, trade, pnl_amount, pnl_rate), "created_at": trade.created_at}
+            )
+        )
+
+    event = _trade_event(EVENT_DELETED, trade, pnl_amount, pnl_rate)
+    db.execute(insert(TradeEvent).values(event))
+    if created is not None:
+        _apply_daily_deltas(db, [event])
+
+
+# ---------- 재구축 ----------
+
+def ensure_ledger_columns(db: Session) -> None:
+    """
+    이후에 추가된 projection 컬럼 (이미 있으면 그대로, 값은 rebuild에서 채움)
+    """
+    db.execute(text(ADD_COLUMNS_SQL))
+    db.commit()
+
+
+def backfill_ledger(db: Session) -> int:
+    """
+    원장에 없는 거래를 CREATED 이벤트로 추가 (원장 도입 이전 데이터, 여러 번 실행해도 중복 없음)
+    """
+    inserted = db.execute(text(BACKFILL_SQL)).rowcount
+    db.commit()
+    return inserted
+
+
+def rebuild_projections(db: Session, user_id: Optional[int] = None) -> Dict[str, int]:
+    """
+    원장을 id 순서로 한 번 스트리밍하며 projection을 메모리에서 다시 계산한 뒤 교체 (트랜잭션 1회)
+    - trade_positions: 상태 컬럼만 갱신 (status/closed_at은 그대로)
+    - trade_stats / realized_pnl_daily: 대상 사용자 행을 지우고 다시 생성
+    """
+    positions: Dict[int, List] = defaultdict(lambda: [0, 0, Decimal("0"), Decimal("0"), 0])
+    stats: Dict[int, List] = defaultdict(lambda: [0, 0, 0, {}])
+    daily_events: List[dict] = []
+    events = 0
+
+    stmt = select(TradeEvent).order_by(TradeEvent.id)
+    if user_id is not None:
+        stmt = stmt.where(TradeEvent.user_id == user_id)
+
+    created_ids: set[int] = set()  # CREATED가 재생된 trade_id (짝이 없는 DELETED는 무시)
+
+    for e in db.execute(stmt.execution_options(yield_per=LEDGER_STREAM_BATCH_SIZE)).scalars():
+        if e.event_type == EVENT_CREATED:
+            created_ids.add(int(e.trade_id))
+        elif int(e.trade_id) not in created_ids:
+            continue
+        else:
+            created_ids.discard(int(e.trade_id))
+        events += 1
+        sign = 1 if e.event_type == EVENT_CREATED else -1
+        q = int(e.quantity)
+
+        # 포지션 상태: quantity, buy_quantity, cost_basis, realized_pnl, realized 건수
+        p = positions[int(e.position_id)]
+        if e.trade_type == "BUY":
+            p[0] += sign * q
+            p[1] += sign * q
+            p[2] += sign * Decimal(str(e.price)) * q
+        else:
+            p[0] -= sign * q
+            if e.pnl_amount is not None:
+                p[3] += sign * Decimal(str(e.pnl_amount))
+                p[4] += sign
+
+        # 사용자 집계: 거래 수, confidence 합/개수, 남아 있는 EXIT SELL별 pnl_rate
+        s = stats[int(e.user_id)]
+        s[0] += sign
+        if e.confidence is not None:
+            s[1] += sign * int(e.confidence)
+            s[2] += sign
+        if e.trade_type == "SELL" and e.position_action == "EXIT":
+            if sign > 0:
+                s[3][int(e.trade_id)] = e.pnl_rate
+            else:
+                s[3].pop(int(e.trade_id), None)
+
+        if e.trade_type == "SELL" and e.pnl_amount is not None:
+            daily_events.append(
+                {
+                    "user_id": int(e.user_id),
+                    "trade_date": e.trade_date,
+                    "trade_type": e.trade_type,
+                    "event_type": e.event_type,
+                    "pnl_amount": e.pnl_amount,
+                    "pnl_rate": e.pnl_rate,
+                }
+            )
+
+    # trade_positions
+    position_q = select(TradePosition.id)
+    if user_id is not None:
+        position_q = position_q.where(TradePosition.user_id == user_id)
+    existing_ids = set(db.execute(position_q).scalars())
+
+    position_rows = [
+        {
+            "id": pid,
+            "quantity": qty,
+            "buy_quantity": buy_qty,
+            "cost_basis": cost,
+            "avg_price": (cost / Decimal(buy_qty)) if buy_qty > 0 else None,
+            "realized_pnl": realized if realized_n > 0 else None,
+        }
+        for pid, (qty, buy_qty, cost, realized, realized_n) in positions.items()
+        if pid in existing_ids
+    ]
+    if position_rows:
+        db.execute(update(TradePosition), position_rows)
+
+    # trade_stats
+    stats_delete = delete(TradeStats)
+    daily_delete = delete(RealizedPnlDaily)
+    if user_id is not None:
+        stats_delete = stats_delete.where(TradeStats.user_id == user_id)
+        daily_delete = daily_delete.where(RealizedPnlDaily.user_id == user_id)
+
+    db.execute(stats_delete)
+    stats_rows = []
+    for uid, (count, conf_sum, conf_n, exits) in stats.items():
+        rates = [Decimal(str(r)) for r in exits.values() if r is not None]
+        stats_rows.append(
+            {
+                "user_id": uid,
+                "trade_count": count,
+                "confidence_sum": conf_sum,
+                "confidence_count": conf_n,
+                "exit_count": len(exits),
+                "win_count": sum(1 for r in rates if r > 0),
+                "best_return": max(rates) if rates else None,
+            }
+        )
+    bulk_insert(db, TradeStats, stats_rows)
+
+    # realized_pnl_daily
+    db.execute(daily_delete)
+    daily_rows = [r for r in _daily_deltas(daily_events) if r["sell_count"] > 0]
+    bulk_insert(db, RealizedPnlDaily, daily_rows)
+
+    db.commit()
+    return {
+        "events": events,
+        "positions": len(position_rows),
+        "tradeStats": len(stats_rows),
+        "realizedPnlDays": len(daily_rows),
+    }
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    session = SessionLocal()
+    try:
+        if command in ("backfill", "rebuild"):
+            ensure_ledger_columns(session)
+        if command == "backfill":
+            print(f"[trade_ledger] backfill 완료: events={backfill_ledger(session)}")
+        elif command == "rebuild":
+            target = int(sys.argv[2]) if len(sys.argv) > 2 else None
+            print(f"[trade_ledger] rebuild 완료: {rebuild_projections(session, target)}")
+        else:
+            print("usage: python -m trades.trade_ledger backfill | rebuild [user_id]")
+            sys.exit(1)
+    finally:
+        session.close()
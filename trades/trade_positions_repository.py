@@ -1,34 +1,86 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+from datetime import datetime
+from typing import List, Optional, Tuple
 
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import asc, desc
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session, selectinload
 
 from trades.trades_entity import TradePosition, Trade, TradeResult
 
 
+# 포지션 응답(PositionTradeItem)에 필요한 컬럼만 로드 (memo 등 제외)
+_POSITION_TRADE_LOAD = (
+    selectinload(TradePosition.trades)
+    .load_only(
+        Trade.id,
+        Trade.position_id,
+        Trade.trade_date,
+        Trade.trade_type,
+        Trade.position_action,
+        Trade.price,
+        Trade.quantity,
+    )
+    .joinedload(Trade.result)
+    .load_only(TradeResult.pnl_amount, TradeResult.pnl_rate)
+)
+
+
+def _position_sort_key(status: str):
+    """
+    정렬 키 (마지막 id는 동률 정렬 + 커서용)
+    - OPEN: opened_at
+    - CLOSED: closed_at (혹시 NULL이면 opened_at으로 대신), opened_at
+    """
+    if status == "OPEN":
+        return [TradePosition.opened_at, TradePosition.id]
+    return [
+        func.coalesce(TradePosition.closed_at, TradePosition.opened_at),
+        TradePosition.opened_at,
+        TradePosition.id,
+    ]
+
+
+def position_sort_values(p: TradePosition) -> Tuple[List[datetime], int]:
+    """
+    커서에 담을 정렬 키 값 (_position_sort_key와 같은 순서, id 제외)
+    """
+    if p.status == "OPEN":
+        return [p.opened_at], int(p.id)
+    return [p.closed_at or p.opened_at, p.opened_at], int(p.id)
+
+
 def list_positions(
     db: Session,
     user_id: int,
     status: str,
     sort: str = "recent",
+    limit: int | None = None,
+    after: Optional[Tuple[List[datetime], int]] = None,
 ) -> List[TradePosition]:
+    """
+    포지션 목록 + 포지션별 trades(거래일, id 순)/trade_result
+    - 포지션 1회 + trades(selectinload, trade_result는 1:1이라 같은 쿼리에 JOIN) 1회
+      (포지션을 trades와 JOIN하면 포지션 컬럼이 거래 수만큼 반복되므로 분리)
+    - limit이 있으면 limit 건만 / after: 이전 페이지 마지막 포지션의 (정렬 키 값, id) → 그 다음부터
+    """
+    is_recent = (sort or "recent").lower() == "recent"
+    key = _position_sort_key(status)
+
     q = (
         db.query(TradePosition)
-        .options(joinedload(TradePosition.trades).joinedload(Trade.result))
+        .options(_POSITION_TRADE_LOAD)
         .filter(TradePosition.user_id == user_id, TradePosition.status == status)
     )
 
-    is_recent = (sort or "recent").lower() == "recent"
+    if after is not None:
+        values, after_id = after
+        cursor = tuple_(*values, after_id)
+        q = q.filter(tuple_(*key) < cursor if is_recent else tuple_(*key) > cursor)
 
-    if status == "OPEN":
-        q = q.order_by(desc(TradePosition.opened_at) if is_recent else asc(TradePosition.opened_at))
-    else:
-        # CLOSED는 closed_at이 항상 있다고 가정하지만, 혹시 NULL이면 opened_at으로 보조 정렬
-        q = q.order_by(
-            desc(TradePosition.closed_at) if is_recent else asc(TradePosition.closed_at),
-            desc(TradePosition.opened_at) if is_recent else asc(TradePosition.opened_at),
-        )
-
-    return q.all()
\ No newline at end of file
+    q = q.order_by(*[c.desc() if is_recent else c.asc() for c in key])
+
+    if limit is not None:
+        q = q.limit(limit)
+
+    return q.all()
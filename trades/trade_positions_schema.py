@@ -55,4 +55,5 @@ class ClosedPositionItem(BaseModel):
 class TradePositionsResponse(BaseModel):
     status: Literal["OPEN", "CLOSED"]
     openPositions: List[OpenPositionItem] = Field(default_factory=list)
-    closedPositions: List[ClosedPositionItem] = Field(default_factory=list)
\ No newline at end of file
+    closedPositions: List[ClosedPositionItem] = Field(default_factory=list)
+    nextCursor: Optional[str] = None  # limit 지정 시 다음 페이지 커서 (마지막 페이지면 null)
\ No newline at end of file
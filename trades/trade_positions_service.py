@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import base64
+import json
+from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
-from marketdata.marketdata_service import get_cached_quote_fields
+from marketdata.marketdata_service import get_cached_quotes
 from trades.trades_entity import Holding, TradePosition, Trade
-from trades.trade_positions_repository import list_positions
+from trades.trade_positions_repository import list_positions, position_sort_values
+from trades.trades_repository import position_avg_price
 from trades.trade_positions_schema import (
     TradePositionsResponse,
     OpenPositionItem,
@@ -65,35 +69,18 @@ def _calc_unrealized_pnl(
 
 def _calc_closed_position_summary(position: TradePosition) -> tuple[int, Optional[Decimal], Optional[PnlPayload]]:
     """
-    CLOSED 포지션 요약:
+    CLOSED 포지션 요약 (trade_positions에 저장된 상태 사용):
       - totalBuyQuantity(총 매입 수량)
       - averagePrice(가중평균 매입단가)
       - pnl(실현손익): 해당 포지션에 속한 SELL trade들의 pnl_amount 합산
     """
-    buy_qty = 0
-    buy_cost = Decimal("0")
-
-    realized_profit_amount = Decimal("0")
-    has_realized = False
-
-    for t in position.trades:
-        if t.trade_type == "BUY":
-            q = int(t.quantity)
-            buy_qty += q
-            buy_cost += Decimal(str(t.price)) * Decimal(q)
-
-        if t.trade_type == "SELL" and t.result is not None:
-            if t.result.pnl_amount is not None:
-                realized_profit_amount += Decimal(str(t.result.pnl_amount))
-                has_realized = True
-
-    avg_price = None
-    if buy_qty > 0:
-        avg_price = buy_cost / Decimal(buy_qty)
+    buy_qty = int(position.buy_quantity or 0)
+    avg_price = position_avg_price(position)
 
     pnl = None
-    if has_realized and avg_price is not None and buy_qty > 0:
-        cost_basis = avg_price * Decimal(buy_qty)
+    if position.realized_pnl is not None and avg_price is not None and buy_qty > 0:
+        cost_basis = Decimal(str(position.cost_basis))
+        realized_profit_amount = Decimal(str(position.realized_pnl))
         if cost_basis != 0:
             pnl = PnlPayload(
                 profitRate=float(realized_profit_amount / cost_basis),
@@ -103,12 +90,45 @@ def _calc_closed_position_summary(position: TradePosition) -> tuple[int, Optiona
     return buy_qty, avg_price, pnl
 
 
+def _encode_position_cursor(status: str, sort: str, values: List[datetime], position_id: int) -> str:
+    payload = {
+        "s": status,
+        "o": sort,
+        "v": [v.isoformat() for v in values],
+        "id": int(position_id),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def _decode_position_cursor(cursor: str, status: str, sort: str) -> Tuple[List[datetime], int]:
+    """
+    커서 -> (정렬 키 값, position id) / 다른 status·정렬로 만든 커서면 400
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if payload["s"] != status or payload["o"] != sort:
+            raise ValueError("sort mismatch")
+        values = [datetime.fromisoformat(v) for v in payload["v"]]
+        if len(values) != (1 if status == "OPEN" else 2):
+            raise ValueError("cursor shape")
+        return values, int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 def get_trade_positions(
     db: Session,
     user_id: int,
     status: str,
     sort: str = "recent",
+    limit: int | None = None,
+    cursor: str | None = None,
 ) -> TradePositionsResponse:
+    """
+    - limit이 없으면 전체 목록 (기존 동작)
+    - limit이 있으면 limit건 + 다음 페이지 커서(nextCursor, 마지막 페이지면 null)
+    - 포지션별 trades는 관계 정렬(거래일, id)로 이미 정렬되어 로드됨
+    """
     status = (status or "").upper().strip()
     if status not in ("OPEN", "CLOSED"):
         raise HTTPException(status_code=400, detail="Unsupported status (OPEN|CLOSED)")
@@ -117,35 +137,36 @@ def get_trade_positions(
     if sort not in ("recent", "oldest"):
         raise HTTPException(status_code=400, detail="Unsupported sort (recent|oldest)")
 
-    positions = list_positions(db, user_id, status=status, sort=sort)
+    after = _decode_position_cursor(cursor, status, sort) if cursor else None
+    positions = list_positions(
+        db,
+        user_id,
+        status=status,
+        sort=sort,
+        limit=limit + 1 if limit is not None else None,
+        after=after,
+    )
+
+    next_cursor = None
+    if limit is not None and len(positions) > limit:
+        positions = positions[:limit]
+        values, last_id = position_sort_values(positions[-1])
+        next_cursor = _encode_position_cursor(status, sort, values, last_id)
 
     if status == "OPEN":
         open_items: list[OpenPositionItem] = []
 
+        # 현재가(캐시) 일괄 조회 (이 페이지의 OPEN 종목만, 1회)
+        quotes = get_cached_quotes(db, [p.ticker for p in positions], ttl_seconds=180)
+
         for p in positions:
             ticker = p.ticker.upper().strip()
 
-            # OPEN 포지션의 현재 상태는 position.trades 기준으로 계산
-            buy_qty = 0
-            sell_qty = 0
-            buy_cost = Decimal("0")
-
-            for t in p.trades:
-                if t.trade_type == "BUY":
-                    q = int(t.quantity)
-                    buy_qty += q
-                    buy_cost += Decimal(str(t.price)) * Decimal(q)
-                elif t.trade_type == "SELL":
-                    sell_qty += int(t.quantity)
-
-            holding_qty = buy_qty - sell_qty
-
-            avg_price: Decimal | None = None
-            if buy_qty > 0:
-                avg_price = buy_cost / Decimal(buy_qty)
+            # OPEN 포지션의 현재 상태는 trade_positions에 저장된 값 사용
+            holding_qty = int(p.quantity)
+            avg_price = position_avg_price(p)
 
-            # 현재가(캐시)
-            q = get_cached_quote_fields(db, ticker, ttl_seconds=180)
+            q = quotes[ticker]
             current_price = Decimal(str(q.price))
 
             pnl = _calc_unrealized_pnl(
@@ -154,8 +175,7 @@ def get_trade_positions(
                 avg_price=avg_price,
             )
 
-            trades_sorted = sorted(p.trades, key=lambda x: (x.trade_date, x.id))
-            trade_items = [_make_trade_item(t) for t in trades_sorted]
+            trade_items = [_make_trade_item(t) for t in p.trades]
 
             open_items.append(
                 OpenPositionItem(
@@ -174,6 +194,7 @@ def get_trade_positions(
             status="OPEN",
             openPositions=open_items,
             closedPositions=[],
+            nextCursor=next_cursor,
         )
 
     # CLOSED
@@ -184,8 +205,7 @@ def get_trade_positions(
 
         buy_qty, avg_price, pnl = _calc_closed_position_summary(p)
 
-        trades_sorted = sorted(p.trades, key=lambda x: (x.trade_date, x.id))
-        trade_items = [_make_trade_item(t) for t in trades_sorted]
+        trade_items = [_make_trade_item(t) for t in p.trades]
 
         closed_items.append(
             ClosedPositionItem(
@@ -205,4 +225,5 @@ def get_trade_positions(
         status="CLOSED",
         openPositions=[],
         closedPositions=closed_items,
+        nextCursor=next_cursor,
     )
\ No newline at end of file
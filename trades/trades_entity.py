@@ -10,7 +10,8 @@ from sqlalchemy import (
     CheckConstraint,
     UniqueConstraint,
     func,
-    JSON
+    JSON,
+    Index,
 )
 from sqlalchemy.orm import relationship
 
@@ -132,10 +133,17 @@ class TradePosition(Base):
     opened_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     closed_at = Column(DateTime(timezone=True), nullable=True)
 
+    # 포지션 상태 (거래 생성 시 증분 갱신, 거래 삭제 시에만 trades 기준으로 재계산)
+    quantity = Column(Integer, nullable=False, default=0, server_default="0")  # 현재 보유 수량 (BUY - SELL)
+    buy_quantity = Column(Integer, nullable=False, default=0, server_default="0")  # 누적 BUY 수량
+    cost_basis = Column(Numeric(20, 4), nullable=False, default=0, server_default="0")  # 누적 BUY 금액 (price * quantity 합)
+    avg_price = Column(Numeric(18, 8), nullable=True)  # cost_basis / buy_quantity (BUY 기준 가중평균 매입단가)
+    realized_pnl = Column(Numeric(18, 4), nullable=True)  # SELL pnl_amount 합 (실현손익이 없으면 NULL)
+
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
 
-    trades = relationship("Trade", back_populates="position")
+    trades = relationship("Trade", back_populates="position", order_by="(Trade.trade_date, Trade.id)")
 
 
 class Trade(Base):
@@ -156,6 +164,8 @@ class Trade(Base):
             "position_action IN ('ENTRY','ADD','PARTIAL_EXIT','EXIT')",
             name="chk_trade_position_action",
         ),
+        # 목록 confidence 정렬 + 커서 페이지네이션 (id는 동률 정렬용)
+        Index("idx_trades_user_confidence", "user_id", "confidence", "id"),
     )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
@@ -215,6 +225,76 @@ class TradeResult(Base):
     trade = relationship("Trade", back_populates="result")
 
 
+class TradeStats(Base):
+    """
+    /trades/summary용 사용자별 집계 (거래 생성 시 증분 갱신, 삭제 시 재집계)
+    """
+    __tablename__ = "trade_stats"
+
+    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    trade_count = Column(Integer, nullable=False, default=0, server_default="0")
+    confidence_sum = Column(BigInteger, nullable=False, default=0, server_default="0")  # confidence 합 (null 제외)
+    confidence_count = Column(Integer, nullable=False, default=0, server_default="0")  # confidence가 있는 거래 수
+    exit_count = Column(Integer, nullable=False, default=0, server_default="0")  # 전량청산(EXIT) SELL 수
+    win_count = Column(Integer, nullable=False, default=0, server_default="0")  # 그중 pnl_rate > 0
+    best_return = Column(Numeric(10, 6), nullable=True)  # EXIT SELL 최고 pnl_rate
+
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+
+class TradeEvent(Base):
+    """
+    매매 원장 (append-only): 거래 생성/삭제마다 1행
+    - trade_positions 상태 / trade_stats / realized_pnl_daily는 이 원장의 projection (trades.trade_ledger에서 갱신/재구축)
+    - 거래가 삭제돼도 행은 남으므로 trades FK 없음
+    """
+    __tablename__ = "trade_events"
+    __table_args__ = (
+        CheckConstraint("event_type IN ('CREATED','DELETED')", name="chk_trade_events_event_type"),
+        Index("idx_trade_events_user_id", "user_id", "id"),
+        Index("idx_trade_events_trade_id", "trade_id"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    trade_id = Column(BigInteger, nullable=False)
+    position_id = Column(BigInteger, nullable=False)
+
+    event_type = Column(String(10), nullable=False)  # CREATED/DELETED
+
+    # 이벤트 시점의 거래 내용 (projection 재구축에 필요한 값만)
+    ticker = Column(String(16), nullable=False)
+    trade_type = Column(String(10), nullable=False)
+    trade_date = Column(Date, nullable=False)
+    price = Column(Numeric(18, 4), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    confidence = Column(Integer, nullable=True)
+    position_action = Column(String(20), nullable=False)
+    pnl_amount = Column(Numeric(18, 4), nullable=True)
+    pnl_rate = Column(Numeric(10, 6), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class RealizedPnlDaily(Base):
+    """
+    사용자별 일자별 실현손익 (SELL 거래일 기준, trade_events projection)
+    """
+    __tablename__ = "realized_pnl_daily"
+
+    user_id = Column(BigInteger, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    trade_date = Column(Date, primary_key=True)
+
+    realized_pnl = Column(Numeric(18, 4), nullable=False, default=0, server_default="0")
+    sell_count = Column(Integer, nullable=False, default=0, server_default="0")  # pnl이 있는 SELL 수
+    win_count = Column(Integer, nullable=False, default=0, server_default="0")  # 그중 pnl_amount > 0
+    cost_basis = Column(Numeric(20, 4), nullable=False, default=0, server_default="0")  # 매도분 매입원가 합 (pnl_amount / pnl_rate)
+
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+
 class TradeMarketSnapshot(Base):
     __tablename__ = "trade_market_snapshots"
     __table_args__ = (
@@ -1,10 +1,17 @@
-from decimal import Decimal
-from typing import List, Tuple, Optional
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, List, Tuple, Optional
 
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
-from sqlalchemy import func, asc
+from sqlalchemy import and_, func, literal, or_, select, tuple_
 
-from trades.trades_entity import Asset, Holding, Trade, TradeResult, TradePosition, TradeMarketSnapshot
+from trades.trades_entity import (
+    Asset, Holding, Trade, TradeEvent, TradeResult, TradePosition, TradeMarketSnapshot, TradeStats, RealizedPnlDaily,
+)
+
+BULK_INSERT_CHUNK_SIZE = 1000  # multi-row INSERT 1회당 행 수
+PNL_AMOUNT_QUANT = Decimal("0.0001")  # trade_results.pnl_amount 소수 자리수
 
 
 def get_or_create_asset(db: Session, ticker: str) -> Asset:
@@ -17,6 +24,66 @@ def get_or_create_asset(db: Session, ticker: str) -> Asset:
     return asset
 
 
+def ensure_assets(db: Session, tickers: Iterable[str]) -> None:
+    """
+    assets 일괄 생성 (이미 있으면 그대로, name 임시)
+    """
+    rows = [{"ticker": t, "name": t} for t in sorted(set(tickers))]
+    if rows:
+        db.execute(insert(Asset).values(rows).on_conflict_do_nothing(index_elements=["ticker"]))
+
+
+def list_open_positions_for_update(db: Session, user_id: int, tickers: Iterable[str]) -> List[TradePosition]:
+    return (
+        db.query(TradePosition)
+        .filter(
+            TradePosition.user_id == user_id,
+            TradePosition.ticker.in_(list(tickers)),
+            TradePosition.status == "OPEN",
+        )
+        .with_for_update()
+        .all()
+    )
+
+
+def get_last_trade_dates(db: Session, position_ids: Iterable[int]) -> Dict[int, date]:
+    """
+    포지션별 마지막 거래일
+    """
+    ids = list(position_ids)
+    if not ids:
+        return {}
+    rows = db.execute(
+        select(Trade.position_id, func.max(Trade.trade_date))
+        .where(Trade.position_id.in_(ids))
+        .group_by(Trade.position_id)
+    ).all()
+    return {int(pid): d for pid, d in rows}
+
+
+def allocate_ids(db: Session, sequence_name: str, count: int) -> List[int]:
+    """
+    sequence에서 id를 미리 count개 할당 (multi-row INSERT 전에 부모/자식 id를 연결하기 위해)
+    """
+    if count <= 0:
+        return []
+    rows = db.execute(
+        select(func.nextval(sequence_name)).select_from(func.generate_series(1, count))
+    ).scalars()
+    return list(rows)
+
+
+def bulk_insert(db: Session, model, rows: List[dict]) -> None:
+    """
+    multi-row INSERT
+    - executemany로 넘기면 SQLAlchemy가 BULK_INSERT_CHUNK_SIZE행씩 묶은 INSERT ... VALUES로 보냄
+      (.values(rows)로 한 문장을 만드는 것보다 컴파일 비용이 훨씬 적음)
+    """
+    if rows:
+        stmt = insert(model.__table__).execution_options(insertmanyvalues_page_size=BULK_INSERT_CHUNK_SIZE)
+        db.execute(stmt, rows)
+
+
 def get_holding(db: Session, user_id: int, ticker: str) -> Holding | None:
     t = ticker.upper().strip()
     return db.query(Holding).filter(Holding.user_id == user_id, Holding.ticker == t).first()
@@ -44,22 +111,24 @@ def upsert_holding(db: Session, user_id: int, ticker: str, quantity: int, avg_pr
     return h
 
 
-def get_open_position(db: Session, user_id: int, ticker: str) -> TradePosition | None:
+def get_open_position(db: Session, user_id: int, ticker: str, for_update: bool = False) -> TradePosition | None:
+    """
+    - for_update=True: 같은 포지션에 동시에 거래가 들어와도 상태 증분 갱신이 겹치지 않도록 row lock
+    """
     t = ticker.upper().strip()
-    return (
-        db.query(TradePosition)
-        .filter(
-            TradePosition.user_id == user_id,
-            TradePosition.ticker == t,
-            TradePosition.status == "OPEN",
-        )
-        .first()
+    q = db.query(TradePosition).filter(
+        TradePosition.user_id == user_id,
+        TradePosition.ticker == t,
+        TradePosition.status == "OPEN",
     )
+    if for_update:
+        q = q.with_for_update()
+    return q.first()
 
 
 def create_position(db: Session, user_id: int, ticker: str) -> TradePosition:
     t = ticker.upper().strip()
-    p = TradePosition(user_id=user_id, ticker=t, status="OPEN")
+    p = TradePosition(user_id=user_id, ticker=t, status="OPEN", quantity=0, buy_quantity=0, cost_basis=Decimal("0"))
     db.add(p)
     db.flush()
     return p
@@ -84,26 +153,85 @@ def create_trade_result(db: Session, tr: TradeResult) -> TradeResult:
     return tr
 
 
+_TRADE_LIST_COLUMNS = (
+    Trade.id,
+    Trade.trade_date,
+    Trade.ticker,
+    Trade.trade_type,
+    Trade.price,
+    Trade.quantity,
+    Trade.confidence,
+    Trade.behavior_type,
+    Trade.memo,
+    Trade.position_action,
+    TradeResult.pnl_status,
+    TradeResult.pnl_amount,
+    TradeResult.pnl_rate,
+)
+
+
+def _trade_sort_column(sort_field: str | None):
+    if sort_field == "tradeDate":
+        return Trade.trade_date
+    if sort_field == "confidence":
+        return Trade.confidence
+    return None  # id 정렬
+
+
+def _keyset_filter(col, is_asc: bool, after_value, after_id: int):
+    """
+    (정렬 컬럼, id) 기준으로 커서 다음 행만 남기는 조건
+    - confidence는 NULL 가능: PostgreSQL 기본 정렬과 같게 ASC는 NULL을 마지막, DESC는 NULL을 처음에 둠
+    """
+    if col is None:
+        return Trade.id > after_id if is_asc else Trade.id < after_id
+
+    if col is Trade.trade_date:
+        key = tuple_(Trade.trade_date, Trade.id)
+        return key > tuple_(after_value, after_id) if is_asc else key < tuple_(after_value, after_id)
+
+    if is_asc:
+        if after_value is None:
+            return and_(col.is_(None), Trade.id > after_id)
+        return or_(col > after_value, and_(col == after_value, Trade.id > after_id), col.is_(None))
+
+    if after_value is None:
+        return or_(and_(col.is_(None), Trade.id < after_id), col.isnot(None))
+    return and_(col.isnot(None), or_(col < after_value, and_(col == after_value, Trade.id < after_id)))
+
+
 def list_trades_with_results(
-    db: Session, user_id: int, sort_field: str | None, sort_order: str | None
-) -> List[Tuple[Trade, TradeResult]]:
+    db: Session,
+    user_id: int,
+    sort_field: str | None,
+    sort_order: str | None,
+    limit: int | None = None,
+    after: Optional[Tuple[object, int]] = None,
+):
+    """
+    매매일지 목록 (ORM 객체 대신 필요한 컬럼만 조회)
+    - 정렬: (sort_field 컬럼, id) / limit이 있으면 limit 건만
+    - after: 이전 페이지 마지막 행의 (정렬 컬럼 값, id) → 그 다음 행부터 (keyset pagination)
+    """
+    col = _trade_sort_column(sort_field)
+    is_asc = (sort_order or "").lower() == "asc"
+
     q = (
-        db.query(Trade, TradeResult)
+        select(*_TRADE_LIST_COLUMNS)
         .join(TradeResult, TradeResult.trade_id == Trade.id)
-        .filter(Trade.user_id == user_id)
+        .where(Trade.user_id == user_id)
     )
 
-    if sort_field == "tradeDate":
-        col = Trade.trade_date
-    elif sort_field == "confidence":
-        col = Trade.confidence
-    else:
-        col = Trade.id
+    if after is not None:
+        q = q.where(_keyset_filter(col, is_asc, after[0], after[1]))
 
-    is_asc = (sort_order or "").lower() == "asc"
-    q = q.order_by(col.asc() if is_asc else col.desc())
+    order_cols = [Trade.id] if col is None else [col, Trade.id]
+    q = q.order_by(*[c.asc() if is_asc else c.desc() for c in order_cols])
 
-    return q.all()
+    if limit is not None:
+        q = q.limit(limit)
+
+    return db.execute(q).all()
 
 
 def get_trade_with_result(db: Session, user_id: int, trade_id: int) -> Optional[Tuple[Trade, TradeResult]]:
@@ -115,87 +243,195 @@ def get_trade_with_result(db: Session, user_id: int, trade_id: int) -> Optional[
     )
 
 
-def get_summary(db: Session, user_id: int):
-    # 전체 거래 수
-    total_trades = db.query(func.count(Trade.id)).filter(Trade.user_id == user_id).scalar() or 0
-
-    # 평균 confidence (null 제외)
-    avg_conf = db.query(func.avg(Trade.confidence)).filter(Trade.user_id == user_id).scalar()
-    avg_conf = int(round(float(avg_conf))) if avg_conf is not None else 0
+def _summary_aggregate(user_id: int):
+    """
+    요약 집계 1회 쿼리: 거래 수, confidence 합/개수, EXIT SELL 수/승리 수, 최고 수익률
+    - 승률/최고수익률: "전량청산(EXIT)인 SELL"만 포지션 종료로 간주
+    """
+    is_exit = and_(Trade.trade_type == "SELL", Trade.position_action == "EXIT", TradeResult.trade_id.isnot(None))
 
-    # 승률/최고수익률: "전량청산(EXIT)인 SELL"만 포지션 종료로 간주
-    exit_sell_q = (
-        db.query(TradeResult)
-        .join(Trade, Trade.id == TradeResult.trade_id)
-        .filter(
-            Trade.user_id == user_id,
-            Trade.trade_type == "SELL",
-            Trade.position_action == "EXIT",
+    return (
+        select(
+            func.count(Trade.id),
+            func.coalesce(func.sum(Trade.confidence), 0),
+            func.count(Trade.confidence),
+            func.count().filter(is_exit),
+            func.count().filter(is_exit, TradeResult.pnl_rate > 0),
+            func.max(TradeResult.pnl_rate).filter(is_exit),
         )
+        .select_from(Trade)
+        .outerjoin(TradeResult, TradeResult.trade_id == Trade.id)
+        .where(Trade.user_id == user_id)
     )
 
-    exit_count = exit_sell_q.count()
-
-    win_count = exit_sell_q.filter(
-        TradeResult.pnl_rate.isnot(None),
-        TradeResult.pnl_rate > 0
-    ).count()
 
+def _summary_values(trade_count, confidence_sum, confidence_count, exit_count, win_count, best_return):
+    avg_conf = int(round(float(confidence_sum) / confidence_count)) if confidence_count else 0
     win_rate = (win_count / exit_count) if exit_count > 0 else 0
-
-    best_return = exit_sell_q.with_entities(func.max(TradeResult.pnl_rate)).scalar()
     best_return = float(best_return) if best_return is not None else 0
+    return int(trade_count or 0), win_rate, avg_conf, best_return
 
-    return total_trades, win_rate, avg_conf, best_return
 
+_STATS_COLUMNS = ("trade_count", "confidence_sum", "confidence_count", "exit_count", "win_count", "best_return")
 
-def list_position_buy_trades(db: Session, user_id: int, position_id: int) -> List[Trade]:
-    return (
-        db.query(Trade)
-        .filter(
-            Trade.user_id == user_id,
-            Trade.position_id == position_id,
-            Trade.trade_type == "BUY",
-        )
-        .order_by(asc(Trade.trade_date), asc(Trade.id))
-        .all()
+
+def _insert_stats_from_trades(user_id: int):
+    return insert(TradeStats).from_select(
+        ["user_id", *_STATS_COLUMNS],
+        select(literal(user_id), *_summary_aggregate(user_id).subquery().c),
     )
 
 
-def get_position_state(db: Session, user_id: int, position_id: int) -> Tuple[int, Optional[Decimal]]:
+def get_summary(db: Session, user_id: int):
+    row = db.execute(_summary_aggregate(user_id)).one()
+    return _summary_values(*row)
+
+
+def get_summary_from_stats(db: Session, user_id: int):
     """
-    해당 position의 현재 상태를 trades 기준으로 계산
+    trade_stats 행(PK 조회)으로 요약 반환
+    - 행이 없거나, 마지막 갱신 이후 원장(trade_events)에 이벤트가 있으면 trades에서 다시 집계
+      (집계 플래그가 꺼져 있던 동안 증분이 건너뛰어진 경우)
     """
-    rows = (
-        db.query(Trade.trade_type, Trade.price, Trade.quantity)
-        .filter(
-            Trade.user_id == user_id,
-            Trade.position_id == position_id,
-        )
-        .order_by(Trade.trade_date.asc(), Trade.id.asc())
-        .all()
+    stats = db.get(TradeStats, user_id)
+    if stats is None or _is_stats_outdated(db, user_id, stats.updated_at):
+        refresh_trade_stats(db, user_id)
+        db.commit()
+        if stats is not None:
+            db.refresh(stats)
+        else:
+            stats = db.get(TradeStats, user_id)
+
+    return _summary_values(*(getattr(stats, c) for c in _STATS_COLUMNS))
+
+
+def _is_stats_outdated(db: Session, user_id: int, updated_at) -> bool:
+    """
+    원장의 마지막 이벤트가 trade_stats 갱신보다 나중인지 (생성/삭제 모두 이벤트가 남음)
+    - 플래그가 켜져 있으면 이벤트와 trade_stats가 같은 트랜잭션(now())에서 기록되므로 같은 시각
+    """
+    last_event_at = db.execute(
+        select(TradeEvent.created_at)
+        .where(TradeEvent.user_id == user_id)
+        .order_by(TradeEvent.id.desc())
+        .limit(1)
+    ).scalar()
+    return last_event_at is not None and last_event_at > updated_at
+
+
+def apply_trade_to_stats(db: Session, trade: Trade, pnl_rate: Optional[Decimal] = None) -> None:
+    """
+    거래 1건을 trade_stats에 증분 반영 (trade/trade_result가 flush된 뒤 호출)
+    - 행이 없으면(첫 거래 또는 집계 도입 이전 사용자) 방금 거래까지 포함해 trades에서 집계해 생성
+    """
+    is_exit = trade.trade_type == "SELL" and trade.position_action == "EXIT"
+    is_win = is_exit and pnl_rate is not None and pnl_rate > 0
+
+    stmt = _insert_stats_from_trades(int(trade.user_id))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "trade_count": TradeStats.trade_count + 1,
+            "confidence_sum": TradeStats.confidence_sum + int(trade.confidence or 0),
+            "confidence_count": TradeStats.confidence_count + (1 if trade.confidence is not None else 0),
+            "exit_count": TradeStats.exit_count + (1 if is_exit else 0),
+            "win_count": TradeStats.win_count + (1 if is_win else 0),
+            "best_return": (
+                func.greatest(TradeStats.best_return, pnl_rate)
+                if is_exit and pnl_rate is not None
+                else TradeStats.best_return
+            ),
+            "updated_at": func.now(),
+        },
     )
+    db.execute(stmt)
 
-    buy_qty = 0
-    sell_qty = 0
-    buy_cost = Decimal("0")
 
-    for trade_type, price, quantity in rows:
-        q = int(quantity)
+def refresh_trade_stats(db: Session, user_id: int) -> None:
+    """
+    trade_stats를 trades 기준으로 다시 집계 (거래 삭제 시 사용: 최고 수익률은 증분으로 되돌릴 수 없음)
+    """
+    stmt = _insert_stats_from_trades(user_id)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={**{c: stmt.excluded[c] for c in _STATS_COLUMNS}, "updated_at": func.now()},
+    )
+    db.execute(stmt)
+
+
+def round_pnl_amount(value: Decimal) -> Decimal:
+    """
+    trade_results.pnl_amount(numeric(18,4))와 같은 자리수로 반올림
+    - realized_pnl 누적값이 저장된 pnl_amount 합과 정확히 같도록 계산 시점에 맞춰 둠
+    """
+    return Decimal(value).quantize(PNL_AMOUNT_QUANT, rounding=ROUND_HALF_UP)
+
+
+def position_avg_price(position: TradePosition) -> Optional[Decimal]:
+    """
+    BUY 기준 가중평균 매입단가 (반올림 없이 cost_basis / buy_quantity)
+    """
+    buy_qty = int(position.buy_quantity or 0)
+    if buy_qty <= 0:
+        return None
+    return Decimal(str(position.cost_basis)) / Decimal(buy_qty)
+
+
+def apply_trade_to_position(
+    db: Session,
+    position: TradePosition,
+    trade_type: str,
+    price: Decimal,
+    quantity: int,
+    pnl_amount: Optional[Decimal] = None,
+) -> None:
+    """
+    거래 1건을 position 상태에 증분 반영 (기존 trades를 다시 읽지 않음)
+    """
+    q = int(quantity)
+
+    if trade_type == "BUY":
+        position.quantity = int(position.quantity or 0) + q
+        position.buy_quantity = int(position.buy_quantity or 0) + q
+        position.cost_basis = Decimal(str(position.cost_basis or 0)) + Decimal(str(price)) * Decimal(q)
+        position.avg_price = position_avg_price(position)
+    elif trade_type == "SELL":
+        position.quantity = int(position.quantity or 0) - q
+        if pnl_amount is not None:
+            position.realized_pnl = Decimal(str(position.realized_pnl or 0)) + Decimal(str(pnl_amount))
+
+    db.flush()
 
-        if trade_type == "BUY":
-            buy_qty += q
-            buy_cost += Decimal(str(price)) * Decimal(q)
-        elif trade_type == "SELL":
-            sell_qty += q
 
-    remaining_qty = buy_qty - sell_qty
+def recompute_position_state(db: Session, position: TradePosition) -> int:
+    """
+    position 상태를 trades 기준으로 다시 계산 (거래 삭제 시에만 사용, 집계 쿼리 1회)
+    반환: 남은 거래 수
+    """
+    is_buy = Trade.trade_type == "BUY"
+    is_sell = Trade.trade_type == "SELL"
+
+    trade_count, buy_qty, sell_qty, buy_cost, realized = (
+        db.query(
+            func.count(Trade.id),
+            func.coalesce(func.sum(Trade.quantity).filter(is_buy), 0),
+            func.coalesce(func.sum(Trade.quantity).filter(is_sell), 0),
+            func.coalesce(func.sum(Trade.price * Trade.quantity).filter(is_buy), 0),
+            func.sum(TradeResult.pnl_amount).filter(is_sell),
+        )
+        .outerjoin(TradeResult, TradeResult.trade_id == Trade.id)
+        .filter(Trade.position_id == position.id)
+        .one()
+    )
 
-    avg_price = None
-    if buy_qty > 0:
-        avg_price = buy_cost / Decimal(buy_qty)
+    position.quantity = int(buy_qty) - int(sell_qty)
+    position.buy_quantity = int(buy_qty)
+    position.cost_basis = Decimal(str(buy_cost))
+    position.avg_price = position_avg_price(position)
+    position.realized_pnl = Decimal(str(realized)) if realized is not None else None
 
-    return remaining_qty, avg_price # remaining_qty: 현재 남은 수량, avg_price: BUY 기준 가중평균 매입단가
+    db.flush()
+    return int(trade_count)
 
 
 def get_trade_for_delete(db: Session, user_id: int, trade_id: int) -> Trade | None:
@@ -233,4 +469,25 @@ def get_position_with_trades(db: Session, user_id: int, position_id: int) -> Tra
 
 
 def delete_position(db: Session, position: TradePosition) -> None:
-    db.delete(position)
\ No newline at end of file
+    db.delete(position)
+
+
+def list_realized_pnl_daily(
+    db: Session, user_id: int, start: Optional[date], end: Optional[date]
+) -> Tuple[Decimal, List[RealizedPnlDaily]]:
+    """
+    realized_pnl_daily projection 조회
+    반환: (start 이전 누적 실현손익, 기간 내 일자별 행)
+    """
+    q = db.query(RealizedPnlDaily).filter(RealizedPnlDaily.user_id == user_id, RealizedPnlDaily.sell_count > 0)
+    before = Decimal("0")
+    if start is not None:
+        before = (
+            db.query(func.coalesce(func.sum(RealizedPnlDaily.realized_pnl), 0))
+            .filter(RealizedPnlDaily.user_id == user_id, RealizedPnlDaily.trade_date < start)
+            .scalar()
+        )
+        q = q.filter(RealizedPnlDaily.trade_date >= start)
+    if end is not None:
+        q = q.filter(RealizedPnlDaily.trade_date <= end)
+    return Decimal(str(before)), q.order_by(RealizedPnlDaily.trade_date.asc()).all()
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from datetime import date
 from typing import Literal
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, File, Query, UploadFile
 from sqlalchemy.orm import Session
 
 from common.database import get_db
@@ -16,14 +17,19 @@ from trades.trades_schema import (
     TradeListResponse,
     TradeDetailResponse,
     TradeSummaryResponse, TradeDeleteResponse,
+    TradeImportRequest,
+    TradeImportResponse,
+    RealizedPnlDailyResponse,
 )
 from trades.trades_service import (
     create_trade_and_update_position,
     get_trade_list,
     get_trade_detail,
     get_trade_summary, delete_trade,
+    get_realized_pnl_daily,
 )
 
+from trades.trade_import_service import import_trades, parse_trade_csv, read_trade_csv
 from trades.trade_positions_schema import TradePositionsResponse
 from trades.trade_positions_service import get_trade_positions
 
@@ -38,14 +44,26 @@ def read_trade_summary(
     return get_trade_summary(db, user_id)
 
 
+@router.get("/realized-pnl", response_model=RealizedPnlDailyResponse)
+def read_realized_pnl_daily(
+    fromDate: date | None = Query(None),
+    toDate: date | None = Query(None),
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+):
+    return get_realized_pnl_daily(db, user_id, fromDate, toDate)
+
+
 @router.get("", response_model=TradeListResponse)
 def list_trades(
     sortField: str | None = Query(None),
     sortOrder: str | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=200),  # 없으면 전체
+    cursor: str | None = Query(None),  # 이전 응답의 nextCursor
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id),
 ):
-    return get_trade_list(db, user_id, sortField, sortOrder)
+    return get_trade_list(db, user_id, sortField, sortOrder, limit=limit, cursor=cursor)
 
 
 @router.post("", response_model=TradeCreateResponse, status_code=201)
@@ -57,14 +75,41 @@ def create_trade(
     return create_trade_and_update_position(db, user_id, req)
 
 
+@router.post("/import", response_model=TradeImportResponse, status_code=201)
+def import_trades_json(
+    req: TradeImportRequest,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+):
+    return import_trades(db, user_id, req.trades)
+
+
+@router.post("/import/csv", response_model=TradeImportResponse, status_code=201)
+def import_trades_csv(
+    file: UploadFile = File(...),  # 헤더: ticker,tradeType,tradeDate,price,quantity,confidence,behaviorType,memo
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+):
+    return import_trades(db, user_id, parse_trade_csv(read_trade_csv(file.file)))
+
+
 @router.get("/positions", response_model=TradePositionsResponse)
 def get_trades_by_position(
     status: str | None = Query("OPEN"),  # OPEN | CLOSED
     sort: str | None = Query("recent"),  # recent | oldest
+    limit: int | None = Query(None, ge=1, le=200),  # 없으면 전체
+    cursor: str | None = Query(None),  # 이전 응답의 nextCursor
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id),
 ):
-    return get_trade_positions(db, user_id, status=status or "OPEN", sort=sort or "recent")
+    return get_trade_positions(
+        db,
+        user_id,
+        status=status or "OPEN",
+        sort=sort or "recent",
+        limit=limit,
+        cursor=cursor,
+    )
 
 
 @router.get("/{tradeId}", response_model=TradeDetailResponse)
@@ -38,6 +38,7 @@ class TradeListItem(BaseModel):
 
 class TradeListResponse(BaseModel):
     trades: List[TradeListItem] = Field(default_factory=list)
+    nextCursor: Optional[str] = None  # limit 지정 시 다음 페이지 커서 (마지막 페이지면 null)
 
 
 class PnlPayload(BaseModel):
@@ -74,3 +75,32 @@ class TradeSummaryResponse(BaseModel):
 class TradeDeleteResponse(BaseModel):
     status: str
     tradeId: int
+
+
+class TradeImportRequest(BaseModel):
+    trades: List[TradeCreateRequest] = Field(min_length=1, max_length=10000)
+
+
+class TradeImportError(BaseModel):
+    row: int  # 요청(또는 CSV 데이터 행)의 0부터 시작하는 번호
+    error: str
+
+
+class TradeImportResponse(BaseModel):
+    status: str = "IMPORTED"
+    imported: int
+    positionsOpened: int
+    positionsClosed: int
+
+
+class RealizedPnlDailyItem(BaseModel):
+    tradeDate: date
+    realizedPnl: float
+    sellCount: int
+    winCount: int
+    cumulativePnl: float  # 해당 일자까지 누적 실현손익
+
+
+class RealizedPnlDailyResponse(BaseModel):
+    items: List[RealizedPnlDailyItem] = Field(default_factory=list)
+    totalRealizedPnl: float  # 조회 기간 실현손익 합
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from datetime import datetime
+import base64
+import json
+from datetime import date, datetime
 from decimal import Decimal
 
 from fastapi import HTTPException
@@ -22,6 +24,8 @@ from trades.trades_schema import (
     TradeSummaryResponse,
     TradeSummaryPayload,
     TradeDeleteResponse,
+    RealizedPnlDailyItem,
+    RealizedPnlDailyResponse,
 )
 from trades.trades_repository import (
     get_or_create_asset,
@@ -29,10 +33,14 @@ from trades.trades_repository import (
     create_trade_result,
     list_trades_with_results,
     get_trade_with_result,
-    get_summary, close_position, get_open_position, create_position, list_position_buy_trades, get_position_state,
-    delete_trade_snapshots, get_trade_for_delete, delete_trade_result, get_position_with_trades, delete_position,
+    get_summary, close_position, get_open_position, create_position, position_avg_price, round_pnl_amount,
+    recompute_position_state, get_summary_from_stats, refresh_trade_stats,
+    delete_trade_snapshots, get_trade_for_delete, delete_trade_result,
+    get_position_with_trades, delete_position, list_realized_pnl_daily,
 )
 
+from common.config import settings
+from trades.trade_ledger import record_trade_created, record_trade_deleted
 from insights.action_plan.action_plan_entity import ActionPlan
 
 
@@ -52,18 +60,15 @@ def create_trade_and_update_position(db: Session, user_id: int, req: TradeCreate
     _validate_behavior(req.tradeType, req.behaviorType)
 
     asset = get_or_create_asset(db, ticker)
-    open_pos = get_open_position(db, user_id, asset.ticker)
+    open_pos = get_open_position(db, user_id, asset.ticker, for_update=True)
 
     # BUY
     if req.tradeType == "BUY":
         if open_pos is None:
             open_pos = create_position(db, user_id, asset.ticker)
             position_action = "ENTRY"
-            current_qty = 0
-            current_avg = None
         else:
-            current_qty, current_avg = get_position_state(db, user_id, int(open_pos.id))
-            position_action = "ENTRY" if current_qty <= 0 else "ADD"
+            position_action = "ENTRY" if int(open_pos.quantity) <= 0 else "ADD"
 
         trade = Trade(
             user_id=user_id,
@@ -80,6 +85,7 @@ def create_trade_and_update_position(db: Session, user_id: int, req: TradeCreate
         )
         create_trade(db, trade)
         create_trade_result(db, TradeResult(trade_id=trade.id, pnl_status="OPEN"))
+        record_trade_created(db, trade, open_pos)
 
         db.commit()
         return TradeCreateResponse(tradeId=trade.id, status="CREATED")
@@ -88,7 +94,8 @@ def create_trade_and_update_position(db: Session, user_id: int, req: TradeCreate
     if open_pos is None:
         raise HTTPException(status_code=400, detail="No open position to sell")
 
-    current_qty, current_avg = get_position_state(db, user_id, int(open_pos.id))
+    current_qty = int(open_pos.quantity)
+    current_avg = position_avg_price(open_pos)
 
     if current_qty <= 0:
         raise HTTPException(status_code=400, detail="No holding to sell")
@@ -117,7 +124,7 @@ def create_trade_and_update_position(db: Session, user_id: int, req: TradeCreate
     pnl_amount = None
     pnl_rate = None
     if current_avg is not None and current_avg != 0:
-        pnl_amount = (req.price - current_avg) * Decimal(req.quantity)
+        pnl_amount = round_pnl_amount((req.price - current_avg) * Decimal(req.quantity))
         pnl_rate = (req.price - current_avg) / current_avg
 
     if position_action == "EXIT":
@@ -143,43 +150,103 @@ def create_trade_and_update_position(db: Session, user_id: int, req: TradeCreate
             ),
         )
 
+    record_trade_created(db, trade, open_pos, pnl_amount, pnl_rate)
+
     db.commit()
     return TradeCreateResponse(tradeId=trade.id, status="CREATED")
 
-def get_trade_list(db: Session, user_id: int, sort_field: str | None, sort_order: str | None) -> TradeListResponse:
-    rows = list_trades_with_results(db, user_id, sort_field, sort_order)
+def _encode_trade_cursor(sort_field: str | None, is_asc: bool, value, trade_id: int) -> str:
+    payload = {
+        "s": sort_field or "id",
+        "o": "asc" if is_asc else "desc",
+        "v": value.isoformat() if isinstance(value, date) else value,
+        "id": int(trade_id),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def _decode_trade_cursor(cursor: str, sort_field: str | None, is_asc: bool):
+    """
+    커서 -> (정렬 컬럼 값, id) / 다른 정렬 조건으로 만든 커서면 400
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if payload["s"] != (sort_field or "id") or payload["o"] != ("asc" if is_asc else "desc"):
+            raise ValueError("sort mismatch")
+        value = payload["v"]
+        if sort_field == "tradeDate":
+            value = date.fromisoformat(value)
+        elif value is not None:
+            value = int(value)
+        return value, int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def get_trade_list(
+    db: Session,
+    user_id: int,
+    sort_field: str | None,
+    sort_order: str | None,
+    limit: int | None = None,
+    cursor: str | None = None,
+) -> TradeListResponse:
+    """
+    - limit이 없으면 전체 목록 (기존 동작)
+    - limit이 있으면 limit건 + 다음 페이지 커서(nextCursor, 마지막 페이지면 null)
+    """
+    if sort_field not in ("tradeDate", "confidence"):
+        sort_field = None
+    is_asc = (sort_order or "").lower() == "asc"
+
+    after = _decode_trade_cursor(cursor, sort_field, is_asc) if cursor else None
+    rows = list_trades_with_results(
+        db,
+        user_id,
+        sort_field,
+        sort_order,
+        limit=limit + 1 if limit is not None else None,
+        after=after,
+    )
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        sort_value = {"tradeDate": last.trade_date, "confidence": last.confidence}.get(sort_field)
+        next_cursor = _encode_trade_cursor(sort_field, is_asc, sort_value, last.id)
 
     items: list[TradeListItem] = []
 
-    for trade, result in rows:
+    for row in rows:
         pnl_payload = None
 
         # SELL일 때만 pnl 객체 생성, BUY일 때는 null
-        if trade.trade_type == "SELL":
-            if result.pnl_rate is not None and result.pnl_amount is not None:
+        if row.trade_type == "SELL":
+            if row.pnl_rate is not None and row.pnl_amount is not None:
                 pnl_payload = PnlPayload(
-                    profitRate=float(result.pnl_rate),
-                    profitAmount=float(result.pnl_amount),
+                    profitRate=float(row.pnl_rate),
+                    profitAmount=float(row.pnl_amount),
                 )
 
         items.append(
             TradeListItem(
-                tradeId=trade.id,
-                tradeDate=trade.trade_date,
-                ticker=trade.ticker,
-                tradeType=trade.trade_type,
-                price=float(trade.price),
-                quantity=int(trade.quantity),
-                pnlStatus=result.pnl_status,
+                tradeId=row.id,
+                tradeDate=row.trade_date,
+                ticker=row.ticker,
+                tradeType=row.trade_type,
+                price=float(row.price),
+                quantity=int(row.quantity),
+                pnlStatus=row.pnl_status,
                 pnl=pnl_payload,
-                confidence=int(trade.confidence) if trade.confidence is not None else None,
-                behaviorType=trade.behavior_type,
-                memo=trade.memo,
-                positionAction=trade.position_action,
+                confidence=int(row.confidence) if row.confidence is not None else None,
+                behaviorType=row.behavior_type,
+                memo=row.memo,
+                positionAction=row.position_action,
             )
         )
 
-    return TradeListResponse(trades=items)
+    return TradeListResponse(trades=items, nextCursor=next_cursor)
 
 
 def get_trade_detail(db: Session, user_id: int, trade_id: int) -> TradeDetailResponse:
@@ -189,18 +256,8 @@ def get_trade_detail(db: Session, user_id: int, trade_id: int) -> TradeDetailRes
 
     trade, result = row
 
-    buy_trades = list_position_buy_trades(db, user_id, int(trade.position_id))
-
-    buy_qty = 0
-    buy_cost = Decimal("0")
-    for bt in buy_trades:
-        q = int(bt.quantity)
-        buy_qty += q
-        buy_cost += Decimal(str(bt.price)) * Decimal(q)
-
-    avg_price: float | None = None
-    if buy_qty > 0:
-        avg_price = float(buy_cost / Decimal(buy_qty))
+    position_avg = position_avg_price(trade.position)
+    avg_price: float | None = float(position_avg) if position_avg is not None else None
 
     pnl_payload = None
     if trade.trade_type == "SELL":
@@ -227,7 +284,10 @@ def get_trade_detail(db: Session, user_id: int, trade_id: int) -> TradeDetailRes
 
 
 def get_trade_summary(db: Session, user_id: int) -> TradeSummaryResponse:
-    total_trades, win_rate, avg_conf, best_return = get_summary(db, user_id)
+    if settings.trade_stats_rollup_enabled:
+        total_trades, win_rate, avg_conf, best_return = get_summary_from_stats(db, user_id)
+    else:
+        total_trades, win_rate, avg_conf, best_return = get_summary(db, user_id)
     return TradeSummaryResponse(
         summary=TradeSummaryPayload(
             totalTrades=int(total_trades),
@@ -238,6 +298,36 @@ def get_trade_summary(db: Session, user_id: int) -> TradeSummaryResponse:
     )
 
 
+def get_realized_pnl_daily(
+    db: Session, user_id: int, start: date | None, end: date | None
+) -> RealizedPnlDailyResponse:
+    """
+    일자별 실현손익 (trades를 다시 집계하지 않고 realized_pnl_daily projection에서 조회)
+    """
+    if start is not None and end is not None and start > end:
+        raise HTTPException(status_code=400, detail="fromDate must be before toDate")
+
+    cumulative, rows = list_realized_pnl_daily(db, user_id, start, end)
+
+    items: list[RealizedPnlDailyItem] = []
+    total = Decimal("0")
+    for r in rows:
+        pnl = Decimal(str(r.realized_pnl))
+        total += pnl
+        cumulative += pnl
+        items.append(
+            RealizedPnlDailyItem(
+                tradeDate=r.trade_date,
+                realizedPnl=float(pnl),
+                sellCount=int(r.sell_count),
+                winCount=int(r.win_count),
+                cumulativePnl=float(cumulative),
+            )
+        )
+
+    return RealizedPnlDailyResponse(items=items, totalRealizedPnl=float(total))
+
+
 def delete_trade(db: Session, user_id: int, tradeId: int) -> TradeDeleteResponse:
     trade = get_trade_for_delete(db, user_id, tradeId)
 
@@ -255,6 +345,9 @@ def delete_trade(db: Session, user_id: int, tradeId: int) -> TradeDeleteResponse
         # 거래 상세 스냅샷 삭제
         delete_trade_snapshots(db, tradeId)
 
+        # 원장에 삭제 이벤트 기록 (거래 결과를 지우기 전에)
+        record_trade_deleted(db, trade)
+
         # 거래 결과 삭제
         delete_trade_result(db, tradeId)
 
@@ -266,30 +359,21 @@ def delete_trade(db: Session, user_id: int, tradeId: int) -> TradeDeleteResponse
         position = get_position_with_trades(db, user_id, int(position_id))
 
         if position:
-            remaining_trades = position.trades
+            remaining_trades = recompute_position_state(db, position)
 
-            if len(remaining_trades) == 0:
+            if remaining_trades == 0:
                 delete_position(db, position)
             else:
-                buy_qty = 0
-                sell_qty = 0
-                last_exit_trade = None
-
-                for t in remaining_trades:
-                    if t.trade_type == "BUY":
-                        buy_qty += int(t.quantity)
-                    elif t.trade_type == "SELL":
-                        sell_qty += int(t.quantity)
-                        if last_exit_trade is None or t.trade_date > last_exit_trade.trade_date:
-                            last_exit_trade = t
-
-                if buy_qty > 0 and sell_qty >= buy_qty:
+                if position.buy_quantity > 0 and position.quantity <= 0:
                     position.status = "CLOSED"
                     position.closed_at = datetime.utcnow()
                 else:
                     position.status = "OPEN"
                     position.closed_at = None
 
+        if settings.trade_stats_rollup_enabled:
+            refresh_trade_stats(db, user_id)
+
         db.commit()
 
         return TradeDeleteResponse(